@@ -1,5 +1,9 @@
 from array_manager.core.native_formats.vector_components_dict import VectorComponentsDict
 from array_manager.core.native_formats.vector import Vector
+from array_manager.core.native_formats.vector_builder import VectorBuilder
+from array_manager.core.native_formats.buffer_pool import BufferPool
+from array_manager.core.native_formats.multi_vector import MultiVector
+from array_manager.core.native_formats.transfer_plan import TransferPlan
 from array_manager.core.native_formats.matrix_components_dict import MatrixComponentsDict
 from array_manager.core.native_formats.matrix import Matrix
 from array_manager.core.native_formats.block_matrix import BlockMatrix
@@ -3,6 +3,8 @@ import numpy as np
 from array_manager.core.native_formats.vector_components_dict import VectorComponentsDict
 from array_manager.core.native_formats.vector import Vector
 from array_manager.core.native_formats.matrix import Matrix
+from array_manager.utils.index_dtype import get_index_dtype
+from array_manager.utils.vector_file import resolve_mode
 
 
 class BlockMatrix(object):
@@ -14,6 +16,8 @@ class BlockMatrix(object):
     ----------
     vals : Vector
         Concatenated vector of a list of variables 
+    index_dtype : np.dtype
+        dtype of rows and cols (int32 when the shape and the number of nonzeros allow it, int64 otherwise)
 
     """
 
@@ -54,11 +58,6 @@ class BlockMatrix(object):
         
         row_sizes = np.zeros(shape[0], dtype=int)
         col_sizes = np.zeros(shape[1], dtype=int)
-        row_start_indices = np.zeros(shape, dtype=int)
-        row_end_indices = np.zeros(shape, dtype=int)
-        col_start_indices = np.zeros(shape, dtype=int)
-        col_end_indices = np.zeros(shape, dtype=int)
-        self.num_nonzeros = 0
         
         # # Find a nonzero block
         # for i in range(shape[0]):
@@ -93,84 +92,80 @@ class BlockMatrix(object):
                 
                 
 
-        for i in range(shape[0]):
-            for j in range(shape[1]):
-                # When a block is defined zero
-                if type(sub_matrices[i,j]) == int:
-                    if sub_matrices[i,j] == 0:
-                        continue
+        # Row and column offsets of the block rows and block columns
+        row_offsets = np.concatenate(([0], np.cumsum(row_sizes)))
+        col_offsets = np.concatenate(([0], np.cumsum(col_sizes)))
 
-                # Compute start and end indices of each block
-                if i >= 1:
-                    row_start_indices[i, j] = row_start_indices[i-1, j] + row_sizes[i-1]
-                    row_end_indices[i-1, j] = row_start_indices[i, j]
-                if j >= 1:
-                    col_start_indices[i, j] = row_start_indices[i, j-1] + col_sizes[j-1]
-                    col_end_indices[i, j-1] = col_start_indices[i, j]
+        self.dense_shape = (int(row_offsets[-1]), int(col_offsets[-1]))
+        self.dense_size = np.prod(self.dense_shape)
 
-                self.num_nonzeros += sub_matrices[i, j].num_nonzeros
+        # This will result in row major ordering of the block matrices (zero blocks are skipped)
+        block_keys = [
+            (i, j)
+            for i in range(shape[0])
+            for j in range(shape[1])
+            if not isinstance(sub_matrices[i, j], int)
+        ]
 
-        row_end_indices[i, j] = row_start_indices[i, j] + row_sizes[i]
-        col_end_indices[i, j] = col_start_indices[i, j] + col_sizes[j]
-        self.dense_shape = (row_end_indices[i, j], col_end_indices[i, j])
-        self.dense_size = np.prod(self.dense_shape)
-        self.density = float(self.num_nonzeros / self.dense_size)
-        self.rows = np.zeros(self.num_nonzeros, dtype=int)
-        self.cols = np.zeros(self.num_nonzeros, dtype=int)
+        # Values of all the blocks are stored with their common dtype
+        self.dtype = np.result_type(*[sub_matrices[key].dtype for key in block_keys]) if len(block_keys) > 0 else np.dtype(float)
 
         # block components dict is not really parallel with MatrixComponentsDict
-        vector_components_dict = VectorComponentsDict()
+        vector_components_dict = VectorComponentsDict.from_components(
+            ((key, dict(shape=(sub_matrices[key].num_nonzeros,))) for key in block_keys),
+            dtype=self.dtype,
+        )
+        index = vector_components_dict.index
 
-        # This will result in row major ordering of the block matrices
-        start_index = 0
-        end_index = 0
-        for i in range(shape[0]):
-            for j in range(shape[1]):
-                num_nonzeros = len(sub_matrices[i, j])
-                end_index = start_index + num_nonzeros
-                vector_components_dict[i, j] = dict(shape=(num_nonzeros,))
-                
-                global_rows = row_start_indices[i, j] + sub_matrices[i, j].rows
-                global_cols = col_start_indices[i, j] + sub_matrices[i, j].cols
-
-                self.rows[start_index:end_index] = global_rows
-                self.cols[start_index:end_index] = global_cols
+        self.num_nonzeros = vector_components_dict.vector_size
+        self.density = float(self.num_nonzeros / self.dense_size)
 
-                start_index = end_index * 1
+        # Shift the indices of all the blocks to global indices in one pass using the offsets in the index
+        block_rows = np.array([i for i, j in block_keys], dtype=int)
+        block_cols = np.array([j for i, j in block_keys], dtype=int)
+        self.index_dtype = get_index_dtype(self.dense_shape, self.num_nonzeros)
+        self.rows = np.repeat(row_offsets[block_rows].astype(self.index_dtype), index.sizes)
+        self.cols = np.repeat(col_offsets[block_cols].astype(self.index_dtype), index.sizes)
+        if len(block_keys) > 0:
+            self.rows += np.concatenate([sub_matrices[key].rows for key in block_keys], dtype=self.index_dtype)
+            self.cols += np.concatenate([sub_matrices[key].cols for key in block_keys], dtype=self.index_dtype)
 
         self.vals = Vector(vector_components_dict)
 
-    def allocate(self, copy=False, data=None):
+    def allocate(self, copy=False, data=None, filename=None, mode=None, set_vals=True):
         # Line 124 is executed only at the top level when we say copy is not needed. Because for lower levels in the hierarchy, data comes from higher levels and data is never None.
 
         # if data is None and not copy:
         #     data = np.zeros(self.num_nonzeros)
 
-        # New addition
-        shape = self.shape
-        if data is not None and not copy: 
-            pass
-        else:
-            data = np.zeros(self.num_nonzeros)
-
-        self.vals.allocate(data=data, setup_views=True)
+        # The values of the whole hierarchy can be backed by a memory-mapped file (see Vector.allocate())
+        if filename is not None and (data is None or copy):
+            # The submatrices of an existing file keep the values that were saved in it
+            set_vals = set_vals and resolve_mode(filename, mode) == 'w+'
+            self.vals.allocate(filename=filename, mode=mode, setup_views=True)
+            data = self.vals.data
 
-        ind1 = 0
-        ind2 = 0
-        for i in range(shape[0]):
-            for j in range(shape[1]):
-                sub_matrix = self.sub_matrices[i, j]
-
-                ind2 += sub_matrix.num_nonzeros
-                sub_matrix.allocate(data=data[ind1:ind2], copy=copy)
-                ind1 += sub_matrix.num_nonzeros
+        else:
+            # New addition
+            if data is not None and not copy: 
+                pass
+            else:
+                data = np.zeros(self.num_nonzeros, dtype=self.dtype)
+
+            self.vals.allocate(data=data, setup_views=True)
+
+        index = self.vals.vector_components_dict.index
+        for key, ind1, ind2 in zip(index.keys, index.start_indices.tolist(), index.end_indices.tolist()):
+            sub_matrix = self.sub_matrices[key]
+            sub_matrix.allocate(data=data[ind1:ind2], copy=copy, set_vals=set_vals)
         
         # To test if allocate() works with and without copy=True, run all_in_one.py after commenting out self.update_bottom_up() here. This will give correct results when copy=False and incorrect results when copy=True (only the Matrix objects will contain nonzero values, all BlockMatrix objects' data will be populated with zeros)
         if copy:
             self.update_bottom_up()
 
     def update_bottom_up(self):
-        for i, j in self.sub_matrices:
+        # Zero blocks are not stored in self.vals
+        for i, j in self.vals.vector_components_dict:
             sub_matrix = self.sub_matrices[i, j]
 
             sub_matrix.update_bottom_up()
@@ -178,7 +173,7 @@ class BlockMatrix(object):
             self.vals[i, j] = sub_matrix.vals.data
 
     def update_top_down(self):
-        for i, j in self.sub_matrices:
+        for i, j in self.vals.vector_components_dict:
             sub_matrix = self.sub_matrices[i, j]
 
             sub_matrix.vals.data[:] = self.vals[i, j]
@@ -0,0 +1,106 @@
+"""Define the Bounds class"""
+import numpy as np
+
+
+class Bounds(object):
+    """
+    Full-size lower and upper bounds of a VectorComponentsDict and the classification of its entries.
+    VectorComponentsDict.lower and VectorComponentsDict.upper only contain the entries of bounded subvectors; here, every entry of the vector has a bound (-inf/inf if it is unbounded), so bound operations on a Vector are single vectorized NumPy calls.
+    The classification is done once and cached on the VectorComponentsDict (see VectorComponentsDict.bounds).
+
+    Attributes
+    ----------
+    lower : np.ndarray
+        Lower bounds of all the entries of the vector
+    upper : np.ndarray
+        Upper bounds of all the entries of the vector
+    equality_indices : np.ndarray
+        Indices of the entries whose lower and upper bounds are equal
+    inequality_indices : np.ndarray
+        Indices of the entries with at least one finite bound that are not equality-constrained
+    free_indices : np.ndarray
+        Indices of the entries without finite bounds
+    bounded_indices : np.ndarray
+        Indices of the entries with at least one finite bound (equality and inequality indices, sorted)
+    """
+
+    def __init__(self, lower, upper):
+        """
+        Classify the entries of a vector from its full-size bounds.
+
+        Parameters
+        ----------
+        lower : np.ndarray
+            Lower bounds of all the entries of the vector
+        upper : np.ndarray
+            Upper bounds of all the entries of the vector
+        """
+        self.lower = self._frozen_array(lower, float)
+        self.upper = self._frozen_array(upper, float)
+
+        equality = self.lower == self.upper
+        bounded = np.isfinite(self.lower) | np.isfinite(self.upper)
+
+        self.equality_indices = self._frozen_array(np.flatnonzero(equality), int)
+        self.inequality_indices = self._frozen_array(np.flatnonzero(bounded & ~equality), int)
+        self.free_indices = self._frozen_array(np.flatnonzero(~bounded), int)
+        self.bounded_indices = self._frozen_array(np.flatnonzero(bounded), int)
+
+    @staticmethod
+    def _frozen_array(array, dtype):
+        array = np.array(array, dtype=dtype).reshape(-1)
+        array.setflags(write=False)
+        return array
+
+    @classmethod
+    def from_vector_components_dict(cls, vector_components_dict):
+        """
+        Build the full-size bounds of a VectorComponentsDict from its (compressed) lower and upper arrays.
+        """
+        lower = np.full(vector_components_dict.vector_size, -np.inf)
+        upper = np.full(vector_components_dict.vector_size, np.inf)
+
+        # Positions of the entries of the bounded subvectors, in the same order as in vector_components_dict.lower/upper
+        index = vector_components_dict.index
+        bounded = np.array([vector_components_dict._is_bounded(vector_components_dict[key]) for key in index.keys], dtype=bool)
+        sizes = index.sizes[bounded]
+        offsets = np.cumsum(sizes) - sizes
+        positions = np.repeat(index.start_indices[bounded] - offsets, sizes) + np.arange(np.sum(sizes, dtype=int))
+
+        lower[positions] = vector_components_dict.lower
+        upper[positions] = vector_components_dict.upper
+
+        return cls(lower, upper)
+
+    def project(self, data, out=None):
+        """
+        Clip the data onto [lower, upper].
+        """
+        return np.clip(data, self.lower, self.upper, out=out)
+
+    def active_sets(self, data, tol=0.):
+        """
+        Return the indices of the entries that are within tol of their lower bound, within tol of their upper bound, and neither (inactive).
+        Equality-constrained entries are active at both bounds.
+        """
+        lower_active = data - self.lower <= tol
+        upper_active = self.upper - data <= tol
+        inactive = ~(lower_active | upper_active)
+
+        return np.flatnonzero(lower_active), np.flatnonzero(upper_active), np.flatnonzero(inactive)
+
+    def max_step(self, data, direction):
+        """
+        Return the largest step alpha >= 0 such that data + alpha * direction stays within the bounds (np.inf if nothing limits the step).
+        """
+        indices = self.bounded_indices
+        x = data[indices]
+        d = direction[indices]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            steps = np.where(d > 0, (self.upper[indices] - x) / d, np.where(d < 0, (self.lower[indices] - x) / d, np.inf))
+
+        steps = np.where(np.isnan(steps), np.inf, steps)
+
+        # Entries that are already on (or beyond) a bound they move towards block the step
+        return max(0., float(np.min(steps))) if steps.size > 0 else np.inf
@@ -0,0 +1,124 @@
+"""Define the BufferPool class"""
+import numpy as np
+from contextlib import contextmanager
+from array_manager.core.native_formats.vector import Vector
+
+
+class BufferPool(object):
+    """
+    Pool of reusable data buffers for Vector objects.
+    Buffers are keyed by the layout (vector size) and the dtype of the Vector they were allocated for, so that temporaries sharing a layout reuse the same few arrays instead of calling NumPy allocators.
+    Vectors created with pool=BufferPool(...) draw their data from the pool in allocate() and in the arithmetic operators, and return it with Vector.release() or by using the Vector as a context manager.
+
+    Attributes
+    ----------
+    max_buffers : int
+        Maximum number of idle buffers kept for each layout; released buffers beyond this are discarded
+    hits : int
+        Number of buffer requests served from the pool
+    misses : int
+        Number of buffer requests that required a new allocation
+    discards : int
+        Number of released buffers that were dropped because the pool was full
+    """
+
+    def __init__(self, max_buffers=8):
+        """
+        Initialize an empty pool.
+
+        Parameters
+        ----------
+        max_buffers : int
+            Maximum number of idle buffers kept for each layout
+        """
+        self.max_buffers = max_buffers
+        self.buffers = {}
+        self.hits = 0
+        self.misses = 0
+        self.discards = 0
+
+    @staticmethod
+    def get_key(vector_components_dict, dtype=None):
+        """
+        Return the key under which the buffers for the given layout are stored.
+        """
+        return (int(vector_components_dict.vector_size), np.dtype(dtype))
+
+    def acquire(self, vector_components_dict, dtype=None):
+        """
+        Return an uninitialized buffer for the given layout, reusing an idle buffer whenever possible.
+
+        Parameters
+        ----------
+        vector_components_dict : VectorComponentsDict
+            Layout of the Vector the buffer is requested for
+        dtype : np.dtype
+            dtype of the buffer (float64 by default)
+        """
+        key = self.get_key(vector_components_dict, dtype)
+        idle_buffers = self.buffers.get(key)
+
+        if idle_buffers:
+            self.hits += 1
+            return idle_buffers.pop()
+
+        self.misses += 1
+        return np.empty(key[0], dtype=key[1])
+
+    def release_data(self, vector_components_dict, data):
+        """
+        Return a buffer to the pool.
+        """
+        key = self.get_key(vector_components_dict, data.dtype)
+        idle_buffers = self.buffers.setdefault(key, [])
+
+        if len(idle_buffers) < self.max_buffers:
+            idle_buffers.append(data)
+        else:
+            self.discards += 1
+
+    def release(self, vector):
+        """
+        Return the data of a Vector to the pool and detach it from the Vector.
+        """
+        vector.release()
+
+    @contextmanager
+    def vector(self, vector_components_dict, setup_views=False, lazy_views=False):
+        """
+        Context manager that yields an allocated temporary Vector whose data is returned to the pool on exit.
+
+        Parameters
+        ----------
+        vector_components_dict : VectorComponentsDict
+            Layout of the temporary Vector
+        setup_views : bool
+            Setup views for the subvectors of the temporary Vector
+        lazy_views : bool
+            Create the views of the subvectors of the temporary Vector on first access
+        """
+        vector = Vector(vector_components_dict, lazy_views=lazy_views, pool=self)
+        vector.allocate(setup_views=setup_views)
+        try:
+            yield vector
+        finally:
+            vector.release()
+
+    def stats(self):
+        """
+        Return the hit/miss statistics of the pool and the number of idle buffers it holds.
+        """
+        requests = self.hits + self.misses
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            discards=self.discards,
+            hit_rate=self.hits / requests if requests > 0 else None,
+            idle_buffers=sum(len(idle_buffers) for idle_buffers in self.buffers.values()),
+        )
+
+    def clear(self):
+        """
+        Drop all the idle buffers held by the pool.
+        """
+        self.buffers = {}
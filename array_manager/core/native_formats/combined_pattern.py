@@ -0,0 +1,181 @@
+"""Define the CombinedPattern class"""
+import numpy as np
+from array_manager.core.native_formats.matrix_components_dict import MatrixComponentsDict
+
+
+def _sorted_unique(array):
+    # Same as np.unique() for 1-D arrays, but with a plain sort (much faster than the hash-based np.unique() on large integer arrays)
+    array = np.sort(array)
+    if array.size == 0:
+        return array
+    return array[np.concatenate(([True], array[1:] != array[:-1]))]
+
+
+class CombinedPattern(object):
+    """
+    Union or intersection of the sparsity patterns of two matrices with the same row and column vectors, together with the maps that scatter the nonzeros of both matrices into it.
+    Elementwise operations between matrices with different patterns are then two vectorized scatters into a native Matrix with the combined pattern (the union for addition and subtraction, the intersection for multiplication).
+    The combined pattern is computed from the SparsityPatterns of the matrices (their global rows and cols), so it does not depend on how their submatrices are stored (e.g., for the transpose of a matrix).
+    Combined patterns are built once per pair of patterns and cached on the SparsityPattern of the first matrix; use CombinedPattern.get() instead of creating them directly.
+
+    Attributes
+    ----------
+    kind : str
+        'union' or 'intersection'
+    matrix_components_dict : MatrixComponentsDict
+        Frozen dictionary of the result, with one COO submatrix per submatrix of either (union) or both (intersection) matrices, in the order of the first matrix followed by the new submatrices of the second matrix
+    num_nonzeros : int
+        Number of nonzeros of the combined pattern
+    indices1 : np.ndarray
+        Indices of the nonzeros of the first matrix that are part of the combined pattern (None if all of them are)
+    positions1 : np.ndarray
+        Positions of these nonzeros in the combined pattern
+    indices2 : np.ndarray
+        Indices of the nonzeros of the second matrix that are part of the combined pattern (None if all of them are)
+    positions2 : np.ndarray
+        Positions of these nonzeros in the combined pattern
+    """
+
+    def __init__(self, matrix1, matrix2, kind, dtype=None):
+        """
+        Compute the combined pattern and the scatter maps of the two matrices.
+
+        Parameters
+        ----------
+        matrix1 : Matrix
+            First matrix
+        matrix2 : Matrix
+            Second matrix (with the same row and column vectors as the first one)
+        kind : str
+            'union' or 'intersection'
+        dtype : np.dtype
+            dtype of the result (by default, the common dtype of the two matrices)
+        """
+        if kind not in ('union', 'intersection'):
+            raise ValueError('kind should be "union" or "intersection", not {}'.format(kind))
+
+        matrix_components_dict1 = matrix1.matrix_components_dict
+        matrix_components_dict2 = matrix2.matrix_components_dict
+        vector_components_dict1 = matrix_components_dict1.vector_components_dict1
+        vector_components_dict2 = matrix_components_dict1.vector_components_dict2
+        layouts1 = matrix_components_dict1.vector_layouts
+        layouts2 = matrix_components_dict2.vector_layouts
+        if layouts2[0] is not layouts1[0] or layouts2[1] is not layouts1[1]:
+            raise ValueError('Sparsity patterns can only be combined for matrices with the same row and column vectors')
+
+        if dtype is None:
+            dtype = np.result_type(matrix_components_dict1.dtype, matrix_components_dict2.dtype)
+
+        self.kind = kind
+        pattern1 = matrix1.sparsity_pattern
+        pattern2 = matrix2.sparsity_pattern
+        if pattern1.num_nonzeros != len(matrix1.vals) or pattern2.num_nonzeros != len(matrix2.vals):
+            raise ValueError('The sparsity patterns of the matrices do not match their values')
+
+        # Row-major flat index of every nonzero (int64, since it can exceed the range of the index dtype)
+        num_cols = max(pattern1.dense_shape[1], 1)
+        flat1 = pattern1.rows.astype(np.int64) * num_cols + pattern1.cols
+        flat2 = pattern2.rows.astype(np.int64) * num_cols + pattern2.cols
+
+        if kind == 'union':
+            keys = list(matrix_components_dict1.keys()) + [key for key in matrix_components_dict2.keys() if key not in matrix_components_dict1]
+            flat = _sorted_unique(np.concatenate((flat1, flat2)))
+        else:
+            keys = [key for key in matrix_components_dict1.keys() if key in matrix_components_dict2]
+            flat = np.intersect1d(_sorted_unique(flat1), _sorted_unique(flat2), assume_unique=True)
+
+        rows = flat // num_cols
+        cols = flat % num_cols
+
+        # Rank of the submatrix of every nonzero in keys, from the positions of its row and column subvectors
+        index1 = vector_components_dict1.index
+        index2 = vector_components_dict2.index
+        num_subvectors2 = len(index2.keys)
+        entry_ids = (np.searchsorted(index1.start_indices, rows, side='right') - 1) * num_subvectors2 \
+            + np.searchsorted(index2.start_indices, cols, side='right') - 1
+        key_ids = np.array([index1.positions[name1] * num_subvectors2 + index2.positions[name2] for name1, name2 in keys], dtype=np.int64)
+        sorter = np.argsort(key_ids)
+        ranks = sorter[np.searchsorted(key_ids, entry_ids, sorter=sorter)] if flat.size > 0 else np.zeros(0, dtype=int)
+
+        # Nonzeros grouped by submatrix (flat is sorted, so each submatrix stays in row-major order)
+        order = np.argsort(ranks, kind='stable')
+        new_positions = np.empty_like(order)
+        new_positions[order] = np.arange(order.size)
+        rows = rows[order]
+        cols = cols[order]
+        bounds = np.concatenate(([0], np.cumsum(np.bincount(ranks, minlength=len(keys)))))
+
+        matrix_components_dict = MatrixComponentsDict(vector_components_dict1, vector_components_dict2, dtype=dtype)
+        for i, (name1, name2) in enumerate(keys):
+            ind1, ind2 = bounds[i], bounds[i + 1]
+            matrix_components_dict[name1, name2] = dict(
+                rows=rows[ind1:ind2] - vector_components_dict1[name1]['start_index'],
+                cols=cols[ind1:ind2] - vector_components_dict2[name2]['start_index'],
+            )
+
+        matrix_components_dict.freeze()
+        self.matrix_components_dict = matrix_components_dict
+        self.num_nonzeros = int(flat.size)
+
+        self.indices1, self.positions1 = self._scatter_map(flat, flat1, new_positions)
+        self.indices2, self.positions2 = self._scatter_map(flat, flat2, new_positions)
+
+        # Duplicate entries of a matrix are summed when they are scattered
+        self._unique1 = self.positions1.size == 0 or np.bincount(self.positions1).max() <= 1
+        self._unique2 = self.positions2.size == 0 or np.bincount(self.positions2).max() <= 1
+
+    @staticmethod
+    def _scatter_map(flat, operand_flat, new_positions):
+        positions = np.searchsorted(flat, operand_flat)
+        if flat.size == 0:
+            return np.zeros(0, dtype=int), new_positions[positions[:0]]
+
+        found = flat[np.minimum(positions, flat.size - 1)] == operand_flat
+        if np.all(found):
+            return None, new_positions[positions]
+
+        indices = np.flatnonzero(found)
+        return indices, new_positions[positions[indices]]
+
+    @classmethod
+    def get(cls, matrix1, matrix2, kind, dtype=None):
+        """
+        Return the (cached) union or intersection of the patterns of two matrices; see CombinedPattern.__init__() for the parameters.
+        """
+        if dtype is None:
+            dtype = np.result_type(matrix1.dtype, matrix2.dtype)
+
+        combined_patterns = matrix1.sparsity_pattern.combined_patterns
+        key = (kind, matrix2.sparsity_pattern.layout, np.dtype(dtype))
+        if key not in combined_patterns:
+            combined_patterns[key] = cls(matrix1, matrix2, kind, dtype)
+
+        return combined_patterns[key]
+
+    def scatter(self, data, operand, dtype=None):
+        """
+        Return the nonzeros of the first (operand=1) or second (operand=2) matrix scattered over the combined pattern, with zeros where the matrix has no nonzero.
+        """
+        if operand == 1:
+            indices, positions, unique = self.indices1, self.positions1, self._unique1
+        else:
+            indices, positions, unique = self.indices2, self.positions2, self._unique2
+
+        out = np.zeros(self.num_nonzeros, dtype=data.dtype if dtype is None else dtype)
+        values = data if indices is None else data[indices]
+        if unique:
+            out[positions] = values
+        else:
+            np.add.at(out, positions, values)
+
+        return out
+
+    def combine(self, ufunc, data1, data2):
+        """
+        Return ufunc(data1, data2) over the combined pattern, where data1 and data2 are the nonzeros of the first and second matrices.
+        """
+        dtype = np.result_type(data1, data2)
+        values1 = self.scatter(data1, 1, dtype)
+        values2 = self.scatter(data2, 2, dtype)
+
+        return ufunc(values1, values2, out=values1)
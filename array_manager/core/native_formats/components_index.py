@@ -0,0 +1,158 @@
+"""Define the ComponentsIndex and MatrixComponentsIndex classes"""
+import numpy as np
+
+
+class ComponentsIndex(object):
+    """
+    Frozen, array-backed index of the components of a VectorComponentsDict.
+    The offsets of all the components are stored as NumPy arrays (struct-of-arrays) so that operations over all components can be vectorized.
+    Indexing with a component name still returns a dictionary with the same keys as the component dictionaries in a VectorComponentsDict.
+
+    Attributes
+    ----------
+    keys : tuple
+        Names of the components in the order in which they are stored
+    positions : dict
+        Dictionary mapping each component name to its position in the arrays below
+    start_indices : np.ndarray
+        Starting indices of the components in the concatenated vector
+    end_indices : np.ndarray
+        Ending indices of the components in the concatenated vector
+    sizes : np.ndarray
+        Sizes of the components
+    shapes : tuple
+        Shapes of the components
+    """
+
+    def __init__(self, keys, start_indices, end_indices, shapes):
+        """
+        Initialize the index from the offsets of all the components.
+
+        Parameters
+        ----------
+        keys : iterable
+            Names of the components
+        start_indices : array_like
+            Starting indices of the components in the concatenated vector
+        end_indices : array_like
+            Ending indices of the components in the concatenated vector
+        shapes : iterable
+            Shapes of the components
+        """
+        self.keys = tuple(keys)
+        self.positions = {key: i for i, key in enumerate(self.keys)}
+        self.shapes = tuple(shapes)
+
+        self.start_indices = self._frozen_array(start_indices)
+        self.end_indices = self._frozen_array(end_indices)
+        self.sizes = self._frozen_array(self.end_indices - self.start_indices)
+
+    @staticmethod
+    def _frozen_array(array):
+        array = np.array(array, dtype=int).reshape(-1)
+        array.setflags(write=False)
+        return array
+
+    @classmethod
+    def from_vector_components_dict(cls, vector_components_dict):
+        """
+        Build the index of a VectorComponentsDict.
+        """
+        num_components = len(vector_components_dict)
+        start_indices = np.fromiter((component_dict['start_index'] for component_dict in vector_components_dict.values()), dtype=int, count=num_components)
+        end_indices = np.fromiter((component_dict['end_index'] for component_dict in vector_components_dict.values()), dtype=int, count=num_components)
+        shapes = [component_dict['shape'] for component_dict in vector_components_dict.values()]
+
+        return cls(vector_components_dict.keys(), start_indices, end_indices, shapes)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        return key in self.positions
+
+    def __iter__(self):
+        return iter(self.keys)
+
+    def __getitem__(self, key):
+        i = self.positions[key]
+        return dict(
+            shape=self.shapes[i],
+            size=int(self.sizes[i]),
+            start_index=int(self.start_indices[i]),
+            end_index=int(self.end_indices[i]),
+        )
+
+    def get_positions(self, keys):
+        """
+        Return the positions of the given components as an integer array.
+        """
+        return np.array([self.positions[key] for key in keys], dtype=int)
+
+    def get_slice(self, key):
+        """
+        Return the slice of the concatenated vector that stores the given component.
+        """
+        i = self.positions[key]
+        return slice(int(self.start_indices[i]), int(self.end_indices[i]))
+
+
+class MatrixComponentsIndex(ComponentsIndex):
+    """
+    Frozen, array-backed index of the components of a MatrixComponentsDict.
+    In addition to the offsets of the values of each submatrix, the row and column ranges of each submatrix in the full matrix are stored as arrays.
+    The shapes stored in this index are the shapes of the values of the submatrices ('vals_shape').
+
+    Attributes
+    ----------
+    row_start_indices : np.ndarray
+        Starting row indices of the submatrices in the full matrix
+    row_end_indices : np.ndarray
+        Ending row indices of the submatrices in the full matrix
+    col_start_indices : np.ndarray
+        Starting column indices of the submatrices in the full matrix
+    col_end_indices : np.ndarray
+        Ending column indices of the submatrices in the full matrix
+    """
+
+    def __init__(self, keys, start_indices, end_indices, shapes, row_start_indices, row_end_indices, col_start_indices, col_end_indices):
+        super().__init__(keys, start_indices, end_indices, shapes)
+
+        self.row_start_indices = self._frozen_array(row_start_indices)
+        self.row_end_indices = self._frozen_array(row_end_indices)
+        self.col_start_indices = self._frozen_array(col_start_indices)
+        self.col_end_indices = self._frozen_array(col_end_indices)
+
+    @classmethod
+    def from_matrix_components_dict(cls, matrix_components_dict):
+        """
+        Build the index of a MatrixComponentsDict.
+        """
+        num_components = len(matrix_components_dict)
+
+        def gather(name):
+            return np.fromiter((component_dict[name] for component_dict in matrix_components_dict.values()), dtype=int, count=num_components)
+
+        shapes = [component_dict['vals_shape'] for component_dict in matrix_components_dict.values()]
+
+        return cls(
+            matrix_components_dict.keys(),
+            gather('start_index'),
+            gather('end_index'),
+            shapes,
+            gather('row_start_index'),
+            gather('row_end_index'),
+            gather('col_start_index'),
+            gather('col_end_index'),
+        )
+
+    def __getitem__(self, key):
+        component_dict = super().__getitem__(key)
+        i = self.positions[key]
+        component_dict.update(
+            row_start_index=int(self.row_start_indices[i]),
+            row_end_index=int(self.row_end_indices[i]),
+            col_start_index=int(self.col_start_indices[i]),
+            col_end_index=int(self.col_end_indices[i]),
+        )
+        return component_dict
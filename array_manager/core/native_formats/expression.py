@@ -0,0 +1,176 @@
+"""Define the Expression class used for the lazy evaluation of Vector arithmetic"""
+import numpy as np
+from contextlib import contextmanager
+from array_manager.utils import parallel
+
+
+# While True, the arithmetic operators of Vector return Expression objects instead of new Vectors
+_lazy = False
+
+
+def lazy_enabled():
+    """
+    Return True if the arithmetic operators of Vector build expressions instead of evaluating them.
+    """
+    return _lazy
+
+
+@contextmanager
+def lazy_mode():
+    """
+    Context manager in which the arithmetic operators of Vector build Expression objects, e.g.,
+
+        with lazy_mode():
+            w.set_data(a * x + b * y - z)
+
+    evaluates a * x + b * y - z in a single pass into w without full-length temporaries.
+    """
+    global _lazy
+    previous = _lazy
+    _lazy = True
+    try:
+        yield
+    finally:
+        _lazy = previous
+
+
+def _is_vector(operand):
+    # Vector is not imported here because vector.py imports this module
+    return hasattr(operand, 'vector_components_dict') and hasattr(operand, 'data')
+
+
+class Expression(object):
+    """
+    Lazily evaluated elementwise expression of Vector objects, 1-D arrays and scalars.
+    The layouts of the operands are checked once, when the expression is built.
+    evaluate() then computes the whole expression in one fused pass over cache-sized chunks (on a thread pool if the parallel mode is on, see array_manager.utils.parallel), so intermediate results never exist as full-length arrays.
+    Expressions are built by the operators of Vector in lazy_mode(), or from Vector.lazy(), and are evaluated by evaluate(), Vector.set_data() or an in-place operator of Vector.
+
+    Attributes
+    ----------
+    ufunc : np.ufunc
+        Elementwise operation at the root of the expression
+    operands : tuple
+        Operands of ufunc: Expressions, data arrays of Vectors, 1-D arrays or scalars
+    vector : Vector
+        A Vector of the expression, whose layout is the layout of the expression and of its result
+    """
+
+    def __init__(self, ufunc, operands, vector):
+        """
+        Initialize the expression; use from_operation() to check the operands.
+        """
+        self.ufunc = ufunc
+        self.operands = operands
+        self.vector = vector
+
+    @classmethod
+    def from_operation(cls, ufunc, *operands):
+        """
+        Build the expression ufunc(*operands) after checking that all the Vector, Expression and array operands have the same layout.
+        """
+        vector = None
+        stored_operands = []
+        arrays = []
+
+        for operand in operands:
+            if isinstance(operand, Expression):
+                operand_vector = operand.vector
+                stored_operands.append(operand)
+            elif _is_vector(operand):
+                operand_vector = operand
+                stored_operands.append(operand.data)
+            else:
+                operand_vector = None
+                stored_operands.append(operand)
+                if isinstance(operand, np.ndarray) and operand.ndim > 0:
+                    arrays.append(operand)
+
+            if vector is None:
+                vector = operand_vector
+            elif operand_vector is not None:
+                vector.check_type_and_size(operand_vector)
+
+        if vector is None:
+            raise TypeError('An expression needs at least one Vector operand')
+
+        for array in arrays:
+            vector.check_type_and_size(array)
+
+        return cls(ufunc, tuple(stored_operands), vector)
+
+    def _evaluate(self, ind1, ind2, out=None):
+        args = [
+            operand._evaluate(ind1, ind2) if isinstance(operand, Expression)
+            else operand[ind1:ind2] if isinstance(operand, np.ndarray) and operand.ndim > 0
+            else operand
+            for operand in self.operands
+        ]
+
+        if out is None:
+            return self.ufunc(*args)
+
+        return self.ufunc(*args, out=out)
+
+    @property
+    def dtype(self):
+        # Evaluating an empty chunk gives the dtype NumPy would give the result
+        return self._evaluate(0, 0).dtype
+
+    def evaluate(self, out=None):
+        """
+        Evaluate the expression in one fused pass.
+
+        Parameters
+        ----------
+        out : Vector
+            Vector with the same layout into which the result is written; it may be one of the operands. A new Vector is returned if out is None.
+        """
+        if out is None:
+            out = self.vector._new_vector(dtype=self.dtype)
+        else:
+            self.vector.check_type_and_size(out)
+
+        out_data = out.data
+        parallel.map_chunks(lambda ind1, ind2: self._evaluate(ind1, ind2, out=out_data[ind1:ind2]), out_data.size, chunked=True)
+
+        return out
+
+    def __len__(self):
+        return len(self.vector)
+
+    def __add__(self, other):
+        return Expression.from_operation(np.add, self, other)
+
+    def __radd__(self, other):
+        return Expression.from_operation(np.add, other, self)
+
+    def __sub__(self, other):
+        return Expression.from_operation(np.subtract, self, other)
+
+    def __rsub__(self, other):
+        return Expression.from_operation(np.subtract, other, self)
+
+    def __mul__(self, other):
+        return Expression.from_operation(np.multiply, self, other)
+
+    def __rmul__(self, other):
+        return Expression.from_operation(np.multiply, other, self)
+
+    def __truediv__(self, other):
+        return Expression.from_operation(np.true_divide, self, other)
+
+    def __rtruediv__(self, other):
+        return Expression.from_operation(np.true_divide, other, self)
+
+    def __pow__(self, other):
+        return Expression.from_operation(np.power, self, other)
+
+    def __rpow__(self, other):
+        return Expression.from_operation(np.power, other, self)
+
+    def __neg__(self):
+        return Expression.from_operation(np.negative, self)
+
+    # NumPy scalars and arrays on the left of an operator defer to the reflected operators above
+    __array_ufunc__ = None
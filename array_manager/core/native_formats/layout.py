@@ -0,0 +1,84 @@
+"""Define the Layout class"""
+import hashlib
+import weakref
+import numpy as np
+
+
+class Layout(object):
+    """
+    Immutable, interned summary of the structure of a frozen VectorComponentsDict or MatrixComponentsDict.
+    Two layouts with the same fingerprint are the same object, so checking that two vectors (or two matrices) are compatible is an identity comparison instead of a comparison of their offsets or sparsity structures.
+    Layouts are obtained with VectorComponentsDict.snapshot(), VectorComponentsDict.freeze() and MatrixComponentsDict.freeze(); they are not created directly.
+
+    Attributes
+    ----------
+    fingerprint : str
+        Hash of everything that determines the layout (names, shapes, offsets and, for matrices, the sparsity structure).
+        The dtype is not part of the layout so that, e.g., float and complex vectors with the same subvectors stay compatible.
+    kind : str
+        'vector' or 'matrix'
+    shape : tuple
+        (vector_size,) for a vector or the dense shape of a matrix
+    """
+
+    # Interned layouts, keyed by fingerprint; a layout disappears once no frozen dictionary refers to it
+    _interned = weakref.WeakValueDictionary()
+
+    def __init__(self, fingerprint, kind, shape):
+        self.fingerprint = fingerprint
+        self.kind = kind
+        self.shape = tuple(int(n) for n in shape)
+        self._transpose = None
+
+    @classmethod
+    def intern(cls, fingerprint, kind, shape):
+        """
+        Return the layout with the given fingerprint, creating it if it does not exist yet.
+        """
+        layout = cls._interned.get(fingerprint)
+        if layout is None:
+            layout = cls._interned[fingerprint] = cls(fingerprint, kind, shape)
+
+        return layout
+
+    @staticmethod
+    def hash_parts(*parts):
+        """
+        Return the fingerprint of the given parts; arrays are hashed by content, everything else by repr().
+        """
+        h = hashlib.blake2b(digest_size=16)
+        for part in parts:
+            if isinstance(part, np.ndarray):
+                h.update(b'array')
+                h.update(np.ascontiguousarray(part, dtype='<i8').tobytes())
+            else:
+                h.update(repr(part).encode('utf-8'))
+            h.update(b'|')
+
+        return h.hexdigest()
+
+    def transpose(self):
+        """
+        Return the layout of the transpose of a matrix with this layout.
+        """
+        if self._transpose is None:
+            self._transpose = Layout.intern(Layout.hash_parts('transpose', self.fingerprint), self.kind, self.shape[::-1])
+            self._transpose._transpose = self
+
+        return self._transpose
+
+    def __hash__(self):
+        return hash(self.fingerprint)
+
+    def __eq__(self, other):
+        return self is other or (isinstance(other, Layout) and self.fingerprint == other.fingerprint)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __reduce__(self):
+        # Unpickled layouts are interned again
+        return (Layout.intern, (self.fingerprint, self.kind, self.shape))
+
+    def __repr__(self):
+        return 'Layout({}, shape={}, fingerprint={})'.format(self.kind, self.shape, self.fingerprint)
@@ -1,12 +1,15 @@
 """Define the Vector class"""
 import numpy as np
-from array_manager.core.native_formats.vector_components_dict import VectorComponentsDict
 from array_manager.core.native_formats.matrix_components_dict import MatrixComponentsDict
 from array_manager.core.native_formats.vector import Vector
+from array_manager.core.native_formats.multi_vector import MultiVector
+from array_manager.core.native_formats.combined_pattern import CombinedPattern
 from array_manager.core.standard_formats.dense_matrix import DenseMatrix
 from array_manager.core.standard_formats.coo_matrix import COOMatrix
 from array_manager.core.standard_formats.csr_matrix import CSRMatrix
 from array_manager.core.standard_formats.csc_matrix import CSCMatrix
+from array_manager.utils.validation import validation_enabled, SCALAR_TYPES
+from array_manager.utils.vector_file import resolve_mode
 import scipy.sparse as sp
 
 
@@ -19,6 +22,12 @@ class Matrix(object):
     ----------
     vals : Vector
         Concatenated vector of a list of variables 
+    sparsity_pattern : SparsityPattern
+        Immutable rows and cols of the nonzeros, shared with all the matrices built from the same MatrixComponentsDict
+    layout : Layout
+        Interned layout of the frozen MatrixComponentsDict; matrices with the same layout have the same sparsity structure
+    index_dtype : np.dtype
+        dtype of rows and cols (int32 when the shape and the number of nonzeros allow it, int64 otherwise)
 
     """
 
@@ -35,80 +44,82 @@ class Matrix(object):
         self.dense_shape = matrix_components_dict.dense_shape
         self.dense_size = matrix_components_dict.dense_size
         self.num_nonzeros = matrix_components_dict.num_nonzeros
+        self.dtype = matrix_components_dict.dtype
+
+        # The pattern is assembled the first time a Matrix is built from this dictionary and shared afterwards
+        self.sparsity_pattern = matrix_components_dict.sparsity_pattern
+
+        # Interned layout used by the compatibility checks of the operators
+        self.layout = self.sparsity_pattern.layout
+        self.index_dtype = self.sparsity_pattern.index_dtype
 
         if (self.num_nonzeros==0) and (self.dense_size==0):
             self.density = None
         else:
             self.density = float(self.num_nonzeros / self.dense_size)
-        self.rows = np.zeros(self.num_nonzeros, dtype=int)
-        self.cols = np.zeros(self.num_nonzeros, dtype=int)
-
-        vector_components_dict = VectorComponentsDict()
-
-        for key, component_dict in matrix_components_dict.items():
-            shape = component_dict['shape']
-            # COO arrays from given CSR or CSC arrays
-            if isinstance(component_dict['ind_ptr'], np.ndarray):
-                ind_ptr = component_dict['ind_ptr']
-                # Compute differences between consecutive elements in the ind_ptr array
-                num_repeats = np.ediff1d(ind_ptr)
-                if isinstance(component_dict['rows'], np.ndarray):
-                    component_dict['cols'] = np.repeat(np.arange(shape[1]), num_repeats)
-
-                elif isinstance(component_dict['cols'], np.ndarray):
-                    component_dict['rows'] =  np.repeat(np.arange(shape[0]), num_repeats)
-
-                # need this?
-                # del matrix_dict['ind_ptr']
-
-            # Dense matrix component
-            elif (component_dict['rows'] is None) and (component_dict['cols'] is None):
-                # print('Here')
-                component_dict['rows'] = np.repeat(np.arange(shape[0]), shape[1])
-                component_dict['cols'] = np.tile(np.arange(shape[1]), shape[0])
-
-            global_rows = component_dict['rows'] + component_dict['row_start_index']
-            global_cols = component_dict['cols'] + component_dict['col_start_index']
-
-            start = component_dict['start_index']
-            end = component_dict['end_index']
-            
-            self.rows[start:end] = global_rows
-            self.cols[start:end] = global_cols
 
-            # need this?
-            # del matrix_dict['rows']
-            # del matrix_dict['cols']
-            
-            vals_shape = component_dict['vals_shape']
-            vector_components_dict[key] = dict(shape=vals_shape)
-
-        self.vals = Vector(vector_components_dict)
+        self.vals = Vector(matrix_components_dict.values_components_dict)
+        self._operator = None
 
         # for key, component_dict in matrix_components_dict.items():
         #     vals = self.component_dict['vals']
         #     if vals:
         #         self[key] = vals
 
+    @property
+    def rows(self):
+        return self.sparsity_pattern.rows
+
+    @property
+    def cols(self):
+        return self.sparsity_pattern.cols
+
     def __getitem__(self, key):
         return self.vals[key]
 
     def __setitem__(self, key, value):
         self.vals[key] = value
 
-    def allocate(self, copy=False, data=None):
-        
-        if data is not None and not copy: 
-            pass
+    def allocate(self, copy=False, data=None, filename=None, mode=None, shared_memory=False, set_vals=True):
+        """
+        Allocate the values of the matrix.
+
+        Parameters
+        ----------
+        copy : bool
+            Allocate new memory even if data is given
+        data : np.ndarray
+            Vector of nonzeros to be used as the values of the matrix (no copy is made)
+        filename : str
+            If given, the values are a np.memmap of this file; see Vector.allocate() for the file format and mode
+        mode : str
+            Mode used to open the file ('w+', 'r+', 'r' or 'c')
+        shared_memory : bool
+            If True, the values are stored in a shared-memory segment so that pickling the matrix for a worker process does not copy them; see Vector.allocate()
+        set_vals : bool
+            If False, the vals given in the submatrix dictionaries are not copied into the values (e.g., when data holds values that were saved before)
+        """
+        if filename is not None and (data is None or copy):
+            # An existing file keeps the values that were saved in it
+            set_vals = set_vals and resolve_mode(filename, mode) == 'w+'
+            self.vals.allocate(filename=filename, mode=mode, setup_views=True)
+
+        elif shared_memory and (data is None or copy):
+            self.vals.allocate(setup_views=True, shared_memory=True)
+
         else:
-            data = np.zeros(self.num_nonzeros)
+            if data is not None and not copy: 
+                pass
+            else:
+                data = np.zeros(self.num_nonzeros, dtype=self.dtype)
 
-        self.vals.allocate(data=data, setup_views=True)
+            self.vals.allocate(data=data, setup_views=True)
 
-        for key, component_dict in self.matrix_components_dict.items():
-            vals = component_dict['vals']
-            if vals is not None:
-                self[key] = vals
+        if set_vals:
+            for key, component_dict in self.matrix_components_dict.items():
+                vals = component_dict['vals']
+                if vals is not None:
+                    self[key] = vals
 
         # ind1 = 0
         # ind2 = 0
@@ -128,15 +139,8 @@ class Matrix(object):
     def transpose(self):
         # Note: Assigning values to the transpose matrix will yield wrong results. Need to be careful while working with transpose matrices.
 
-        new_matrix_components_dict = MatrixComponentsDict(self.matrix_components_dict.vector_components_dict2, self.matrix_components_dict.vector_components_dict1)
-        new_matrix = Matrix(new_matrix_components_dict)
-        # new_matrix.dense_shape = self.dense_shape[::-1]
-        # new_matrix.dense_size = self.dense_size
-        new_matrix.num_nonzeros = self.num_nonzeros
-
-        new_matrix.density = self.density
-        new_matrix.cols = self.rows
-        new_matrix.rows = self.cols
+        # The dictionary of the transpose keeps the nonzeros in the same order, so the values are shared
+        new_matrix = Matrix(self.matrix_components_dict.transpose())
         new_matrix.vals = self.vals
 
         return new_matrix
@@ -146,21 +150,51 @@ class Matrix(object):
     def __len__(self):
         return len(self.vals)
 
+    def has_same_layout(self, other):
+        # Layouts are interned, so this is an identity comparison
+        return isinstance(other, Matrix) and other.layout is self.layout
+
+    def has_same_vectors(self, other):
+        # Matrices with the same row and column vectors (but possibly different sparsity patterns) can be combined into a native Matrix
+        if not isinstance(other, Matrix):
+            return False
+
+        layouts1 = self.matrix_components_dict.vector_layouts
+        layouts2 = other.matrix_components_dict.vector_layouts
+        return layouts2[0] is layouts1[0] and layouts2[1] is layouts1[1]
+
+    def combine(self, other, ufunc, kind):
+        """
+        Return the Matrix ufunc(self, other) on the union (kind='union') or the intersection (kind='intersection') of the sparsity patterns of self and other.
+        The combined pattern and the scatter maps of both matrices are computed once per pair of patterns and cached.
+        """
+        combined_pattern = CombinedPattern.get(self, other, kind)
+        new_matrix = Matrix(combined_pattern.matrix_components_dict)
+        new_matrix.allocate(data=combined_pattern.combine(ufunc, self.vals.data, other.vals.data))
+        return new_matrix
+
     def check_type_and_size_inplace(self, other):
-        if isinstance(other, (int, float)):
+        # Can be turned off with array_manager.utils.validation.skip_validation()
+        if not validation_enabled():
+            return
+
+        if isinstance(other, SCALAR_TYPES):
             pass
         
         elif isinstance(other, Matrix):
             if other.dense_shape != self.dense_shape:
                 raise TypeError('Arguments should be objects of the Matrix class with same shapes')
-            if len(other) != self.num_nonzeros or other.rows != self.rows or other.cols != self.cols:
+            if not self.has_same_layout(other):
                 raise TypeError('Arguments should be objects of the Matrix class with same sparsity structure')
 
         else:
-            raise TypeError('Argument should be either an object of the Matrix class or a scalar (int or float)')
+            raise TypeError('Argument should be either an object of the Matrix class or a scalar (int, float or complex)')
 
     def check_type_and_size(self, other):
-        if isinstance(other, (int, float)):
+        if not validation_enabled():
+            return
+
+        if isinstance(other, SCALAR_TYPES):
             pass
 
         # elif isinstance(other, Vector):
@@ -178,25 +212,42 @@ class Matrix(object):
             if other.shape != self.dense_shape:
                 raise TypeError('Argument should be objects of the numpy/scipy array class with same shapes')
         else:
-            raise TypeError('Argument should be either an object of the Matrix/numpy.ndarray class or a scalar (int or float)')
+            raise TypeError('Argument should be either an object of the Matrix/numpy.ndarray class or a scalar (int, float or complex)')
+
+    def operator(self, refresh=True):
+        """
+        Return a scipy matrix with the values of self, used for the matrix products.
+        The operator is cached and its index arrays are built once per sparsity pattern (see SparsityPattern.build_operator()).
+        If the operator uses self.vals.data as its data, it is always up to date; otherwise, its data is refreshed in place from self.vals.data, unless refresh is False (e.g., in a Krylov loop in which the values do not change).
+        """
+        pattern = self.sparsity_pattern
+        data = self.vals.data
+        operator = self._operator
+
+        if operator is None or operator.data.dtype != data.dtype or (pattern.operator_aliases_values() and operator.data is not data):
+            operator = self._operator = pattern.build_operator(data)
+        elif refresh:
+            pattern.refresh_operator(operator, data)
+
+        return operator
 
     def scipy_coo(self, native_matrix):
-        return sp.coo_matrix((native_matrix.data, (native_matrix.rows, native_matrix.cols)), shape=native_matrix.dense_shape)
+        return sp.coo_matrix((native_matrix.vals.data, (native_matrix.rows, native_matrix.cols)), shape=native_matrix.dense_shape)
 
     def __iadd__(self, other):
         self.check_type_and_size_inplace(other)
-        if isinstance(other, (int, float)):
+        if isinstance(other, SCALAR_TYPES):
             raise NotImplementedError('Adding a nonzero scalar to a sparse matrix is not supported')
-        else:              # isinstance(other, (int, float))
+        else:              # isinstance(other, Matrix)
             self.vals += other.vals
 
         return self
           
     def __isub__(self, other):
         self.check_type_and_size_inplace(other)
-        if isinstance(other, (int, float)):
+        if isinstance(other, SCALAR_TYPES):
             raise NotImplementedError('Subtracting a nonzero scalar to a sparse matrix is not supported')
-        else:              # isinstance(other, (int, float))
+        else:              # isinstance(other, Matrix)
             self.vals -= other.vals
 
         return self
@@ -241,19 +292,22 @@ class Matrix(object):
     def __add__(self, other):
         self.check_type_and_size(other)
         # Returns Matrix object
-        if isinstance(other, (int, float)):
+        if isinstance(other, SCALAR_TYPES):
             new_matrix = Matrix(self.matrix_components_dict)
             new_data = self.vals.data + other
             new_matrix.allocate(data=new_data)
             return new_matrix
 
-        elif isinstance(other, Matrix) and len(other) == self.num_nonzeros: 
+        elif isinstance(other, Matrix): 
             # Returns Matrix object
-            if other.rows == self.rows and other.cols == self.cols:
+            if self.has_same_layout(other):
                 new_matrix = Matrix(self.matrix_components_dict)
                 new_data = self.vals.data + other.vals.data
                 new_matrix.allocate(data=new_data)
                 return new_matrix
+            # Returns Matrix object on the union of the sparsity patterns
+            elif self.has_same_vectors(other):
+                return self.combine(other, np.add, 'union')
             # Returns scipy.coo.coo_matrix object
             else:
                 return self.scipy_coo(self) + self.scipy_coo(other)
@@ -262,13 +316,13 @@ class Matrix(object):
         elif isinstance(other, DenseMatrix):
             return DenseMatrix(self).data + other.data
         elif isinstance(other, COOMatrix):
-            scipy_matrix = sp.coo_matrix((other.data, (other.rows, other.cols)), shape=other.dense_shape)
+            scipy_matrix = other.get_std_array()
             return self.scipy_coo(self) + scipy_matrix
         elif isinstance(other, CSRMatrix):
-            scipy_matrix = sp.csr_matrix((other.data, other.cols, other.indptr), shape=other.dense_shape)
+            scipy_matrix = other.get_std_array()
             return self.scipy_coo(self) + scipy_matrix
         elif isinstance(other, CSCMatrix):
-            scipy_matrix = sp.csc_matrix((other.data, other.rows, other.indptr), shape=other.dense_shape)
+            scipy_matrix = other.get_std_array()
             return self.scipy_coo(self) + scipy_matrix
 
         else: # isinstance(other, (np.ndarray, sp.csr.csr_matrix, sp.csc.csc_matrix, sp.coo.coo_matrix))
@@ -277,19 +331,22 @@ class Matrix(object):
     def __sub__(self, other):
         self.check_type_and_size(other)
         # Returns Matrix object
-        if isinstance(other, (int, float)):
+        if isinstance(other, SCALAR_TYPES):
             new_matrix = Matrix(self.matrix_components_dict)
             new_data = self.vals.data - other
             new_matrix.allocate(data=new_data)
             return new_matrix
 
-        elif isinstance(other, Matrix) and len(other) == self.num_nonzeros: 
+        elif isinstance(other, Matrix): 
             # Returns Matrix object
-            if other.rows == self.rows and other.cols == self.cols:
+            if self.has_same_layout(other):
                 new_matrix = Matrix(self.matrix_components_dict)
                 new_data = self.vals.data - other.vals.data
                 new_matrix.allocate(data=new_data)
                 return new_matrix
+            # Returns Matrix object on the union of the sparsity patterns
+            elif self.has_same_vectors(other):
+                return self.combine(other, np.subtract, 'union')
             # Returns scipy.coo.coo_matrix object
             else:
                 return self.scipy_coo(self) - self.scipy_coo(other)
@@ -298,13 +355,13 @@ class Matrix(object):
         elif isinstance(other, DenseMatrix):
             return DenseMatrix(self).data - other.data
         elif isinstance(other, COOMatrix):
-            scipy_matrix = sp.coo_matrix((other.data, (other.rows, other.cols)), shape=other.dense_shape)
+            scipy_matrix = other.get_std_array()
             return self.scipy_coo(self) - scipy_matrix
         elif isinstance(other, CSRMatrix):
-            scipy_matrix = sp.csr_matrix((other.data, other.cols, other.indptr), shape=other.dense_shape)
+            scipy_matrix = other.get_std_array()
             return self.scipy_coo(self) - scipy_matrix
         elif isinstance(other, CSCMatrix):
-            scipy_matrix = sp.csc_matrix((other.data, other.rows, other.indptr), shape=other.dense_shape)
+            scipy_matrix = other.get_std_array()
             return self.scipy_coo(self) - scipy_matrix
 
         else: # isinstance(other, (np.ndarray, sp.csr.csr_matrix, sp.csc.csc_matrix, sp.coo.coo_matrix))
@@ -313,34 +370,37 @@ class Matrix(object):
     def __mul__(self, other):
         self.check_type_and_size(other)
         # Returns Matrix object
-        if isinstance(other, (int, float)):
+        if isinstance(other, SCALAR_TYPES):
             new_matrix = Matrix(self.matrix_components_dict)
             new_data = self.vals.data * other
             new_matrix.allocate(data=new_data)
             return new_matrix
 
-        elif isinstance(other, Matrix) and len(other) == self.num_nonzeros: 
+        elif isinstance(other, Matrix): 
             # Returns Matrix object
-            if other.rows == self.rows and other.cols == self.cols:
+            if self.has_same_layout(other):
                 new_matrix = Matrix(self.matrix_components_dict)
                 new_data = self.vals.data * other.vals.data
                 new_matrix.allocate(data=new_data)
                 return new_matrix
+            # Returns Matrix object on the intersection of the sparsity patterns
+            elif self.has_same_vectors(other):
+                return self.combine(other, np.multiply, 'intersection')
             # Returns scipy.coo.coo_matrix object
             else:
-                return self.scipy_coo(self) * self.scipy_coo(other)
+                return self.scipy_coo(self).multiply(self.scipy_coo(other))
 
         # Returns dense np.ndarray object # new Densematrix is not stored?
         elif isinstance(other, DenseMatrix):
             return DenseMatrix(self).data * other.data
         elif isinstance(other, COOMatrix):
-            scipy_matrix = sp.coo_matrix((other.data, (other.rows, other.cols)), shape=other.dense_shape)
+            scipy_matrix = other.get_std_array()
             return self.scipy_coo(self) * scipy_matrix
         elif isinstance(other, CSRMatrix):
-            scipy_matrix = sp.csr_matrix((other.data, other.cols, other.indptr), shape=other.dense_shape)
+            scipy_matrix = other.get_std_array()
             return self.scipy_coo(self) * scipy_matrix
         elif isinstance(other, CSCMatrix):
-            scipy_matrix = sp.csc_matrix((other.data, other.rows, other.indptr), shape=other.dense_shape)
+            scipy_matrix = other.get_std_array()
             return self.scipy_coo(self) * scipy_matrix
 
         else: # isinstance(other, (np.ndarray, sp.csr.csr_matrix, sp.csc.csc_matrix, sp.coo.coo_matrix))
@@ -349,7 +409,7 @@ class Matrix(object):
     def __truediv__(self, other):
         self.check_type_and_size(other)
         # Returns Matrix object
-        if isinstance(other, (int, float)):
+        if isinstance(other, SCALAR_TYPES):
             new_matrix = Matrix(self.matrix_components_dict)
             new_data = self.vals.data / other
             new_matrix.allocate(data=new_data)
@@ -357,7 +417,7 @@ class Matrix(object):
 
         elif isinstance(other, Matrix) and len(other) == self.num_nonzeros: 
             # Returns Matrix object
-            if other.rows == self.rows and other.cols == self.cols:
+            if self.has_same_layout(other):
                 new_matrix = Matrix(self.matrix_components_dict)
                 new_data = self.vals.data / other.vals.data
                 new_matrix.allocate(data=new_data)
@@ -370,13 +430,13 @@ class Matrix(object):
         elif isinstance(other, DenseMatrix):
             return DenseMatrix(self).data / other.data
         elif isinstance(other, COOMatrix):
-            scipy_matrix = sp.coo_matrix((other.data, (other.rows, other.cols)), shape=other.dense_shape)
+            scipy_matrix = other.get_std_array()
             return self.scipy_coo(self) / scipy_matrix
         elif isinstance(other, CSRMatrix):
-            scipy_matrix = sp.csr_matrix((other.data, other.cols, other.indptr), shape=other.dense_shape)
+            scipy_matrix = other.get_std_array()
             return self.scipy_coo(self) / scipy_matrix
         elif isinstance(other, CSCMatrix):
-            scipy_matrix = sp.csc_matrix((other.data, other.rows, other.indptr), shape=other.dense_shape)
+            scipy_matrix = other.get_std_array()
             return self.scipy_coo(self) / scipy_matrix
 
         else: # isinstance(other, (np.ndarray, sp.csr.csr_matrix, sp.csc.csc_matrix, sp.coo.coo_matrix))
@@ -385,7 +445,7 @@ class Matrix(object):
     def __pow__(self, other):
         self.check_type_and_size(other)
         # Returns Matrix object
-        if isinstance(other, (int, float)):
+        if isinstance(other, SCALAR_TYPES):
             new_matrix = Matrix(self.matrix_components_dict)
             new_data = self.vals.data ** other
             new_matrix.allocate(data=new_data)
@@ -393,7 +453,7 @@ class Matrix(object):
 
         elif isinstance(other, Matrix) and len(other) == self.num_nonzeros: 
             # Returns Matrix object
-            if other.rows == self.rows and other.cols == self.cols:
+            if self.has_same_layout(other):
                 new_matrix = Matrix(self.matrix_components_dict)
                 new_data = self.vals.data ** other.vals.data
                 new_matrix.allocate(data=new_data)
@@ -406,13 +466,13 @@ class Matrix(object):
         elif isinstance(other, DenseMatrix):
             return DenseMatrix(self).data ** other.data
         elif isinstance(other, COOMatrix):
-            scipy_matrix = sp.coo_matrix((other.data, (other.rows, other.cols)), shape=other.dense_shape)
+            scipy_matrix = other.get_std_array()
             return self.scipy_coo(self) ** scipy_matrix
         elif isinstance(other, CSRMatrix):
-            scipy_matrix = sp.csr_matrix((other.data, other.cols, other.indptr), shape=other.dense_shape)
+            scipy_matrix = other.get_std_array()
             return self.scipy_coo(self) ** scipy_matrix
         elif isinstance(other, CSCMatrix):
-            scipy_matrix = sp.csc_matrix((other.data, other.rows, other.indptr), shape=other.dense_shape)
+            scipy_matrix = other.get_std_array()
             return self.scipy_coo(self) ** scipy_matrix
 
         else: # isinstance(other, (np.ndarray, sp.csr.csr_matrix, sp.csc.csc_matrix, sp.coo.coo_matrix))
@@ -422,15 +482,28 @@ class Matrix(object):
         """
         Returns a scalar, a numpy array (vector), or a Vector object that results from the given matrix multiplication.
         """
-        if not(isinstance(other, (Vector, np.ndarray, Matrix, DenseMatrix, COOMatrix, CSRMatrix, CSCMatrix, sp.coo.coo_matrix, sp.csr.csr_matrix, sp.csc.csc_matrix))):
-            raise TypeError('Arguments should be objects of Vector, np.ndarray, Matrix, DenseMatrix, COOMatrix, CSRMatrix, CSCMatrix, sp.coo.coo_matrix,sp.csr.csr_matrix, or sp.csc.csc_matrix  classes')
+        if not(isinstance(other, (Vector, MultiVector, np.ndarray, Matrix, DenseMatrix, COOMatrix, CSRMatrix, CSCMatrix, sp.coo.coo_matrix, sp.csr.csr_matrix, sp.csc.csc_matrix))):
+            raise TypeError('Arguments should be objects of Vector, MultiVector, np.ndarray, Matrix, DenseMatrix, COOMatrix, CSRMatrix, CSCMatrix, sp.coo.coo_matrix,sp.csr.csr_matrix, or sp.csc.csc_matrix  classes')
         
+        # Product with all the vectors of a MultiVector in a single sparse-times-dense-matrix call (returns a MultiVector object)
+        if isinstance(other, MultiVector):
+            if len(other) != self.dense_shape[1]:
+                raise TypeError('Arguments should have compatible shapes')
+
+            # other.data.T is C-contiguous for an 'F'-ordered MultiVector, so no copy is needed
+            new_data = (self.operator() @ other.data.T).T
+
+            product = MultiVector(self.matrix_components_dict.vector_components_dict1, other.num_vectors, order=other.order)
+            product.allocate(data=np.asarray(new_data, order=other.order), setup_views=other.setup_views_)
+
+            return product
+
         # Vector inner product
         if isinstance(other, Vector):
             if len(other) != self.dense_shape[1]:
                 raise TypeError('Arguments should have compatible shapes')
             else:
-                inner_product = self.scipy_coo(self) @ other.data
+                inner_product = self.operator() @ other.data
                 
             return inner_product
 
@@ -444,14 +517,14 @@ class Matrix(object):
                 if len(other) != self.dense_shape[1]:
                     raise TypeError('Arguments should have compatible shapes')
                 else:
-                    inner_product = self.scipy_coo(self) @ other
+                    inner_product = self.operator() @ other
 
             # numpy matrix inner product
             else:                             # len(other.shape) = 2
                 if other.shape[0] != self.dense_shape[1] :
                     raise TypeError('Arguments should have compatible shapes')
                 else:
-                    inner_product = self.scipy_coo(self) @ other
+                    inner_product = self.operator() @ other
 
             return inner_product
 
@@ -460,7 +533,7 @@ class Matrix(object):
             if self.dense_shape[1] != other.shape[0] :
                 raise TypeError('Arguments should have compatible shapes')
             else:
-                inner_product = self.scipy_coo(self) @ other
+                inner_product = self.operator() @ other
 
             return inner_product
 
@@ -472,16 +545,16 @@ class Matrix(object):
                 # inner_product = Vector(other.native.matrix_components_dict.vector_components_dict2)
       
                 if isinstance(other, DenseMatrix):
-                    new_data = self.scipy_coo(self) @ other.data
+                    new_data = self.operator() @ other.data
                 elif isinstance(other, COOMatrix):
-                    scipy_matrix = sp.coo_matrix((other.data, (other.rows, other.cols)), shape=other.dense_shape)
-                    new_data = self.scipy_coo(self) @ scipy_matrix
+                    scipy_matrix = other.operator()
+                    new_data = self.operator() @ scipy_matrix
                 elif isinstance(other, CSRMatrix):
-                    scipy_matrix = sp.csr_matrix((data, other.cols, other.indptr), shape=other.dense_shape)
-                    new_data = self.scipy_coo(self) @ scipy_matrix
+                    scipy_matrix = other.operator()
+                    new_data = self.operator() @ scipy_matrix
                 else:
-                    scipy_matrix = sp.csc_matrix((other.data, other.rows, other.indptr), shape=other.dense_shape)
-                    new_data = self.scipy_coo(self) @ scipy_matrix
+                    scipy_matrix = other.operator()
+                    new_data = self.operator() @ scipy_matrix
 
         # inner_product.allocate(data=new_data, setup_views=other.native.matrix_components_dict.vector_components_dict2.setup_views_)
         return new_data
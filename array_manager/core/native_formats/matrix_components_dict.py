@@ -2,6 +2,10 @@
 import numpy as np
 from typing import Dict, Tuple
 from array_manager.core.native_formats.vector import Vector
+from array_manager.core.native_formats.vector_components_dict import VectorComponentsDict
+from array_manager.core.native_formats.components_index import MatrixComponentsIndex
+from array_manager.core.native_formats.layout import Layout
+from array_manager.core.native_formats.sparsity_pattern import SparsityPattern
 
 
 
@@ -26,10 +30,31 @@ class MatrixComponentsDict(dict):
         Size of the vector that contains all the subvectors
     dense_size : int
         Size of the vector that contains all the subvectors
+    dtype : np.dtype
+        dtype of the values of the matrix (by default, the common dtype of the two vectors)
+    index : MatrixComponentsIndex
+        Array-backed index of the offsets and the row/column ranges of all the submatrices (rebuilt after a submatrix is added)
+    frozen : bool
+        True once freeze() has been called; submatrices cannot be added to a frozen dictionary
+    vector_layouts : tuple
+        Layouts of the row and column vectors when the dictionary was frozen (None before); subvectors can still be added to the vectors afterwards
+    sparsity_pattern : SparsityPattern
+        Global rows and cols of all the nonzeros, assembled on first access (which freezes the dictionary) and shared by all the matrices built from this dictionary
+    values_components_dict : VectorComponentsDict
+        Layout of the nonzeros of the matrix (one subvector per submatrix), shared by the vals of all the matrices built from this dictionary
     """
-    def __init__(self, vector_components_dict1, vector_components_dict2):
+    def __init__(self, vector_components_dict1, vector_components_dict2, dtype=None):
         """
         Initialize a dictionary object with a default value for the vector_size attribute. 
+
+        Parameters
+        ----------
+        vector_components_dict1 : VectorComponentsDict
+            Layout of the rows of the matrix
+        vector_components_dict2 : VectorComponentsDict
+            Layout of the columns of the matrix
+        dtype : np.dtype
+            dtype of the values of the matrix, e.g., float32 or complex128
         """
         # Note: In the case of partials, 1 represents output and 2 represents input respectively.
         self.vector_components_dict1 = vector_components_dict1
@@ -37,9 +62,31 @@ class MatrixComponentsDict(dict):
         self.num_nonzeros = 0
         self.dense_shape = (self.vector_components_dict1.vector_size, self.vector_components_dict2.vector_size)
         self.dense_size = np.prod(self.dense_shape)
+        if dtype is None:
+            dtype = np.result_type(getattr(vector_components_dict1, 'dtype', float), getattr(vector_components_dict2, 'dtype', float))
+        self.dtype = np.dtype(dtype)
+        self._index = None
+        self._layout = None
+        self._sparsity_pattern = None
+        self._values_components_dict = None
+        self._transpose = None
+        self.frozen = False
+        self.vector_layouts = None
         super().__init__()
 
 
+    def __reduce__(self):
+        # Same as VectorComponentsDict: the submatrices are restored without going through the checks in __setitem__()
+        state = self.__dict__.copy()
+        state['_index'] = None
+        state['_transpose'] = None
+        return (self.__class__.__new__, (self.__class__,), (state, list(self.items())))
+
+    def __setstate__(self, state):
+        state, items = state
+        self.__dict__.update(state)
+        dict.update(self, items)
+
     def __setitem__(self, key : Tuple, component_dict: Dict):
         """
         Add/replace a dictionary corresponding to a submatrix in the current list of submatrix dictionaries.
@@ -58,6 +105,9 @@ class MatrixComponentsDict(dict):
         name1 = key[0]
         name2 = key[1]
 
+        if self.frozen:
+            raise TypeError('Submatrix {} cannot be added to a frozen MatrixComponentsDict'.format(key))
+
         if key in self:
             raise KeyError('A submatrix called {} has already been added'.format(key))
 
@@ -111,7 +161,6 @@ class MatrixComponentsDict(dict):
             allowed_shapes = allowed_shapes + (shape2,)
         if size2 == 1:
             allowed_shapes = allowed_shapes + (shape1,)
-        allowed_dtypes = (int, float)
 
         def check_shape(given_shape):
             if given_shape not in allowed_shapes:
@@ -122,8 +171,10 @@ class MatrixComponentsDict(dict):
                 raise ValueError('Shapes of {}, {} and {}, {} '.format(name1, shape1, name2, shape2))
 
         def check_dtype_vals(given_array):
-            if given_array.dtype not in allowed_dtypes:
-                raise TypeError('Given vals are not of type "int" or "float"')
+            if given_array.dtype.kind not in 'iufc':
+                raise TypeError('Given vals are not of a numeric type ("int", "float" or "complex")')
+            if not np.can_cast(given_array.dtype, self.dtype, casting='same_kind'):
+                raise TypeError('Given vals of type "{}" cannot be stored in a matrix of type "{}"'.format(given_array.dtype, self.dtype))
 
         def check_int_array(given_array, name):
             if given_array.dtype not in (int, np.int32, np.int64):
@@ -194,13 +245,88 @@ class MatrixComponentsDict(dict):
         self.num_nonzeros += num_nonzeros     
         component_dict['end_index'] = self.num_nonzeros # - 1
 
+        self._index = None
         super().__setitem__((name1, name2), component_dict)
 
-
-
-
-
-
-    
-    
-
+    def freeze(self):
+        """
+        Freeze the dictionary (no more submatrices can be added) and return its interned Layout.
+        The fingerprint covers the layouts of both vectors, the order and offsets of the submatrices and their sparsity structures, so matrices with the same Layout object have the same nonzero structure.
+        """
+        if self._layout is None:
+            # The vectors are not frozen, only their current layouts are recorded
+            self.vector_layouts = (self.vector_components_dict1.snapshot(), self.vector_components_dict2.snapshot())
+            parts = ['matrix', self.vector_layouts[0].fingerprint, self.vector_layouts[1].fingerprint]
+
+            # The sparsity arrays of each kind are concatenated and hashed at once, together with their lengths (-1 where there is no array)
+            keys = []
+            offsets = []
+            sparsity_arrays = dict(rows=[], cols=[], ind_ptr=[])
+            sparsity_sizes = dict(rows=[], cols=[], ind_ptr=[])
+            for key, component_dict in self.items():
+                keys.append(key)
+                offsets.append((component_dict['start_index'], component_dict['end_index'], component_dict['vals_shape']))
+                for name in ('rows', 'cols', 'ind_ptr'):
+                    sparsity_array = component_dict[name]
+                    if isinstance(sparsity_array, np.ndarray):
+                        sparsity_arrays[name].append(sparsity_array.ravel())
+                        sparsity_sizes[name].append(sparsity_array.size)
+                    else:
+                        sparsity_sizes[name].append(-1)
+
+            parts.extend([keys, offsets])
+            for name in ('rows', 'cols', 'ind_ptr'):
+                parts.append(np.array(sparsity_sizes[name], dtype=int))
+                parts.append(np.concatenate(sparsity_arrays[name]) if sparsity_arrays[name] else None)
+
+            self._layout = Layout.intern(Layout.hash_parts(*parts), 'matrix', self.dense_shape)
+
+        self.frozen = True
+        return self._layout
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = MatrixComponentsIndex.from_matrix_components_dict(self)
+        return self._index
+
+    @property
+    def sparsity_pattern(self):
+        if self._sparsity_pattern is None:
+            self._sparsity_pattern = SparsityPattern.from_matrix_components_dict(self)
+        return self._sparsity_pattern
+
+    @property
+    def values_components_dict(self):
+        if self._values_components_dict is None:
+            index = self.index
+            self._values_components_dict = VectorComponentsDict.from_components(
+                ((key, dict(shape=shape)) for key, shape in zip(index.keys, index.shapes)),
+                dtype=self.dtype,
+            )
+        return self._values_components_dict
+
+    def transpose(self):
+        """
+        Return the (frozen, cached) dictionary of the transpose, with one COO submatrix (name2, name1) per submatrix (name1, name2) of self.
+        The nonzeros of the transpose are in the same order as the nonzeros of self, so the values of a matrix are also the values of its transpose, and its sparsity pattern and layout are the transposes of the ones of self.
+        """
+        if self._transpose is None:
+            pattern = self.sparsity_pattern
+            index = self.index
+
+            transpose = MatrixComponentsDict(self.vector_components_dict2, self.vector_components_dict1, dtype=self.dtype)
+            for (name1, name2), start, end, row_start, col_start in zip(
+                index.keys, index.start_indices.tolist(), index.end_indices.tolist(), index.row_start_indices.tolist(), index.col_start_indices.tolist()
+            ):
+                transpose[name2, name1] = dict(rows=pattern.cols[start:end] - col_start, cols=pattern.rows[start:end] - row_start)
+
+            # The pattern and the layout are derived from the ones of self instead of being assembled and hashed again
+            transpose._layout = self._layout.transpose()
+            transpose._sparsity_pattern = pattern.transpose()
+            transpose.vector_layouts = self.vector_layouts[::-1]
+            transpose.frozen = True
+            transpose._transpose = self
+            self._transpose = transpose
+
+        return self._transpose
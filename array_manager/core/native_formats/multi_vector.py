@@ -0,0 +1,131 @@
+"""Define the MultiVector class"""
+import numpy as np
+from array_manager.core.native_formats.vector import Vector
+from array_manager.utils import component_reductions
+
+
+class MultiVector(object):
+    """
+    Collection of vectors sharing one VectorComponentsDict, stored in a single 2-D array of shape (num_vectors, vector_size).
+    This can be used for multiple right-hand sides, finite-difference perturbations or ensemble runs.
+    The value corresponding to the key as the name of a subvector represents the view of that subvector for all the vectors, with shape (num_vectors, *shape).
+
+    Attributes
+    ----------
+    data : np.ndarray
+        2-D array of shape (num_vectors, vector_size) that stores all the vectors
+    num_vectors : int
+        Number of vectors
+    order : str
+        Memory layout of data, 'C' (each vector is contiguous) or 'F' (each entry across all the vectors is contiguous)
+    """
+
+    def __init__(self, vector_components_dict, num_vectors, order='C'):
+        """
+        Initialize the MultiVector object.
+
+        Parameters
+        ----------
+        vector_components_dict : VectorComponentsDict
+            Layout shared by all the vectors
+        num_vectors : int
+            Number of vectors
+        order : str
+            Memory layout of the 2-D array, 'C' or 'F'
+        """
+        if order not in ('C', 'F'):
+            raise ValueError('order should be either "C" or "F", {} was given'.format(order))
+
+        self.vector_components_dict = vector_components_dict
+        self.num_vectors = num_vectors
+        self.order = order
+
+    def allocate(self, data=None, setup_views=False):
+        # If data is given, no copy is made, only pointers are stored
+        shape = (self.num_vectors, self.vector_components_dict.vector_size)
+
+        if data is not None:
+            if data.shape != shape:
+                raise ValueError('Shape of the given data {} does not match the shape {} of the MultiVector'.format(data.shape, shape))
+            self.data = data
+
+        else:
+            # Every vector starts from the initial values given in the layout
+            self.data = np.empty(shape, dtype=self.vector_components_dict.dtype, order=self.order)
+            self.data[:] = self.vector_components_dict.vals
+
+        self.setup_views_ = setup_views
+        if setup_views:
+            self.dict_ = self.setup_views(self.vector_components_dict)
+
+        else:
+            self.dict_ = None
+
+    def setup_views(self, vector_components_dict):
+        """
+        Setup views of shape (num_vectors, *shape) for the subvectors.
+        """
+        index = vector_components_dict.index
+        data = self.data
+        num_vectors = self.num_vectors
+
+        dict_ = {
+            key: data[:, ind1:ind2].reshape((num_vectors,) + tuple(shape))
+            for key, ind1, ind2, shape in zip(index.keys, index.start_indices.tolist(), index.end_indices.tolist(), index.shapes)
+        }
+
+        return dict_
+
+    def __getitem__(self, key):
+        return self.dict_[key]
+
+    def __setitem__(self, key, value):
+        self.dict_[key][:] = value
+
+    # len() returns the size of each vector, consistent with Vector
+    def __len__(self):
+        return self.vector_components_dict.vector_size
+
+    def get_vector(self, i, setup_views=False):
+        """
+        Return the i-th vector as a Vector object whose data is a view into self.data.
+        """
+        vector = Vector(self.vector_components_dict)
+        vector.allocate(data=self.data[i], setup_views=setup_views)
+        return vector
+
+    def set_vector(self, i, vector):
+        """
+        Copy the given Vector (or 1-D array) into the i-th vector.
+        """
+        self.data[i] = vector.data if isinstance(vector, Vector) else vector
+
+    def _component_result(self, values, as_dict):
+        if as_dict:
+            return component_reductions.to_dict(values, self.vector_components_dict.index)
+        return values
+
+    def component_sums(self, as_dict=True):
+        """
+        Return the sum of each subvector for all the vectors; each value is an array of size num_vectors (or the array has shape (num_vectors, number of subvectors) if as_dict is False).
+        """
+        return self._component_result(component_reductions.component_sums(self.data, self.vector_components_dict.index), as_dict)
+
+    def component_norms(self, ord=2, as_dict=True):
+        """
+        Return the norm (ord = 1, 2 or np.inf) of each subvector for all the vectors.
+        """
+        return self._component_result(component_reductions.component_norms(self.data, self.vector_components_dict.index, ord=ord), as_dict)
+
+    def component_max_abs(self, as_dict=True):
+        """
+        Return the maximum absolute value of each subvector for all the vectors.
+        """
+        return self._component_result(component_reductions.component_max_abs(self.data, self.vector_components_dict.index), as_dict)
+
+    def component_dots(self, other, as_dict=True):
+        """
+        Return the dot product of each subvector with the same subvector of other (a MultiVector, a Vector or an array broadcastable to self.data).
+        """
+        other_data = other if isinstance(other, np.ndarray) else other.data
+        return self._component_result(component_reductions.component_dots(self.data, other_data, self.vector_components_dict.index), as_dict)
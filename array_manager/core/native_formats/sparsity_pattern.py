@@ -0,0 +1,278 @@
+"""Define the SparsityPattern class"""
+import numpy as np
+import scipy.sparse as sp
+from array_manager.core.native_formats.layout import Layout
+from array_manager.utils.index_dtype import get_index_dtype
+
+
+def _ranges(starts, sizes, dtype=int):
+    """
+    Return the concatenation of range(start, start + size) for all the given starts and sizes.
+    """
+    total = int(np.sum(sizes))
+    offsets = np.cumsum(sizes) - sizes
+    return np.repeat((np.asarray(starts) - offsets).astype(dtype, copy=False), sizes) + np.arange(total, dtype=dtype)
+
+
+def _compressed_indices(ind_ptrs, num_slots, slot_starts, dtype=int):
+    """
+    Return the global row (CSR) or column (CSC) index of every nonzero of several compressed components.
+    """
+    # Nonzeros per row (CSR) or column (CSC) of every component; the differences across component boundaries are dropped
+    all_ind_ptrs = np.concatenate([np.ravel(ind_ptr) for ind_ptr in ind_ptrs])
+    counts = np.diff(all_ind_ptrs)
+    boundaries = np.cumsum(num_slots + 1)[:-1] - 1
+    counts = np.delete(counts, boundaries)
+
+    return np.repeat(_ranges(slot_starts, num_slots, dtype), counts)
+
+
+def _assemble_global_indices(matrix_components_dict, index_dtype=int):
+    """
+    Return the global rows and cols (of dtype index_dtype) of all the nonzeros of a MatrixComponentsDict.
+    Components are grouped by kind (dense, COO, CSR and CSC) and the indices of each group are generated with a few NumPy calls, whatever the number of components.
+    """
+    index = matrix_components_dict.index
+    num_nonzeros = int(np.sum(index.sizes))
+
+    kinds = dict(dense=[], coo=[], csr=[], csc=[])
+    for i, component_dict in enumerate(matrix_components_dict.values()):
+        if isinstance(component_dict['ind_ptr'], np.ndarray):
+            kind = 'csc' if isinstance(component_dict['rows'], np.ndarray) else 'csr'
+        elif component_dict['rows'] is None and component_dict['cols'] is None:
+            kind = 'dense'
+        else:
+            kind = 'coo'
+        kinds[kind].append(i)
+
+    # All the components are of one kind: the nonzeros of the group are the nonzeros of the matrix
+    single_kind = max(len(positions) for positions in kinds.values()) == len(index.sizes)
+
+    component_dicts = list(matrix_components_dict.values())
+    rows = np.empty(num_nonzeros, dtype=index_dtype)
+    cols = np.empty(num_nonzeros, dtype=index_dtype)
+
+    for kind, positions in kinds.items():
+        if not positions:
+            continue
+
+        positions = np.array(positions, dtype=int)
+        # Indices are computed in index_dtype so that no int64 temporaries of the size of the group are created when int32 is enough
+        sizes = index.sizes[positions]
+        row_starts = index.row_start_indices[positions].astype(index_dtype)
+        col_starts = index.col_start_indices[positions].astype(index_dtype)
+        num_rows = index.row_end_indices[positions] - row_starts
+        num_cols = index.col_end_indices[positions] - col_starts
+
+        if kind == 'dense':
+            # Row-major position of each entry within its component
+            local_indices = _ranges(np.zeros_like(sizes), sizes, index_dtype)
+            repeated_num_cols = np.repeat(num_cols.astype(index_dtype), sizes)
+            group_rows = np.repeat(row_starts, sizes) + local_indices // np.maximum(repeated_num_cols, 1)
+            group_cols = np.repeat(col_starts, sizes) + local_indices % np.maximum(repeated_num_cols, 1)
+
+        elif kind == 'coo':
+            group_rows = np.repeat(row_starts, sizes) + np.concatenate([np.ravel(component_dicts[i]['rows']) for i in positions], dtype=index_dtype)
+            group_cols = np.repeat(col_starts, sizes) + np.concatenate([np.ravel(component_dicts[i]['cols']) for i in positions], dtype=index_dtype)
+
+        elif kind == 'csr':
+            group_rows = _compressed_indices([component_dicts[i]['ind_ptr'] for i in positions], num_rows, row_starts, index_dtype)
+            group_cols = np.repeat(col_starts, sizes) + np.concatenate([np.ravel(component_dicts[i]['cols']) for i in positions], dtype=index_dtype)
+
+        else:
+            group_rows = np.repeat(row_starts, sizes) + np.concatenate([np.ravel(component_dicts[i]['rows']) for i in positions], dtype=index_dtype)
+            group_cols = _compressed_indices([component_dicts[i]['ind_ptr'] for i in positions], num_cols, col_starts, index_dtype)
+
+        if single_kind:
+            return group_rows.astype(index_dtype, copy=False), group_cols.astype(index_dtype, copy=False)
+
+        nonzero_positions = _ranges(index.start_indices[positions], sizes, index_dtype)
+        rows[nonzero_positions] = group_rows
+        cols[nonzero_positions] = group_cols
+
+    return rows, cols
+
+
+class SparsityPattern(object):
+    """
+    Immutable global row and column indices of the nonzeros of a matrix, shared by reference by all the Matrix objects built from the same frozen MatrixComponentsDict.
+    The pattern of a MatrixComponentsDict is assembled once and cached on it (see MatrixComponentsDict.sparsity_pattern), so Matrix(matrix_components_dict) does not recompute any index when the dictionary already has a pattern (e.g., for the results of arithmetic operations).
+    Patterns are compared through their interned Layout, so checking that two matrices have the same structure is an identity comparison.
+
+    Attributes
+    ----------
+    layout : Layout
+        Interned layout of the frozen MatrixComponentsDict the pattern was built from
+    dense_shape : tuple
+        Shape of the matrix
+    num_nonzeros : int
+        Number of nonzeros of the matrix
+    index_dtype : np.dtype
+        dtype of rows and cols (int32 when the shape and the number of nonzeros allow it, int64 otherwise)
+    rows : np.ndarray
+        Read-only row indices of the nonzeros
+    cols : np.ndarray
+        Read-only column indices of the nonzeros
+    combined_patterns : dict
+        Unions and intersections of this pattern with other patterns (see CombinedPattern.get())
+    """
+
+    # Average number of consecutive nonzeros per run above which an operator is a CSR matrix with its own data instead of a COO matrix (see build_operator())
+    slice_run_size = 64
+    # Largest number of runs for which the data of such an operator is refreshed with slice copies instead of a gather
+    max_slice_copies = 16
+
+    def __init__(self, layout, rows, cols, dense_shape, index_dtype=None):
+        """
+        Initialize the pattern; rows and cols are owned by the pattern afterwards and are made read-only.
+
+        Parameters
+        ----------
+        layout : Layout
+            Interned layout identifying the pattern
+        rows : np.ndarray
+            Row indices of the nonzeros
+        cols : np.ndarray
+            Column indices of the nonzeros
+        dense_shape : tuple
+            Shape of the matrix
+        index_dtype : np.dtype
+            dtype of the indices (chosen with get_index_dtype() if not given)
+        """
+        self.layout = layout
+        self.dense_shape = tuple(int(n) for n in dense_shape)
+        self.num_nonzeros = int(np.size(rows))
+        if index_dtype is None:
+            index_dtype = get_index_dtype(self.dense_shape, self.num_nonzeros)
+        self.index_dtype = np.dtype(index_dtype)
+
+        self.rows = self._frozen_array(rows)
+        self.cols = self._frozen_array(cols)
+        self._transpose = None
+        self._operator_structure = None
+        self.combined_patterns = {}
+
+    def _frozen_array(self, array):
+        array = np.asarray(array, dtype=self.index_dtype).reshape(-1)
+        array.setflags(write=False)
+        return array
+
+    @classmethod
+    def from_matrix_components_dict(cls, matrix_components_dict):
+        """
+        Freeze the dictionary and assemble the pattern of its submatrices.
+        """
+        layout = matrix_components_dict.freeze()
+        index_dtype = get_index_dtype(matrix_components_dict.dense_shape, matrix_components_dict.num_nonzeros)
+        rows, cols = _assemble_global_indices(matrix_components_dict, index_dtype)
+
+        return cls(layout, rows, cols, matrix_components_dict.dense_shape, index_dtype)
+
+    def _frozen_ind_ptr(self, major_indices, num_major):
+        ind_ptr = np.zeros(num_major + 1, dtype=self.index_dtype)
+        np.cumsum(np.bincount(major_indices, minlength=num_major), out=ind_ptr[1:])
+        ind_ptr.setflags(write=False)
+        return ind_ptr
+
+    def _get_operator_structure(self):
+        # (format, indices, ind_ptr, refresh) of the scipy operators, built once; refresh is None when the operator uses the values as they are, and runs or a permutation otherwise
+        if self._operator_structure is None:
+            num_rows, num_cols = self.dense_shape
+            for format, major_indices, minor_indices, num_major, num_minor in (
+                ('csr', self.rows, self.cols, num_rows, num_cols),
+                ('csc', self.cols, self.rows, num_cols, num_rows),
+            ):
+                # Canonical order (strictly increasing (major, minor) pairs): the values are the data of the compressed matrix
+                keys = major_indices.astype(np.int64) * max(num_minor, 1) + minor_indices
+                if np.all(keys[1:] > keys[:-1]):
+                    self._operator_structure = (format, minor_indices, self._frozen_ind_ptr(major_indices, num_major), None)
+                    return self._operator_structure
+
+            permutation = np.lexsort((self.cols, self.rows))
+            run_starts = np.concatenate(([0], np.flatnonzero(np.diff(permutation) != 1) + 1))
+
+            if len(run_starts) * self.slice_run_size <= self.num_nonzeros:
+                # Long runs of consecutive values (e.g., submatrices that are not in row order): the CSR data is refreshed with one slice copy per run, or with a gather that reads memory mostly sequentially
+                if len(run_starts) <= self.max_slice_copies:
+                    run_sizes = np.diff(np.append(run_starts, self.num_nonzeros))
+                    refresh = list(zip(run_starts.tolist(), permutation[run_starts].tolist(), run_sizes.tolist()))
+                else:
+                    refresh = permutation
+                    refresh.setflags(write=False)
+
+                indices = self._frozen_array(self.cols[permutation])
+                self._operator_structure = ('csr', indices, self._frozen_ind_ptr(self.rows[permutation], num_rows), refresh)
+            else:
+                # Gathering scattered values would cost more than a COO product, so the COO operator uses the values as they are
+                self._operator_structure = ('coo', None, None, None)
+
+        return self._operator_structure
+
+    def operator_aliases_values(self):
+        """
+        Return True if the operators built by build_operator() use the values without any copy.
+        """
+        return self._get_operator_structure()[3] is None
+
+    def build_operator(self, data):
+        """
+        Return a scipy matrix with this pattern and the given values (data in the order of rows and cols), used for products.
+        If the nonzeros are in CSR (or CSC) order, the operator is a CSR (or CSC) matrix whose data is the given array itself.
+        If they are made of long runs of CSR-ordered nonzeros, it is a CSR matrix with its own data (see refresh_operator()).
+        Otherwise, it is a COO matrix whose data is the given array itself.
+        The index arrays are read-only and shared by all the operators with this pattern.
+        """
+        format, indices, ind_ptr, refresh = self._get_operator_structure()
+
+        if format == 'coo':
+            operator_data = data
+            operator = sp.coo_matrix((operator_data, (self.rows, self.cols)), shape=self.dense_shape)
+        else:
+            operator_data = data if refresh is None else np.empty_like(data)
+            scipy_class = sp.csr_matrix if format == 'csr' else sp.csc_matrix
+            operator = scipy_class((operator_data, indices, ind_ptr), shape=self.dense_shape)
+
+        # scipy wraps the data in a new view; keep the array itself so that aliasing can be checked with 'is'
+        operator.data = operator_data
+        self.refresh_operator(operator, data)
+
+        return operator
+
+    def refresh_operator(self, operator, data):
+        """
+        Copy the values into the data of an operator built by build_operator(), in place (nothing is done if the operator uses the values as they are).
+        """
+        refresh = self._get_operator_structure()[3]
+        if isinstance(refresh, np.ndarray):
+            np.take(data, refresh, out=operator.data, mode='clip')
+        elif refresh is not None:
+            operator_data = operator.data
+            for ind1, src_ind1, size in refresh:
+                operator_data[ind1:ind1 + size] = data[src_ind1:src_ind1 + size]
+
+    def transpose(self):
+        """
+        Return the pattern of the transpose (which shares the index arrays of self).
+        """
+        if self._transpose is None:
+            self._transpose = SparsityPattern(self.layout.transpose(), self.cols, self.rows, self.dense_shape[::-1], self.index_dtype)
+            self._transpose._transpose = self
+
+        return self._transpose
+
+    def __hash__(self):
+        return hash(self.layout)
+
+    def __eq__(self, other):
+        # Layouts are interned, so this is an identity comparison
+        return self is other or (isinstance(other, SparsityPattern) and other.layout is self.layout)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __reduce__(self):
+        # The arrays are made read-only again and the layout is interned again when unpickled
+        return (SparsityPattern, (self.layout, self.rows, self.cols, self.dense_shape, self.index_dtype))
+
+    def __repr__(self):
+        return 'SparsityPattern(shape={}, num_nonzeros={}, index_dtype={})'.format(self.dense_shape, self.num_nonzeros, self.index_dtype)
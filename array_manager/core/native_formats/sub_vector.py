@@ -0,0 +1,73 @@
+"""Define the SubVector class"""
+import numpy as np
+
+
+class SubVector(object):
+    """
+    Gather/scatter view of a set of non-contiguous subvectors of a Vector, returned by Vector.subvector().
+    Reading it gathers the selected entries of the Vector into one flat array with a single fancy-index operation; assigning to it scatters the values back into the Vector.
+
+    Attributes
+    ----------
+    vector : Vector
+        Vector whose subvectors are selected
+    indices : np.ndarray
+        Positions of the selected entries in the data of the Vector (cached on the layout of the Vector)
+    """
+
+    def __init__(self, vector, indices):
+        """
+        Initialize the view.
+
+        Parameters
+        ----------
+        vector : Vector
+            Vector whose subvectors are selected
+        indices : np.ndarray
+            Positions of the selected entries in the data of the Vector
+        """
+        self.vector = vector
+        self.indices = indices
+
+    @property
+    def shape(self):
+        return self.indices.shape
+
+    @property
+    def dtype(self):
+        return self.vector.data.dtype
+
+    def __len__(self):
+        return len(self.indices)
+
+    def get(self):
+        """
+        Return a copy of the selected entries as a flat array.
+        """
+        return self.vector.data[self.indices]
+
+    def set(self, values):
+        """
+        Write the given flat array (or scalar) into the selected entries.
+        """
+        self.vector.data[self.indices] = values
+
+    def add(self, values):
+        """
+        Add the given flat array (or scalar) to the selected entries.
+        """
+        # Indices are unique, so the buffered += is exact
+        self.vector.data[self.indices] += values
+
+    def __array__(self, dtype=None, copy=None):
+        return np.asarray(self.get(), dtype=dtype)
+
+    def __getitem__(self, key):
+        return self.vector.data[self.indices[key]]
+
+    def __setitem__(self, key, value):
+        self.vector.data[self.indices[key]] = value
+
+    def __iadd__(self, other):
+        self.add(other)
+        return self
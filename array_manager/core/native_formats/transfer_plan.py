@@ -0,0 +1,142 @@
+"""Define the TransferPlan class"""
+import numpy as np
+
+
+class TransferPlan(object):
+    """
+    Precomputed copy of the subvectors shared by two layouts, e.g., from the design vector to the input vector of a model.
+    The two layouts are matched by subvector name once, when the plan is built, and consecutive matches are merged into contiguous runs.
+    A transfer then copies all the matched subvectors with a few slice assignments (if the runs are long) or a single gather/scatter (otherwise) instead of one Python-level assignment per subvector.
+
+    Attributes
+    ----------
+    src_vector_components_dict : VectorComponentsDict
+        Layout of the source vectors
+    dst_vector_components_dict : VectorComponentsDict
+        Layout of the destination vectors
+    names : tuple
+        Names of the transferred subvectors, in the order of the destination layout
+    runs : list
+        (src_start_index, src_end_index, dst_start_index, dst_end_index) of each contiguous run
+    src_indices : np.ndarray
+        Gather indices into the source data (None if the runs are copied as slices)
+    dst_indices : np.ndarray
+        Scatter indices into the destination data (None if the runs are copied as slices)
+    size : int
+        Number of entries copied by a transfer
+    """
+
+    # Runs are copied as slices when they hold at least this many entries on average
+    slice_run_size = 256
+
+    def __init__(self, src_vector_components_dict, dst_vector_components_dict, names=None):
+        """
+        Match the two layouts and compile the matches.
+
+        Parameters
+        ----------
+        src_vector_components_dict : VectorComponentsDict
+            Layout of the source vectors
+        dst_vector_components_dict : VectorComponentsDict
+            Layout of the destination vectors
+        names : iterable
+            Names of the subvectors to be transferred (all the subvectors present in both layouts by default)
+        """
+        self.src_vector_components_dict = src_vector_components_dict
+        self.dst_vector_components_dict = dst_vector_components_dict
+
+        src_index = src_vector_components_dict.index
+        dst_index = dst_vector_components_dict.index
+
+        if names is None:
+            names = [key for key in dst_index.keys if key in src_index.positions]
+
+        else:
+            for name in names:
+                if name not in src_index.positions or name not in dst_index.positions:
+                    raise KeyError('Subvector {} is not in both layouts of the transfer'.format(name))
+
+            # Sorting by destination offset lets consecutive subvectors merge into runs
+            names = sorted(set(names), key=dst_index.positions.__getitem__)
+
+        self.names = tuple(names)
+
+        src_positions = np.array([src_index.positions[name] for name in self.names], dtype=int)
+        dst_positions = np.array([dst_index.positions[name] for name in self.names], dtype=int)
+
+        src_sizes = src_index.sizes[src_positions]
+        dst_sizes = dst_index.sizes[dst_positions]
+        for name, src_size, dst_size in zip(self.names, src_sizes.tolist(), dst_sizes.tolist()):
+            if src_size != dst_size:
+                raise ValueError('Subvector {} has size {} in the source layout and size {} in the destination layout'.format(name, src_size, dst_size))
+
+        src_starts = src_index.start_indices[src_positions]
+        dst_starts = dst_index.start_indices[dst_positions]
+        src_ends = src_starts + src_sizes
+        dst_ends = dst_starts + dst_sizes
+
+        # A new run starts wherever a subvector does not directly follow the previous one in both layouts
+        run_starts = np.ones(len(self.names), dtype=bool)
+        run_starts[1:] = (src_starts[1:] != src_ends[:-1]) | (dst_starts[1:] != dst_ends[:-1])
+        first = np.flatnonzero(run_starts)
+        last = np.append(first[1:], len(self.names))[:len(first)] - 1
+
+        self.runs = list(zip(src_starts[first].tolist(), src_ends[last].tolist(), dst_starts[first].tolist(), dst_ends[last].tolist()))
+        self.size = int(np.sum(src_sizes))
+
+        if len(self.runs) <= 1 or self.size >= self.slice_run_size * len(self.runs):
+            self.src_indices = None
+            self.dst_indices = None
+
+        else:
+            run_sizes = src_ends[last] - src_starts[first]
+            run_offsets = np.cumsum(run_sizes) - run_sizes
+            local_indices = np.arange(self.size) - np.repeat(run_offsets, run_sizes)
+            self.src_indices = np.repeat(src_starts[first], run_sizes) + local_indices
+            self.dst_indices = np.repeat(dst_starts[first], run_sizes) + local_indices
+
+    def transfer(self, src, dst, accumulate=False):
+        """
+        Copy (or add) the matched subvectors of src into dst.
+
+        Parameters
+        ----------
+        src : Vector, MultiVector or np.ndarray
+            Source vector(s) with the source layout; for arrays, the last axis is the vector axis
+        dst : Vector, MultiVector or np.ndarray
+            Destination vector(s) with the destination layout
+        accumulate : bool
+            If True, the subvectors of src are added to those of dst instead of overwriting them
+
+        Returns
+        -------
+        dst
+        """
+        src_data = src if isinstance(src, np.ndarray) else src.data
+        dst_data = dst if isinstance(dst, np.ndarray) else dst.data
+
+        if src_data.shape[-1] != self.src_vector_components_dict.vector_size:
+            raise ValueError('Size {} of the source does not match the source layout of size {}'.format(src_data.shape[-1], self.src_vector_components_dict.vector_size))
+        if dst_data.shape[-1] != self.dst_vector_components_dict.vector_size:
+            raise ValueError('Size {} of the destination does not match the destination layout of size {}'.format(dst_data.shape[-1], self.dst_vector_components_dict.vector_size))
+
+        if self.src_indices is None:
+            for src_ind1, src_ind2, dst_ind1, dst_ind2 in self.runs:
+                if accumulate:
+                    dst_data[..., dst_ind1:dst_ind2] += src_data[..., src_ind1:src_ind2]
+                else:
+                    dst_data[..., dst_ind1:dst_ind2] = src_data[..., src_ind1:src_ind2]
+
+        # Destination indices are unique, so the buffered += is exact
+        elif accumulate:
+            dst_data[..., self.dst_indices] += src_data[..., self.src_indices]
+        else:
+            dst_data[..., self.dst_indices] = src_data[..., self.src_indices]
+
+        return dst
+
+    def reverse(self):
+        """
+        Return the plan that transfers the same subvectors in the opposite direction.
+        """
+        return TransferPlan(self.dst_vector_components_dict, self.src_vector_components_dict, names=self.names)
@@ -1,6 +1,42 @@
 """Define the Vector class"""
 import numpy as np
 import scipy.sparse as sp
+from scipy.linalg.blas import get_blas_funcs
+import os
+from array_manager.utils.vector_file import open_memmap, resolve_mode, write_vector, read_vector, read_header, check_header
+from array_manager.core.native_formats.vector_components_dict import VectorComponentsDict
+from array_manager.utils.shared_memory import SharedArray
+from array_manager.core.native_formats.sub_vector import SubVector
+from array_manager.utils import component_reductions
+from array_manager.utils.validation import validation_enabled, SCALAR_TYPES
+from array_manager.core.standard_formats.dense_matrix import DenseMatrix
+from array_manager.core.standard_formats.coo_matrix import COOMatrix
+from array_manager.core.standard_formats.csr_matrix import CSRMatrix
+from array_manager.core.standard_formats.csc_matrix import CSCMatrix
+from array_manager.utils import parallel
+from array_manager.core.native_formats.expression import Expression, lazy_enabled
+
+
+def _axpy(alpha, x, y):
+    """
+    Compute y += alpha * x in place without allocating a temporary array whenever BLAS can be used.
+    """
+    if x.dtype == y.dtype and y.ndim == 1 and y.flags.c_contiguous and np.result_type(alpha, y) == y.dtype:
+        axpy = get_blas_funcs('axpy', (x, y))
+        if axpy.dtype == y.dtype:
+            result = axpy(x, y, a=alpha)
+            if result is y:
+                return
+
+    y += alpha * x
+
+
+def _result_dtype(ufunc, *operands):
+    """
+    Return the dtype of ufunc(*operands) without evaluating it; operands may be arrays or Python, NumPy and bool scalars.
+    """
+    dtype = np.result_type(*operands)
+    return ufunc.resolve_dtypes((dtype,) * len(operands) + (None,))[-1]
 
 
 class Vector(object):
@@ -12,8 +48,18 @@ class Vector(object):
     ----------
     data : np.ndarray
         Concatenated vector from the dictionary of subvectors 
+    lazy_views : bool
+        If True, the view of a subvector is only created the first time it is accessed and is then cached
+    pool : BufferPool
+        Pool from which the data of this Vector and of the results of its arithmetic operators are drawn
+    parent : Vector
+        Vector whose data contains the data of this Vector, if this Vector was created by split() or append()
+    parent_start_index : int
+        Starting index of the data of this Vector in the data of its parent
+    shared_array : SharedArray
+        Shared-memory segment holding the data, if the Vector was allocated with shared_memory=True
     """
-    def __init__(self, vector_components_dict):
+    def __init__(self, vector_components_dict, lazy_views=False, pool=None):
         """
         Initialize the Vector object by allocating a zero vector of desired size.
 
@@ -21,15 +67,89 @@ class Vector(object):
         ----------
         vector_components_dict : VectorComponentsDict
             List of variables that are concatenated
+        lazy_views : bool
+            Create the views of the subvectors on first access instead of in allocate()
+        pool : BufferPool
+            Draw data buffers from this pool instead of allocating them with NumPy
         """
         self.vector_components_dict = vector_components_dict
+        self.lazy_views = lazy_views
+        self.pool = pool
+        self._pooled = False
+
+        self.parent = None
+        self.parent_start_index = 0
+        self._append_cache = {}
+        self.shared_array = None
+
+    @property
+    def data(self):
+        return self._data
+
+    @data.setter
+    def data(self, data):
+        self._data = data
+
+        # Cached views point to the previous array
+        if self.lazy_views:
+            self.dict_ = {}
+        self._append_cache = {}
+
+    @property
+    def dtype(self):
+        return self.vector_components_dict.dtype
+
+    @property
+    def layout(self):
+        # Freezes the VectorComponentsDict the first time it is used
+        return self.vector_components_dict.freeze()
+
+    def allocate(self, data=None, setup_views=False, filename=None, mode=None, shared_memory=False):
+        """
+        Allocate (or bind) the data of the Vector and setup the views of the subvectors.
 
-    def allocate(self, data=None, setup_views=False):
-        # If data is given, no copy is made, only pointers are stored
+        Parameters
+        ----------
+        data : np.ndarray
+            If given, no copy is made, only pointers are stored
+        setup_views : bool
+            Setup views for the subvectors
+        filename : str
+            If given, the data is a np.memmap of this file (written with a header describing the layout), so the OS pages it in on demand
+        mode : str
+            Mode used to open the file: 'w+' creates it with the initial values of the layout, 'r+', 'r' or 'c' reopen an existing file without copying its data.
+            By default, an existing file is reopened with 'r+' and a new file is created.
+        shared_memory : bool
+            If True, the data is stored in a multiprocessing.shared_memory segment.
+            Pickling the Vector (e.g., to send it to a worker process) then only sends the layout and the name of the segment, and the unpickled Vector has zero-copy views into the same data.
+            The segment is removed when the Vector is released or garbage-collected in the process that allocated it.
+        """
         # User is never supposed to access data, can use allocate if needed
+        if self._pooled or self.shared_array is not None:
+            self.release()
+
         if data is not None:
             self.data = data
 
+        elif filename is not None:
+            mode = resolve_mode(filename, mode)
+            data, header = open_memmap(filename, self.vector_components_dict, mode=mode)
+            self.data = data
+
+            # A new file starts from the initial values given in the layout
+            if mode == 'w+':
+                data[:] = self.vector_components_dict.vals
+
+        elif shared_memory:
+            self.shared_array = SharedArray(self.vector_components_dict.vector_size, dtype=self.vector_components_dict.dtype)
+            self.data = data = self.shared_array.array
+            data[:] = self.vector_components_dict.vals
+
+        elif self.pool is not None:
+            self.data = data = self.pool.acquire(self.vector_components_dict, dtype=self.vector_components_dict.dtype)
+            data[:] = self.vector_components_dict.vals
+            self._pooled = True
+
         else:
             # New addition
             self.data = data = self.vector_components_dict.vals
@@ -39,12 +159,188 @@ class Vector(object):
             #     self.vector_components_dict.vector_size)
 
         self.setup_views_ = setup_views
-        if setup_views:
+        self._setup_dict()
+
+    def _setup_dict(self):
+        if self.lazy_views:
+            # Views are created and cached in __getitem__()
+            self.dict_ = {}
+
+        elif self.setup_views_:
             self.dict_ = self.setup_views(self.vector_components_dict)
 
         else:
             self.dict_ = None
 
+    def release(self):
+        """
+        Return the data of this Vector to its pool and detach it; the Vector has to be allocated again before it is used.
+        Data that was passed in by the user is never returned to the pool.
+        For a Vector allocated in shared memory, the segment is closed (and removed, in the process that allocated it); views of its subvectors must not be used afterwards.
+        """
+        if self._pooled:
+            self.pool.release_data(self.vector_components_dict, self._data)
+            self._pooled = False
+
+        self.parent = None
+        self.parent_start_index = 0
+        self._append_cache = {}
+
+        self._data = None
+        self.dict_ = None
+
+        if self.shared_array is not None:
+            self.shared_array.close()
+            self.shared_array = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+
+        # The data and the views live in the shared-memory segment, only its name is pickled (with the SharedArray)
+        if self.shared_array is not None:
+            state['_data'] = None
+            state['dict_'] = None
+            state['_append_cache'] = {}
+
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+        # Unpickling the SharedArray attached to the segment; rebuild the views into it
+        if self.shared_array is not None:
+            self._data = self.shared_array.array
+            self._setup_dict()
+
+    @classmethod
+    def from_arrays(cls, arrays, names, dtype=None, setup_views=True, lazy_views=False):
+        """
+        Build a Vector from a list of arrays in one pass: the offsets of all the subvectors are computed at once and each array is copied once into the preallocated data.
+
+        Parameters
+        ----------
+        arrays : list
+            Values of the subvectors; the shape of each array becomes the shape of its subvector
+        names : list
+            Names of the subvectors, in the same order as arrays
+        dtype : np.dtype
+            dtype of the vector (the common dtype of the arrays by default)
+        setup_views : bool
+            Setup views for the subvectors
+        lazy_views : bool
+            Create the views of the subvectors on first access
+
+        Returns
+        -------
+        Vector
+        """
+        arrays = [np.asarray(array) for array in arrays]
+        names = list(names)
+        if len(names) != len(arrays):
+            raise ValueError('{} names were given for {} arrays'.format(len(names), len(arrays)))
+
+        if dtype is None:
+            dtype = np.result_type(*arrays) if len(arrays) > 0 else float
+
+        vector_components_dict = VectorComponentsDict.from_components(
+            ((name, dict(shape=array.shape)) for name, array in zip(names, arrays)),
+            dtype=dtype,
+        )
+
+        data = np.empty(vector_components_dict.vector_size, dtype=vector_components_dict.dtype)
+        index = vector_components_dict.index
+        for array, ind1, ind2 in zip(arrays, index.start_indices.tolist(), index.end_indices.tolist()):
+            data[ind1:ind2] = array.reshape(-1)
+
+        vector = cls(vector_components_dict, lazy_views=lazy_views)
+        vector.allocate(data=data, setup_views=setup_views)
+        return vector
+
+    def save(self, filename):
+        """
+        Save the layout (names, shapes and offsets of the subvectors) and the data of this Vector to a binary file, see utils/vector_file.py.
+        Initial values and bounds given in the layout are not saved.
+
+        Parameters
+        ----------
+        filename : str
+            Path of the file (overwritten if it exists)
+        """
+        data = self.data
+
+        # A Vector mapped onto this very file only needs to be flushed
+        if isinstance(data, np.memmap) and data.filename == os.path.abspath(filename):
+            data.flush()
+            return
+
+        write_vector(filename, self.vector_components_dict, data)
+
+    @classmethod
+    def load(cls, filename, vector_components_dict=None, mmap=True, mode='r+', setup_views=True, lazy_views=False):
+        """
+        Load a Vector saved with save() (or allocated with a filename).
+        With mmap=True, the data is memory-mapped and the views of the subvectors point into the mapping, so nothing is read until it is accessed.
+
+        Parameters
+        ----------
+        filename : str
+            Path of the file
+        vector_components_dict : VectorComponentsDict
+            Layout of the Vector; it is checked against the layout stored in the file. By default, the layout is rebuilt from the file.
+        mmap : bool
+            Memory-map the data instead of reading it into memory
+        mode : str
+            Mode of the memory map: 'r+' (changes are written to the file), 'r' (read-only) or 'c' (copy-on-write)
+        setup_views : bool
+            Setup views for the subvectors
+        lazy_views : bool
+            Create the views of the subvectors on first access
+
+        Returns
+        -------
+        Vector
+        """
+        header, data_offset = read_header(filename)
+
+        if vector_components_dict is None:
+            vector_components_dict = VectorComponentsDict.from_components(
+                ((component['name'], dict(shape=component['shape'])) for component in header['components']),
+                dtype=header['dtype'],
+            )
+
+        check_header(header, vector_components_dict, filename)
+
+        vector = cls(vector_components_dict, lazy_views=lazy_views)
+        if mmap:
+            if mode not in ('r+', 'r', 'c'):
+                raise ValueError('mode should be one of "r+", "r" or "c", {} was given'.format(mode))
+            vector.allocate(filename=filename, mode=mode, setup_views=setup_views)
+        else:
+            vector.allocate(data=read_vector(filename, header, data_offset), setup_views=setup_views)
+
+        return vector
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+    def _new_vector(self, dtype=None):
+        """
+        Return a new Vector with the same layout as self allocated with an uninitialized buffer (drawn from the pool, if any).
+        """
+        new_vector = Vector(self.vector_components_dict, lazy_views=self.lazy_views, pool=self.pool)
+
+        if self.pool is not None:
+            new_data = self.pool.acquire(self.vector_components_dict, dtype=dtype)
+        else:
+            new_data = np.empty(len(self), dtype=dtype)
+
+        new_vector.allocate(data=new_data, setup_views=self.setup_views_)
+        new_vector._pooled = self.pool is not None
+        return new_vector
+
     def setup_views(self, vector_components_dict):
         """
         Setup views for variables that are concatenated into a single vector.
@@ -54,46 +350,206 @@ class Vector(object):
         variables_set : VariablesSet
             List of variables that are concatenated
         """
-        dict_ = {}
-        for key, component_dict in vector_components_dict.items():
-            shape = component_dict['shape']
-            ind1 = component_dict['start_index']
-            ind2 = component_dict['end_index']
-            dict_[key] = self.data[ind1:ind2].reshape(shape)
+        index = vector_components_dict.index
+        data = self.data
+
+        dict_ = {
+            key: data[ind1:ind2].reshape(shape)
+            for key, ind1, ind2, shape in zip(index.keys, index.start_indices.tolist(), index.end_indices.tolist(), index.shapes)
+        }
 
         return dict_
 
     def __getitem__(self, key):
+        if self.lazy_views:
+            view = self.dict_.get(key)
+            if view is None:
+                index = self.vector_components_dict.index
+                i = index.positions[key]
+                view = self.dict_[key] = self.data[index.start_indices[i]:index.end_indices[i]].reshape(index.shapes[i])
+
+            return view
+
         return self.dict_[key]
 
     def __setitem__(self, key, value):
-        self.dict_[key][:] = value
+        self[key][:] = value
 
     def get_data(self, ):
         return self.data
 
     def set_data(self, data):
-        self.data[:] = data
+        # Expressions are evaluated in one fused pass directly into the data of this Vector
+        if isinstance(data, Expression):
+            data.evaluate(out=self)
+        else:
+            self.data[:] = data
+
+    def lazy(self):
+        """
+        Return an Expression wrapping this Vector; arithmetic on it builds an expression tree that is evaluated in one fused pass by evaluate() or set_data().
+        """
+        return Expression.from_operation(np.positive, self)
 
     def __len__(self):
         return self.vector_components_dict.vector_size
 
-    def append(self, other):
-        new_vector_components_dict = {
-            **self.vector_components_dict,
-            **other.vector_components_dict
-        }
-        new_vector = Vector(new_vector_components_dict)
-        new_vector.allocate(data=np.append(self.data, other.data),
-                            setup_views=self.setup_views_)
+    def subvector(self, names):
+        """
+        Return the selected subvectors as one flat array.
+        If the selected subvectors are contiguous in the data, the result is a NumPy view (no copy); otherwise it is a SubVector that gathers/scatters the entries with one fancy-index operation.
+        Either result can be read with sub[:] and written with sub[:] = values.
 
-        return new_vector
+        Parameters
+        ----------
+        names : str or iterable
+            Names or glob patterns of the subvectors, e.g., 'wing_*' (see VectorComponentsDict.select())
+        """
+        selection = self.vector_components_dict.get_selection(names)
+
+        if isinstance(selection, slice):
+            return self.data[selection]
+
+        return SubVector(self, selection)
+
+    def split(self):
+        """
+        Return the sub-vectors of a Vector whose layout was built with VectorComponentsDict.concatenate().
+        The data of each sub-vector is a view into the data of self, so appending consecutive sub-vectors does not copy anything.
+        """
+        sub_vectors = []
+        for vector_components_dict, ind1, ind2 in self.vector_components_dict.sub_vector_components_dicts:
+            sub_vector = Vector(vector_components_dict, lazy_views=self.lazy_views)
+            sub_vector.allocate(data=self.data[ind1:ind2], setup_views=self.setup_views_)
+            sub_vector.parent = self
+            sub_vector.parent_start_index = ind1
+            sub_vectors.append(sub_vector)
+
+        return sub_vectors
+
+    def append(self, other, out=None):
+        """
+        Return a Vector containing the data of self followed by the data of other.
+        If self and other are adjacent views into the same parent Vector (see split()), the result is a view into the parent and nothing is copied or allocated after the first call.
+        Otherwise, both are copied into out (a Vector with the union layout), or into a new Vector if out is None.
+        """
+        parent = self.parent
+        if parent is not None and other.parent is parent and self.parent_start_index + len(self) == other.parent_start_index:
+            ind1 = self.parent_start_index
+            ind2 = other.parent_start_index + len(other)
+
+            if ind1 == 0 and ind2 == len(parent):
+                return parent
+
+            new_vector = parent._append_cache.get((ind1, ind2))
+            if new_vector is None:
+                new_vector_components_dict = self.vector_components_dict.get_concatenation(other.vector_components_dict)
+                new_vector = Vector(new_vector_components_dict, lazy_views=self.lazy_views)
+                new_vector.allocate(data=parent.data[ind1:ind2], setup_views=self.setup_views_)
+                new_vector.parent = parent
+                new_vector.parent_start_index = ind1
+                parent._append_cache[ind1, ind2] = new_vector
+
+            return new_vector
+
+        if out is None:
+            new_vector_components_dict = self.vector_components_dict.get_concatenation(other.vector_components_dict)
+            out = Vector(new_vector_components_dict, lazy_views=self.lazy_views)
+            out.allocate(data=np.concatenate((self.data, other.data)), setup_views=self.setup_views_)
+
+        else:
+            if len(out) != len(self) + len(other):
+                raise TypeError('out should be a Vector object whose size is the sum of the sizes of the appended vectors')
+            out.data[:len(self)] = self.data
+            out.data[len(self):] = other.data
+
+        return out
+
+    def project(self):
+        """
+        Project the Vector onto the bounds (lower, upper and equals) given in its layout, in place.
+        """
+        self.vector_components_dict.bounds.project(self.data, out=self.data)
+        return self
+
+    def active_sets(self, tol=0.):
+        """
+        Return the indices of the entries within tol of their lower bound, within tol of their upper bound, and of the inactive entries.
+        Equality-constrained entries are active at both bounds; see VectorComponentsDict.bounds for the cached classification of the entries.
+        """
+        return self.vector_components_dict.bounds.active_sets(self.data, tol=tol)
+
+    def max_step(self, direction):
+        """
+        Return the largest step alpha >= 0 such that self + alpha * direction stays within the bounds (np.inf if the step is unbounded).
+
+        Parameters
+        ----------
+        direction : Vector or np.ndarray
+            Search direction with the same layout as self
+        """
+        self.check_type_and_size(direction)
+        direction_data = direction.data if isinstance(direction, Vector) else direction
+        return self.vector_components_dict.bounds.max_step(self.data, direction_data)
+
+    def _component_result(self, values, as_dict):
+        if as_dict:
+            return component_reductions.to_dict(values, self.vector_components_dict.index)
+        return values
+
+    def component_sums(self, as_dict=True):
+        """
+        Return the sum of each subvector, computed in one pass over the data.
+        For the vals of a Matrix, the subvectors are the submatrices.
+
+        Parameters
+        ----------
+        as_dict : bool
+            If True, return a dictionary keyed by subvector name; otherwise return an array ordered like the layout
+        """
+        return self._component_result(component_reductions.component_sums(self.data, self.vector_components_dict.index), as_dict)
+
+    def component_norms(self, ord=2, as_dict=True):
+        """
+        Return the norm (ord = 1, 2 or np.inf) of each subvector, computed in one pass over the data.
+        """
+        return self._component_result(component_reductions.component_norms(self.data, self.vector_components_dict.index, ord=ord), as_dict)
+
+    def component_max_abs(self, as_dict=True):
+        """
+        Return the maximum absolute value of each subvector, computed in one pass over the data.
+        """
+        return self._component_result(component_reductions.component_max_abs(self.data, self.vector_components_dict.index), as_dict)
+
+    def component_dots(self, other, as_dict=True):
+        """
+        Return the dot product of each subvector with the same subvector of other (a Vector or np.ndarray with the same layout).
+        """
+        other_data = other.data if isinstance(other, Vector) else other
+        if other_data.shape != self.data.shape:
+            raise TypeError('Arguments should be objects of the Vector/numpy.ndarray class with equal sizes')
+
+        return self._component_result(component_reductions.component_dots(self.data, other_data, self.vector_components_dict.index), as_dict)
 
     def check_type_and_size(self, other):
-        if isinstance(other, (int, float)):
+        # Can be turned off with array_manager.utils.validation.skip_validation()
+        if not validation_enabled():
+            return
+
+        if isinstance(other, SCALAR_TYPES):
             pass
         elif isinstance(other, Vector):
-            if len(other) != len(self):
+            vector_components_dict = self.vector_components_dict
+            other_vector_components_dict = other.vector_components_dict
+            if other_vector_components_dict is vector_components_dict:
+                pass
+            # Layouts are interned, so this is an identity comparison; they are only compared if both dictionaries are already frozen, since an operation should not freeze the dictionaries of its operands
+            elif vector_components_dict.frozen and other_vector_components_dict.frozen:
+                if other.layout is not self.layout:
+                    raise TypeError(
+                        'Arguments should be objects of the Vector class with the same layout'
+                    )
+            elif len(other) != len(self):
                 raise TypeError(
                     'Arguments should be objects of the Vector/numpy.ndarray class with equal sizes'
                 )
@@ -107,53 +563,36 @@ class Vector(object):
                 )
         else:
             raise TypeError(
-                'Argument should be either an object of the Vector/numpy.ndarray class or a scalar (int or float)'
+                'Argument should be either an object of the Vector/numpy.ndarray class or a scalar (int, float or complex)'
             )
 
-    def __iadd__(self, other):
-        self.check_type_and_size(other)
-        if isinstance(other, Vector):
-            self.data += other.data
-        else:  # isinstance(other, (int, float, np.ndarray))
-            self.data += other
+    def _inplace_operation(self, ufunc, other):
+        """
+        Apply ufunc to self and other in place; large vectors are processed in chunks on a thread pool if the parallel mode is on (see array_manager.utils.parallel).
+        """
+        if isinstance(other, Expression):
+            Expression.from_operation(ufunc, self, other).evaluate(out=self)
+            return self
 
+        self.check_type_and_size(other)
+        other_data = other.data if isinstance(other, Vector) else other
+        parallel.apply_ufunc(ufunc, self.data, other_data, out=self.data)
         return self
 
-    def __isub__(self, other):
-        self.check_type_and_size(other)
-        if isinstance(other, Vector):
-            self.data -= other.data
-        else:
-            self.data -= other
+    def __iadd__(self, other):
+        return self._inplace_operation(np.add, other)
 
-        return self
+    def __isub__(self, other):
+        return self._inplace_operation(np.subtract, other)
 
     def __imul__(self, other):
-        self.check_type_and_size(other)
-        if isinstance(other, Vector):
-            self.data *= other.data
-        else:
-            self.data *= other
-
-        return self
+        return self._inplace_operation(np.multiply, other)
 
     def __itruediv__(self, other):
-        self.check_type_and_size(other)
-        if isinstance(other, Vector):
-            self.data /= other.data
-        else:
-            self.data /= other
-
-        return self
+        return self._inplace_operation(np.true_divide, other)
 
     def __ipow__(self, other):
-        self.check_type_and_size(other)
-        if isinstance(other, Vector):
-            self.data **= other.data
-        else:
-            self.data **= other
-
-        return self
+        return self._inplace_operation(np.power, other)
 
     # In-place matrix multiplication is not (yet) supported. Use 'a = a @ b' instead of 'a @= b'.
 
@@ -164,70 +603,207 @@ class Vector(object):
     #     else:
     #         raise TypeError('Argument should be either an object of the Vector class or a scalar (int or float)')
 
-    def __add__(self, other):
+    def _binary_operation(self, ufunc, other, reflected=False):
+        """
+        Apply ufunc to self and other (or to other and self, if reflected) and return the result as a new Vector, drawing its data from the pool if there is one.
+        In lazy_mode(), or if other is an Expression, an Expression is returned instead.
+        """
+        if lazy_enabled() or isinstance(other, Expression):
+            return Expression.from_operation(ufunc, other, self) if reflected else Expression.from_operation(ufunc, self, other)
+
         self.check_type_and_size(other)
-        new_vector = Vector(self.vector_components_dict)
+        other_data = other.data if isinstance(other, Vector) else other
+        operands = (other_data, self.data) if reflected else (self.data, other_data)
 
-        if isinstance(other, Vector):
-            new_data = self.data + other.data
-        else:  # isinstance(other, (int, float, np.ndarray))
-            new_data = self.data + other
+        if self.pool is None:
+            new_vector = Vector(self.vector_components_dict, lazy_views=self.lazy_views)
+            new_vector.allocate(data=ufunc(*operands), setup_views=self.setup_views_)
+
+        else:
+            new_vector = self._new_vector(dtype=_result_dtype(ufunc, *operands))
+            ufunc(*operands, out=new_vector.data)
 
-        new_vector.allocate(data=new_data, setup_views=self.setup_views_)
         return new_vector
 
+    def __add__(self, other):
+        return self._binary_operation(np.add, other)
+
     def __sub__(self, other):
-        self.check_type_and_size(other)
-        new_vector = Vector(self.vector_components_dict)
+        return self._binary_operation(np.subtract, other)
 
-        if isinstance(other, Vector):
-            new_data = self.data - other.data
-        else:
-            new_data = self.data - other
+    def __mul__(self, other):
+        return self._binary_operation(np.multiply, other)
 
-        new_vector.allocate(data=new_data, setup_views=self.setup_views_)
-        return new_vector
+    def __truediv__(self, other):
+        return self._binary_operation(np.true_divide, other)
 
-    def __mul__(self, other):
+    def __pow__(self, other):
+        return self._binary_operation(np.power, other)
+
+    def __radd__(self, other):
+        return self._binary_operation(np.add, other, reflected=True)
+
+    def __rsub__(self, other):
+        return self._binary_operation(np.subtract, other, reflected=True)
+
+    def __rmul__(self, other):
+        return self._binary_operation(np.multiply, other, reflected=True)
+
+    def __rtruediv__(self, other):
+        return self._binary_operation(np.true_divide, other, reflected=True)
+
+    def __rpow__(self, other):
+        return self._binary_operation(np.power, other, reflected=True)
+
+    def __neg__(self):
+        if lazy_enabled():
+            return Expression.from_operation(np.negative, self)
+        return self._binary_operation(np.multiply, -1)
+
+    # NumPy scalars and arrays on the left of an operator defer to the reflected operators above
+    __array_ufunc__ = None
+
+    def norm(self):
+        """
+        Return the 2-norm of the Vector, computed in chunks on a thread pool for large vectors if the parallel mode is on.
+        """
+        data = self.data
+        if np.iscomplexobj(data):
+            return np.sqrt(parallel.dot(data.real, data.real) + parallel.dot(data.imag, data.imag))
+
+        return np.sqrt(parallel.dot(data, data))
+
+    def _get_out(self, out, dtype):
+        """
+        Return the Vector the result of an out= method is written into; a new Vector with the given dtype is created if out is None.
+        """
+        if out is None:
+            out = self._new_vector(dtype=dtype)
+
+        elif not isinstance(out, Vector):
+            raise TypeError('out should be an object of the Vector class')
+
+        elif len(out) != len(self):
+            raise TypeError('out should be a Vector object with the same size as self')
+
+        return out
+
+    def add(self, other, out=None):
+        """
+        Compute self + other and write the result into out without creating temporary arrays.
+
+        Parameters
+        ----------
+        other : Vector, np.ndarray, int or float
+            Second operand
+        out : Vector
+            Vector with the same layout as self into which the result is written. A new Vector is returned if out is None.
+        """
         self.check_type_and_size(other)
-        new_vector = Vector(self.vector_components_dict)
+        other_data = other.data if isinstance(other, Vector) else other
+        out = self._get_out(out, _result_dtype(np.add, self.data, other_data))
+        parallel.apply_ufunc(np.add, self.data, other_data, out=out.data)
+        return out
 
-        if isinstance(other, Vector):
-            new_data = self.data * other.data
-        else:
-            new_data = self.data * other
+    def sub(self, other, out=None):
+        """
+        Compute self - other and write the result into out without creating temporary arrays.
+        """
+        self.check_type_and_size(other)
+        other_data = other.data if isinstance(other, Vector) else other
+        out = self._get_out(out, _result_dtype(np.subtract, self.data, other_data))
+        parallel.apply_ufunc(np.subtract, self.data, other_data, out=out.data)
+        return out
 
-        new_vector.allocate(data=new_data, setup_views=self.setup_views_)
-        return new_vector
+    def mul(self, other, out=None):
+        """
+        Compute self * other (elementwise) and write the result into out without creating temporary arrays.
+        """
+        self.check_type_and_size(other)
+        other_data = other.data if isinstance(other, Vector) else other
+        out = self._get_out(out, _result_dtype(np.multiply, self.data, other_data))
+        parallel.apply_ufunc(np.multiply, self.data, other_data, out=out.data)
+        return out
 
-    def __truediv__(self, other):
+    def div(self, other, out=None):
+        """
+        Compute self / other (elementwise) and write the result into out without creating temporary arrays.
+        """
         self.check_type_and_size(other)
-        new_vector = Vector(self.vector_components_dict)
+        other_data = other.data if isinstance(other, Vector) else other
+        out = self._get_out(out, _result_dtype(np.true_divide, self.data, other_data))
+        parallel.apply_ufunc(np.true_divide, self.data, other_data, out=out.data)
+        return out
 
-        if isinstance(other, Vector):
-            new_data = self.data / other.data
+    def axpy(self, alpha, x, out=None):
+        """
+        Compute alpha * x + self and write the result into out without creating temporary arrays.
+        Use out=self for the in-place update self += alpha * x, e.g., x.axpy(step_size, direction, out=x).
+
+        Parameters
+        ----------
+        alpha : int, float or complex
+            Scalar multiplying x
+        x : Vector
+            Vector with the same layout as self
+        out : Vector
+            Vector with the same layout as self into which the result is written. A new Vector is returned if out is None.
+        """
+        if not isinstance(x, Vector):
+            raise TypeError('x should be an object of the Vector class')
+        self.check_type_and_size(x)
+        out = self._get_out(out, np.result_type(alpha, x.data, self.data))
+
+        if out is self:
+            parallel.axpy(_axpy, alpha, x.data, out.data)
+        elif out is x:
+            parallel.apply_ufunc(np.multiply, out.data, alpha, out=out.data)
+            parallel.apply_ufunc(np.add, out.data, self.data, out=out.data)
         else:
-            new_data = self.data / other
+            parallel.apply_ufunc(np.multiply, x.data, alpha, out=out.data)
+            parallel.apply_ufunc(np.add, out.data, self.data, out=out.data)
 
-        new_vector.allocate(data=new_data, setup_views=self.setup_views_)
-        return new_vector
+        return out
 
-    def __pow__(self, other):
-        self.check_type_and_size(other)
-        new_vector = Vector(self.vector_components_dict)
+    def axpby(self, alpha, x, beta, out=None):
+        """
+        Compute alpha * x + beta * self and write the result into out without creating temporary arrays.
 
-        if isinstance(other, Vector):
-            new_data = self.data**other.data
+        Parameters
+        ----------
+        alpha : int, float or complex
+            Scalar multiplying x
+        x : Vector
+            Vector with the same layout as self
+        beta : int, float or complex
+            Scalar multiplying self
+        out : Vector
+            Vector with the same layout as self into which the result is written. A new Vector is returned if out is None.
+        """
+        if not isinstance(x, Vector):
+            raise TypeError('x should be an object of the Vector class')
+        self.check_type_and_size(x)
+        out = self._get_out(out, np.result_type(alpha, x.data, beta, self.data))
+
+        if out is self:
+            parallel.apply_ufunc(np.multiply, out.data, beta, out=out.data)
+            parallel.axpy(_axpy, alpha, x.data, out.data)
+        elif out is x:
+            parallel.apply_ufunc(np.multiply, out.data, alpha, out=out.data)
+            parallel.axpy(_axpy, beta, self.data, out.data)
         else:
-            new_data = self.data**other
+            parallel.apply_ufunc(np.multiply, self.data, beta, out=out.data)
+            parallel.axpy(_axpy, alpha, x.data, out.data)
 
-        new_vector.allocate(data=new_data, setup_views=self.setup_views_)
-        return new_vector
+        return out
 
     def __matmul__(self, other):  # (Note: Vector object is the first argument)
         """
         Returns a scalar, a numpy array (vector), or a Vector object that results from the given matrix multiplication.
         """
+        # Imported here since matrix.py imports this module
+        from array_manager.core.native_formats.matrix import Matrix
+
         if not (isinstance(other,
                            (Vector, Matrix, np.ndarray, DenseMatrix, COOMatrix,
                             CSRMatrix, CSCMatrix, sp.coo.coo_matrix,
@@ -243,7 +819,7 @@ class Vector(object):
                     'Arguments should be objects of the Vector/numpy.ndarray class with equal sizes'
                 )
             else:
-                inner_product = self.data @ other.data
+                inner_product = parallel.dot(self.data, other.data)
 
             return inner_product
 
@@ -297,36 +873,11 @@ class Vector(object):
 
                 if isinstance(other, DenseMatrix):
                     new_data = self.data @ other.data
-                elif isinstance(other, Matrix):
-                    scipy_matrix = sp.coo_matrix(
-                        (other.vals.data, (other.rows, other.cols)),
-                        shape=other.dense_shape)
-                    new_data = self.data @ scipy_matrix
-                elif isinstance(other, COOMatrix):
-                    scipy_matrix = sp.coo_matrix(
-                        (other.data, (other.rows, other.cols)),
-                        shape=other.dense_shape)
-                    new_data = self.data @ scipy_matrix
-                elif isinstance(other, CSRMatrix):
-                    scipy_matrix = sp.csr_matrix(
-                        (other.data, other.cols, other.indptr),
-                        shape=other.dense_shape)
-                    new_data = self.data @ scipy_matrix
                 else:
-                    scipy_matrix = sp.csc_matrix(
-                        (other.data, other.rows, other.indptr),
-                        shape=other.dense_shape)
-                    new_data = self.data @ scipy_matrix
-
-        if isinstance(other, Matrix):
-            inner_product.allocate(data=new_data,
-                                   setup_views=other.matrix_components_dict.
-                                   vector_components_dict2.setup_views_)
-        else:
-            inner_product.allocate(
-                data=new_data,
-                setup_views=other.native.matrix_components_dict.
-                vector_components_dict2.setup_views_)
+                    # Cached scipy operators of Matrix, COOMatrix, CSRMatrix and CSCMatrix objects
+                    new_data = self.data @ other.operator()
+
+        inner_product.allocate(data=new_data, setup_views=self.setup_views_)
 
         return inner_product
 
@@ -0,0 +1,179 @@
+"""Define the VectorBuilder class"""
+import numpy as np
+from array_manager.core.native_formats.vector_components_dict import VectorComponentsDict
+from array_manager.core.native_formats.vector import Vector
+from array_manager.utils.vector_file import build_header, write_header, write_vector, ALIGNMENT
+
+
+class VectorBuilder(object):
+    """
+    Builds a Vector from a stream of (name, array) pairs whose shapes are not known up front.
+    In memory, the values are copied into chunks whose capacities double (so nothing is copied when the buffer grows) and build() copies the chunks into the final contiguous array once; if everything fits in the first chunk, no final copy is made.
+    With a filename, the values are appended to the file as they arrive and build() only writes the header in front of them, so the returned Vector is memory-mapped without any copy.
+
+    Attributes
+    ----------
+    dtype : np.dtype
+        dtype of the vector
+    size : int
+        Number of values added so far
+    names : list
+        Names of the subvectors added so far
+    shapes : list
+        Shapes of the subvectors added so far
+    filename : str
+        File the values are streamed into (None for an in-memory build)
+    """
+
+    def __init__(self, dtype=float, initial_capacity=1024, filename=None, header_capacity=1 << 20):
+        """
+        Initialize an empty builder.
+
+        Parameters
+        ----------
+        dtype : np.dtype
+            dtype of the vector
+        initial_capacity : int
+            Number of values the first in-memory chunk can hold
+        filename : str
+            If given, the values are streamed into this file (overwritten) in the format of Vector.save()
+        header_capacity : int
+            Number of bytes reserved at the start of the file for the header; if the layout turns out to need more, build() rewrites the file once
+        """
+        self.dtype = np.dtype(dtype)
+        self.size = 0
+        self.names = []
+        self.shapes = []
+        self._name_set = set()
+
+        self.filename = filename
+        if filename is None:
+            self._chunks = [np.empty(max(int(initial_capacity), 1), dtype=self.dtype)]
+            self._chunk_size = 0
+            self._file = None
+
+        else:
+            self._data_offset = -(-int(header_capacity) // ALIGNMENT) * ALIGNMENT
+            self._file = open(filename, 'wb')
+            self._file.seek(self._data_offset)
+
+    def add(self, name, array):
+        """
+        Append a subvector.
+
+        Parameters
+        ----------
+        name : str
+            Name of the subvector
+        array : array_like
+            Values of the subvector; its shape becomes the shape of the subvector
+        """
+        if name in self._name_set:
+            raise KeyError('A subvector called {} has already been added'.format(name))
+
+        array = np.asarray(array)
+        self._name_set.add(name)
+        self.names.append(name)
+        self.shapes.append(array.shape)
+
+        if self._file is not None:
+            np.ascontiguousarray(array, dtype=self.dtype).tofile(self._file)
+            self.size += array.size
+            return
+
+        flat = array.reshape(-1)
+        written = 0
+        while written < flat.size:
+            chunk = self._chunks[-1]
+            if self._chunk_size == chunk.size:
+                # Amortized doubling: the new chunk is as large as everything allocated so far
+                chunk = np.empty(max(self.size, flat.size - written), dtype=self.dtype)
+                self._chunks.append(chunk)
+                self._chunk_size = 0
+
+            num_values = min(chunk.size - self._chunk_size, flat.size - written)
+            chunk[self._chunk_size:self._chunk_size + num_values] = flat[written:written + num_values]
+            self._chunk_size += num_values
+            written += num_values
+
+        self.size += flat.size
+
+    def extend(self, pairs):
+        """
+        Append all the (name, array) pairs of an iterable.
+        """
+        for name, array in pairs:
+            self.add(name, array)
+
+        return self
+
+    async def extend_async(self, pairs):
+        """
+        Append all the (name, array) pairs of an asynchronous iterable.
+        """
+        async for name, array in pairs:
+            self.add(name, array)
+
+        return self
+
+    def build_vector_components_dict(self):
+        """
+        Return the layout of the subvectors added so far.
+        """
+        return VectorComponentsDict.from_components(
+            ((name, dict(shape=shape)) for name, shape in zip(self.names, self.shapes)),
+            dtype=self.dtype,
+        )
+
+    def build(self, setup_views=False, lazy_views=False):
+        """
+        Return the Vector containing all the subvectors added so far; the builder should not be used afterwards.
+
+        Parameters
+        ----------
+        setup_views : bool
+            Setup views for the subvectors
+        lazy_views : bool
+            Create the views of the subvectors on first access
+        """
+        vector_components_dict = self.build_vector_components_dict()
+        vector = Vector(vector_components_dict, lazy_views=lazy_views)
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+            header = build_header(vector_components_dict, self.dtype)
+            try:
+                write_header(self.filename, header, data_offset=self._data_offset)
+            except ValueError:
+                # The header did not fit in the reserved space; rewrite the file once
+                data = np.fromfile(self.filename, dtype=self.dtype, count=self.size, offset=self._data_offset)
+                write_vector(self.filename, vector_components_dict, data)
+
+            vector.allocate(filename=self.filename, mode='r+', setup_views=setup_views)
+            return vector
+
+        if len(self._chunks) == 1:
+            data = self._chunks[0][:self.size]
+        else:
+            data = np.concatenate(self._chunks[:-1] + [self._chunks[-1][:self._chunk_size]])
+
+        self._chunks = None
+        vector.allocate(data=data, setup_views=setup_views)
+        return vector
+
+    @classmethod
+    def from_iterable(cls, pairs, dtype=float, filename=None, setup_views=False, lazy_views=False):
+        """
+        Return the Vector built from an iterable of (name, array) pairs.
+        """
+        return cls(dtype=dtype, filename=filename).extend(pairs).build(setup_views=setup_views, lazy_views=lazy_views)
+
+    @classmethod
+    async def from_async_iterable(cls, pairs, dtype=float, filename=None, setup_views=False, lazy_views=False):
+        """
+        Return the Vector built from an asynchronous iterable of (name, array) pairs.
+        """
+        builder = await cls(dtype=dtype, filename=filename).extend_async(pairs)
+        return builder.build(setup_views=setup_views, lazy_views=lazy_views)
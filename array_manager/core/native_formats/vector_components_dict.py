@@ -1,6 +1,15 @@
 """Define the VectorComponentsDict class"""
 import numpy as np
+from math import prod
+from fnmatch import fnmatchcase
 from typing import Dict
+from array_manager.core.native_formats.components_index import ComponentsIndex
+from array_manager.core.native_formats.layout import Layout
+from array_manager.core.native_formats.bounds import Bounds
+
+
+def _shape_size(shape):
+    return prod(shape) if isinstance(shape, tuple) else int(np.prod(shape))
 
 
 class VectorComponentsDict(dict):
@@ -12,25 +21,246 @@ class VectorComponentsDict(dict):
     - start_index : starting index of the subvector in the concatenated contiguous vector containing all subvectors from the same class
     - end_index : ending index of the subvector in the concatenated contiguous vector containing all subvectors from the same class
 
+    The concatenated vals, upper and lower arrays are not built while subvectors are being added.
+    They are assembled with a single allocation each by finalize(), which is called automatically the first time any of them is accessed after a subvector was added.
+
     Attributes
     ----------
     vector_size : int
         Size of the vector that contains all the subvectors
+    dtype : np.dtype
+        dtype of the values of the vector (float64 by default, e.g., float32 to halve memory or complex128 for complex-step derivatives)
+    vals : np.ndarray
+        Concatenated initial values of all the subvectors
+    upper : np.ndarray
+        Concatenated upper bounds of all the subvectors that declare bounds
+    lower : np.ndarray
+        Concatenated lower bounds of all the subvectors that declare bounds
+    index : ComponentsIndex
+        Array-backed index of the offsets of all the subvectors (rebuilt after a subvector is added)
+    sub_vector_components_dicts : list
+        (VectorComponentsDict, start_index, end_index) of each layout that was concatenated into this one by concatenate()
+    bounds : Bounds
+        Full-size bounds and the classification of the entries into equality-constrained, inequality-constrained and free entries (rebuilt after a subvector is added)
+    frozen : bool
+        True once freeze() has been called; subvectors cannot be added to a frozen dictionary
     """
 
-    def __init__(self):
+    def __init__(self, dtype=float):
         """
-        Initialize a dictionary object with a default value for the vector_size attribute. 
+        Initialize a dictionary object with a default value for the vector_size attribute.
+
+        Parameters
+        ----------
+        dtype : np.dtype
+            dtype of the values of the vector
         """
         self.vector_size = 0
+        self.dtype = np.dtype(dtype)
+
+        # Concatenated arrays are assembled lazily in finalize()
+        self._vals = np.array([], dtype=self.dtype)
+        self._upper = np.array([])
+        self._lower = np.array([])
+        self._finalized = True
+        self._index = None
+
+        self.sub_vector_components_dicts = []
+        self._concatenations = {}
+        self._selections = {}
+        self._layout = None
+        self._bounds = None
+        self.frozen = False
 
-        # New addition
-        self.vals = np.array([])
-        self.upper = np.array([])
-        self.lower = np.array([])
-        
         super().__init__()
 
+    @classmethod
+    def from_components(cls, components, dtype=float):
+        """
+        Build a dictionary from all of its subvectors at once.
+        The offsets of all the subvectors are computed in a single pass instead of one __setitem__() call per subvector.
+
+        Parameters
+        ----------
+        components : dict or iterable
+            Subvector dictionaries keyed by subvector name, or an iterable of (name, subvector dictionary) pairs.
+        dtype : np.dtype
+            dtype of the values of the vector
+
+        Returns
+        -------
+        VectorComponentsDict
+            Dictionary containing all the given subvectors in the given order.
+        """
+        if isinstance(components, dict):
+            components = components.items()
+
+        keys = []
+        component_dicts = []
+        for key, component_dict in components:
+            keys.append(key)
+            component_dicts.append(component_dict)
+
+        if len(set(keys)) != len(keys):
+            raise KeyError('Subvector names given to from_components() should be unique')
+
+        # math.prod is much cheaper than np.prod on the (usually tuple) shapes of many small subvectors
+        sizes = np.array([_shape_size(component_dict['shape']) for component_dict in component_dicts], dtype=int)
+        end_indices = np.cumsum(sizes)
+        start_indices = end_indices - sizes
+
+        for component_dict, size, start_index, end_index in zip(component_dicts, sizes.tolist(), start_indices.tolist(), end_indices.tolist()):
+            component_dict['size'] = size
+            component_dict['start_index'] = start_index
+            component_dict['end_index'] = end_index
+
+        new_dict = cls(dtype=dtype)
+        dict.update(new_dict, zip(keys, component_dicts))
+        new_dict.vector_size = int(end_indices[-1]) if len(sizes) > 0 else 0
+        new_dict._finalized = False
+        new_dict._index = ComponentsIndex(keys, start_indices, end_indices, [component_dict['shape'] for component_dict in component_dicts])
+
+        return new_dict
+
+    @classmethod
+    def concatenate(cls, *vector_components_dicts):
+        """
+        Build the union layout of several layouts placed one after the other.
+        A Vector allocated with the union layout can be split into sub-vectors (see Vector.split()) that are views into its data, so appending these sub-vectors costs nothing.
+        The given layouts are not modified.
+
+        Parameters
+        ----------
+        vector_components_dicts : VectorComponentsDict
+            Layouts to be concatenated in the given order; their subvector names should be unique across all of them
+
+        Returns
+        -------
+        VectorComponentsDict
+            Union layout
+        """
+        dtype = np.result_type(*[vector_components_dict.dtype for vector_components_dict in vector_components_dicts])
+
+        # Copies of the component dictionaries so that the offsets of the given layouts are not overwritten
+        new_dict = cls.from_components(
+            ((key, dict(component_dict)) for vector_components_dict in vector_components_dicts for key, component_dict in vector_components_dict.items()),
+            dtype=dtype,
+        )
+
+        start_index = 0
+        for vector_components_dict in vector_components_dicts:
+            end_index = start_index + int(vector_components_dict.vector_size)
+            new_dict.sub_vector_components_dicts.append((vector_components_dict, start_index, end_index))
+            start_index = end_index
+
+        return new_dict
+
+    def get_concatenation(self, other):
+        """
+        Return the union layout of self followed by other, building it only the first time it is requested.
+        """
+        cached = self._concatenations.get(id(other))
+        if cached is None or cached[0] is not other:
+            cached = self._concatenations[id(other)] = (other, VectorComponentsDict.concatenate(self, other))
+
+        return cached[1]
+
+    def snapshot(self):
+        """
+        Return the interned Layout of the subvectors added so far without freezing the dictionary.
+        Dictionaries with the same names, shapes and order return the same Layout object; a new Layout is computed after a subvector is added.
+        """
+        if self._layout is None:
+            index = self.index
+            fingerprint = Layout.hash_parts('vector', int(self.vector_size), index.keys, index.shapes, index.start_indices)
+            self._layout = Layout.intern(fingerprint, 'vector', (self.vector_size,))
+
+        return self._layout
+
+    def freeze(self):
+        """
+        Freeze the dictionary (no more subvectors can be added) and return its interned Layout.
+        """
+        layout = self.snapshot()
+        self.frozen = True
+        return layout
+
+    def select(self, names):
+        """
+        Return the names of the subvectors matching the given names or glob patterns (e.g., 'wing_*').
+        The subvectors matched by each pattern are listed in the order in which they are stored, and each subvector is listed once.
+
+        Parameters
+        ----------
+        names : str or iterable
+            Name or glob pattern, or an iterable of names and glob patterns
+        """
+        if isinstance(names, str):
+            names = (names,)
+
+        keys = self.index.keys
+        selected = {}
+        for name in names:
+            if name in self:
+                matches = [name]
+            else:
+                matches = [key for key in keys if isinstance(key, str) and fnmatchcase(key, name)]
+                if not matches:
+                    raise KeyError('No subvector matches {}'.format(name))
+
+            for key in matches:
+                selected.setdefault(key, None)
+
+        return tuple(selected)
+
+    def get_selection(self, names):
+        """
+        Return the positions, in the concatenated vector, of the selected subvectors (see select()) as a slice if they are contiguous or as an index array otherwise.
+        The result is cached for each selection until a subvector is added.
+        """
+        # names may be an iterator, so it is consumed once and the tuple is used both as the cache key and for the selection
+        names = (names,) if isinstance(names, str) else tuple(names)
+        selection = self._selections.get(names)
+
+        if selection is None:
+            index = self.index
+            positions = np.array([index.positions[key] for key in self.select(names)], dtype=int)
+            start_indices = index.start_indices[positions]
+            end_indices = index.end_indices[positions]
+
+            if len(positions) == 0:
+                selection = slice(0, 0)
+
+            elif np.all(start_indices[1:] == end_indices[:-1]):
+                selection = slice(int(start_indices[0]), int(end_indices[-1]))
+
+            else:
+                sizes = end_indices - start_indices
+                offsets = np.cumsum(sizes) - sizes
+                selection = np.repeat(start_indices - offsets, sizes) + np.arange(np.sum(sizes))
+                selection.setflags(write=False)
+
+            self._selections[names] = selection
+
+        return selection
+
+    def __reduce__(self):
+        # The subvectors are restored with dict.update() in __setstate__() so that their offsets are not recomputed by __setitem__().
+        # The concatenated arrays and the caches are rebuilt lazily on the other side.
+        state = self.__dict__.copy()
+        state['_vals'] = state['_upper'] = state['_lower'] = None
+        state['_finalized'] = False
+        state['_index'] = None
+        state['_concatenations'] = {}
+        state['_selections'] = {}
+        state['_bounds'] = None
+        return (self.__class__.__new__, (self.__class__,), (state, list(self.items())))
+
+    def __setstate__(self, state):
+        state, items = state
+        self.__dict__.update(state)
+        dict.update(self, items)
+
     def __setitem__(self, key, component_dict: Dict):
         """
         Add/replace a dictionary corresponding to a subvector in the current dictionary of subvector dictionaries.
@@ -40,6 +270,9 @@ class VectorComponentsDict(dict):
         component_dict : dict
             Subvector dictionary to be added/replaced in self.
         """
+        if self.frozen:
+            raise TypeError('Subvector {} cannot be added to a frozen VectorComponentsDict'.format(key))
+
         if key in self:
             raise KeyError('A subvector called {} has already been added'.format(key))
 
@@ -50,53 +283,86 @@ class VectorComponentsDict(dict):
         self.vector_size += size
         component_dict['end_index'] = self.vector_size
 
-        # New addition for design variables
-        if 'vals' in component_dict:
-            if component_dict['vals'] is not None:
-                self.vals = np.append(self.vals, component_dict['vals'].flatten())
-            else:
-                self.vals = np.append(self.vals, np.zeros((size,)))
-        else:
-            self.vals = np.append(self.vals, np.zeros((size,)))
-
-        # # Upper exists means it's a constrained vector
-        # if 'upper' in component_dict:
-        #     if component_dict['equals'] is not None:
-        #         self.lower = np.append(self.lower, component_dict['equals'].flatten())
-        #         self.upper = np.append(self.upper, component_dict['equals'].flatten())
-            
-        #     elif component_dict['upper'] is not None or component_dict['lower'] is not None:
-        #         if component_dict['upper'] is not None:
-        #             self.upper = np.append(self.upper, component_dict['upper'].flatten())
-        #         else:
-        #             self.upper = np.append(self.upper, np.full((size,), np.inf))
-                
-        #         if component_dict['lower'] is not None:
-        #             self.lower = np.append(self.lower, component_dict['lower'].flatten())
-        #         else:
-        #             self.lower = np.append(self.lower, np.full((size,), -np.inf))
-        
-        # # else:
-        # #     self.upper = np.append(self.upper, np.full((size,), np.inf))
-        # #     self.lower = np.append(self.lower, np.full((size,), -np.inf))
-
-        # Upper exists means it's a constrained vector
+        # vals, upper and lower are only assembled when they are needed
+        self._finalized = False
+        self._index = None
+        self._concatenations = {}
+        self._selections = {}
+        self._bounds = None
+        self._layout = None
+
+        super().__setitem__(key, component_dict)
+
+    def finalize(self):
+        """
+        Assemble the concatenated vals, upper and lower arrays from the subvector dictionaries.
+        Each array is allocated exactly once and every subvector is copied into its slice.
+        """
+        vals = np.zeros(self.vector_size, dtype=self.dtype)
+
+        # A subvector with upper, lower or equals is bounded, i.e., it's a constrained vector
         # Note: Vectors are also used to create matrices
-        if 'upper' in component_dict:
-            if component_dict['equals'] is not None:
-                self.lower = np.append(self.lower, component_dict['equals'].flatten())
-                self.upper = np.append(self.upper, component_dict['equals'].flatten())
-            
-            else:
-                if component_dict['upper'] is not None:
-                    self.upper = np.append(self.upper, component_dict['upper'].flatten())
-                else:
-                    self.upper = np.append(self.upper, np.full((size,), np.inf))
-                
-                if component_dict['lower'] is not None:
-                    self.lower = np.append(self.lower, component_dict['lower'].flatten())
+        bounded_size = sum(component_dict['size'] for component_dict in self.values() if self._is_bounded(component_dict))
+        upper = np.full(bounded_size, np.inf)
+        lower = np.full(bounded_size, -np.inf)
+
+        bound_index = 0
+        for component_dict in self.values():
+            ind1 = component_dict['start_index']
+            ind2 = component_dict['end_index']
+
+            if component_dict.get('vals') is not None:
+                vals[ind1:ind2] = np.ravel(component_dict['vals'])
+
+            if self._is_bounded(component_dict):
+                bound_ind1 = bound_index
+                bound_ind2 = bound_index = bound_index + component_dict['size']
+
+                if component_dict.get('equals') is not None:
+                    lower[bound_ind1:bound_ind2] = np.ravel(component_dict['equals'])
+                    upper[bound_ind1:bound_ind2] = np.ravel(component_dict['equals'])
+
                 else:
-                    self.lower = np.append(self.lower, np.full((size,), -np.inf))
+                    if component_dict.get('upper') is not None:
+                        upper[bound_ind1:bound_ind2] = np.ravel(component_dict['upper'])
+                    if component_dict.get('lower') is not None:
+                        lower[bound_ind1:bound_ind2] = np.ravel(component_dict['lower'])
+
+        self._vals = vals
+        self._upper = upper
+        self._lower = lower
+        self._finalized = True
+
+    @staticmethod
+    def _is_bounded(component_dict):
+        return 'upper' in component_dict or 'lower' in component_dict or 'equals' in component_dict
+
+    @property
+    def vals(self):
+        if not self._finalized:
+            self.finalize()
+        return self._vals
+
+    @property
+    def upper(self):
+        if not self._finalized:
+            self.finalize()
+        return self._upper
+
+    @property
+    def lower(self):
+        if not self._finalized:
+            self.finalize()
+        return self._lower
 
+    @property
+    def bounds(self):
+        if self._bounds is None:
+            self._bounds = Bounds.from_vector_components_dict(self)
+        return self._bounds
 
-        super().__setitem__(key, component_dict)
\ No newline at end of file
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = ComponentsIndex.from_vector_components_dict(self)
+        return self._index
@@ -1,5 +1,6 @@
 """Define the COOMatrix class"""
 import numpy as np
+from array_manager.utils.sum_duplicates import sum_duplicates
 from array_manager.core.standard_formats.sparse_matrix import SparseMatrix
 import scipy.sparse as sp
 
@@ -34,28 +35,23 @@ class COOMatrix(SparseMatrix):
         super().__init__(native_matrix, duplicate_indices=duplicate_indices)
         
         if self.duplicate_indices:
-            rows_cols = np.append([native_matrix.rows], [native_matrix.cols], axis=0).T
-            unique_sorted_rows_cols, indices, inverse_duplicate_indices = np.unique(rows_cols, return_index = True, return_inverse = True, axis = 0)
-
             # requested format
-            self.cols = unique_sorted_rows_cols[:, 1]
-            self.rows = unique_sorted_rows_cols[:, 0]
-
-            self.inverse_duplicate_indices = inverse_duplicate_indices
-            self.data = np.bincount(self.inverse_duplicate_indices, weights=self.native.vals.data)
+            self.rows, self.cols = self.compute_unique_indices(native_matrix.rows, native_matrix.cols)
+            self.data = sum_duplicates(self.inverse_duplicate_indices, self.native.vals.data)
         else:
-            # precomputed fwd permutation matrix, sparse_format == 'coo':
-            self.bottom_up_sorting_indices = np.lexsort((native_matrix.cols, native_matrix.rows))
+            # precomputed fwd and reverse permutation matrices, sparse_format == 'coo':
+            self.compute_sorting_indices(native_matrix.rows, native_matrix.cols)
             
             # requested format
             self.rows = native_matrix.rows[self.bottom_up_sorting_indices]
             self.cols = native_matrix.cols[self.bottom_up_sorting_indices]
-            
-            # precomputed reverse permutation matrix
-            self.top_down_sorting_indices = np.argsort(self.bottom_up_sorting_indices)
 
             # Initialize with the data given in the native_format
             self.data = self.native.vals.data[self.bottom_up_sorting_indices]
 
     def get_std_array(self):
         return sp.coo_matrix((self.data, (self.rows, self.cols)), shape=self.dense_shape)
+
+    def build_operator(self):
+        # The nonzeros are sorted by row, so self.data is also the data of the CSR matrix
+        return sp.csr_matrix((self.data, self.cols, self.compute_ind_ptr(self.rows, self.dense_shape[0])), shape=self.dense_shape)
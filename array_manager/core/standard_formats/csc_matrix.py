@@ -1,5 +1,6 @@
 """Define the CSCMatrix class"""
 import numpy as np
+from array_manager.utils.sum_duplicates import sum_duplicates
 from array_manager.core.standard_formats.sparse_matrix import SparseMatrix
 import scipy.sparse as sp
 
@@ -34,28 +35,18 @@ class CSCMatrix(SparseMatrix):
         super().__init__(native_matrix, duplicate_indices=duplicate_indices)
         
         if self.duplicate_indices:
-            cols_rows = np.append([native_matrix.cols], [native_matrix.rows], axis=0).T
-            unique_sorted_cols_rows, indices, inverse_duplicate_indices = np.unique(cols_rows, return_index = True, return_inverse = True, axis = 0)
-
             # requested format
-            self.rows = unique_sorted_cols_rows[:, 1]
-            final_cols = unique_sorted_cols_rows[:, 0]
-            self.ind_ptr = np.insert(np.bincount(final_cols).cumsum(), 0, 0)
-
-
-            self.inverse_duplicate_indices = inverse_duplicate_indices
-            self.data = np.bincount(self.inverse_duplicate_indices, weights=self.native.vals.data)
+            final_cols, self.rows = self.compute_unique_indices(native_matrix.cols, native_matrix.rows)
+            self.ind_ptr = self.compute_ind_ptr(final_cols, self.dense_shape[1])
+            self.data = sum_duplicates(self.inverse_duplicate_indices, self.native.vals.data)
         else:
-            # precomputed fwd permutation matrix, sparse_format = 'csc':
-            self.bottom_up_sorting_indices = np.lexsort((native_matrix.rows, native_matrix.cols))
+            # precomputed fwd and reverse permutation matrices, sparse_format = 'csc':
+            self.compute_sorting_indices(native_matrix.cols, native_matrix.rows)
             
             #optimizer requested format
             self.rows = native_matrix.rows[self.bottom_up_sorting_indices]
             final_cols = native_matrix.cols[self.bottom_up_sorting_indices]
-            self.ind_ptr = np.insert(np.bincount(final_cols).cumsum(), 0, 0)
-
-            # precomputed reverse permutation matrix
-            self.top_down_sorting_indices = np.argsort(self.bottom_up_sorting_indices)
+            self.ind_ptr = self.compute_ind_ptr(final_cols, self.dense_shape[1])
 
             # Initialize with the data given in the native_format
             self.data = self.native.vals.data[self.bottom_up_sorting_indices]
@@ -1,5 +1,6 @@
 """Define the CSRMatrix class"""
 import numpy as np
+from array_manager.utils.sum_duplicates import sum_duplicates
 from array_manager.core.standard_formats.sparse_matrix import SparseMatrix
 import scipy.sparse as sp
 
@@ -34,28 +35,18 @@ class CSRMatrix(SparseMatrix):
         super().__init__(native_matrix, duplicate_indices=duplicate_indices)
 
         if self.duplicate_indices:
-            rows_cols = np.append([native_matrix.rows], [native_matrix.cols], axis=0).T
-            unique_sorted_rows_cols, indices, inverse_duplicate_indices = np.unique(rows_cols, return_index = True, return_inverse = True, axis = 0)
-
             # requested format
-            self.cols = unique_sorted_rows_cols[:, 1]
-            final_rows = unique_sorted_rows_cols[:, 0]
-            self.ind_ptr = np.insert(np.bincount(final_rows).cumsum(), 0, 0)
-
-
-            self.inverse_duplicate_indices = inverse_duplicate_indices
-            self.data = np.bincount(self.inverse_duplicate_indices, weights=self.native.vals.data)
+            final_rows, self.cols = self.compute_unique_indices(native_matrix.rows, native_matrix.cols)
+            self.ind_ptr = self.compute_ind_ptr(final_rows, self.dense_shape[0])
+            self.data = sum_duplicates(self.inverse_duplicate_indices, self.native.vals.data)
         else:
-            # precomputed fwd permutation matrix, sparse_format = 'csr'
-            self.bottom_up_sorting_indices = np.lexsort((native_matrix.cols, native_matrix.rows))
+            # precomputed fwd and reverse permutation matrices, sparse_format = 'csr'
+            self.compute_sorting_indices(native_matrix.rows, native_matrix.cols)
             
             # requested format
             self.cols = native_matrix.cols[self.bottom_up_sorting_indices]
             final_rows = native_matrix.rows[self.bottom_up_sorting_indices]
-            self.ind_ptr = np.insert(np.bincount(final_rows).cumsum(), 0, 0)
-
-            # precomputed reverse permutation matrix
-            self.top_down_sorting_indices = np.argsort(self.bottom_up_sorting_indices)
+            self.ind_ptr = self.compute_ind_ptr(final_rows, self.dense_shape[0])
 
             # Initialize with the data given in the native_format
             self.data = self.native.vals.data[self.bottom_up_sorting_indices]
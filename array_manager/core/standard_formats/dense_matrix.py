@@ -1,5 +1,6 @@
 """Define the DenseMatrix class"""
 import numpy as np
+from array_manager.utils.sum_duplicates import sum_duplicates
 
 
 class DenseMatrix(object):
@@ -26,7 +27,7 @@ class DenseMatrix(object):
         self.duplicate_indices = duplicate_indices
         self.native = native_matrix
         self.dense_shape = native_matrix.dense_shape
-        self.data = np.zeros(self.dense_shape)
+        self.data = np.zeros(self.dense_shape, dtype=native_matrix.dtype)
 
         # (Can also support col major or row major if optimizer requests so. This implementation uses default python ordering which is row major. Col major would be faster with Fortran-based optimizers)
         flattened_indices_of_non_zeros = np.ravel_multi_index((native_matrix.rows, native_matrix.cols), native_matrix.dense_shape)
@@ -35,7 +36,7 @@ class DenseMatrix(object):
             unique_sorted_flattened_indices_of_non_zeros, indices, inverse_duplicate_indices = np.unique(flattened_indices_of_non_zeros, return_index = True, return_inverse = True, axis = 0)
             self.unique_sorted_flattened_indices_of_non_zeros = unique_sorted_flattened_indices_of_non_zeros
             self.inverse_duplicate_indices = inverse_duplicate_indices
-            summed_vals = np.bincount(inverse_duplicate_indices, weights=self.native.vals.data)
+            summed_vals = sum_duplicates(inverse_duplicate_indices, self.native.vals.data)
             np.put(self.data, self.unique_sorted_flattened_indices_of_non_zeros, summed_vals)
 
         else:
@@ -50,7 +51,7 @@ class DenseMatrix(object):
         self.native.update_bottom_up()
         # Replaces specified elements of an array with given values. The indexing works on the flattened target array.
         if self.duplicate_indices:
-            summed_vals = np.bincount(self.inverse_duplicate_indices, weights=self.native.vals.data)
+            summed_vals = sum_duplicates(self.inverse_duplicate_indices, self.native.vals.data)
             np.put(self.data, self.unique_sorted_flattened_indices_of_non_zeros, summed_vals)
         else:
             np.put(self.data, self.flattened_indices_of_non_zeros, self.native.vals.data)
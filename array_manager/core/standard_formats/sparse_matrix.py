@@ -1,5 +1,7 @@
 """Define the SparseMatrix class"""
 import numpy as np
+from array_manager.utils.sum_duplicates import sum_duplicates
+from array_manager.utils.index_dtype import get_index_dtype
 
 
 class SparseMatrix(object):
@@ -14,6 +16,8 @@ class SparseMatrix(object):
         Vector containing nonzeros of the sparse matrix
     num_nonzeros : int
         Number of nonzeros in the sparse matrix
+    index_dtype : np.dtype
+        dtype of the index arrays and sorting permutations (int32 when the shape and the number of nonzeros allow it, int64 otherwise)
     """
 
     def __init__(self, native_matrix, duplicate_indices=False):
@@ -30,18 +34,73 @@ class SparseMatrix(object):
         self.dense_shape = native_matrix.dense_shape
         # Need this (num_nonzeros)?
         self.num_nonzeros = native_matrix.num_nonzeros
-        self.data = np.zeros(self.num_nonzeros)
+        self.index_dtype = get_index_dtype(self.dense_shape, self.num_nonzeros)
+        self.data = np.zeros(self.num_nonzeros, dtype=native_matrix.dtype)
+        self._operator = None
+
+    def compute_sorting_indices(self, primary_indices, secondary_indices):
+        """
+        Compute the permutation sorting the nonzeros of the native by primary and then secondary indices (bottom-up) and its inverse (top-down).
+        """
+        self.bottom_up_sorting_indices = np.lexsort((secondary_indices, primary_indices)).astype(self.index_dtype, copy=False)
+
+        # The inverse permutation is a scatter instead of a second sort
+        self.top_down_sorting_indices = np.empty_like(self.bottom_up_sorting_indices)
+        self.top_down_sorting_indices[self.bottom_up_sorting_indices] = np.arange(self.num_nonzeros, dtype=self.index_dtype)
+
+    def compute_unique_indices(self, primary_indices, secondary_indices):
+        """
+        Return the unique (primary, secondary) index pairs sorted by primary and then secondary index, and store the position of each nonzero of the native among them.
+        """
+        primary_secondary = np.append([primary_indices], [secondary_indices], axis=0).T
+        unique_sorted_primary_secondary, inverse_duplicate_indices = np.unique(primary_secondary, return_inverse=True, axis=0)
+        self.inverse_duplicate_indices = np.ravel(inverse_duplicate_indices).astype(self.index_dtype, copy=False)
+
+        return unique_sorted_primary_secondary[:, 0], unique_sorted_primary_secondary[:, 1]
+
+    def compute_ind_ptr(self, sorted_indices, num_slots):
+        """
+        Return the index pointer of the sorted row (CSR) or column (CSC) indices, with one entry per row/column (including empty ones) plus one.
+        """
+        ind_ptr = np.zeros(num_slots + 1, dtype=self.index_dtype)
+        np.cumsum(np.bincount(sorted_indices, minlength=num_slots), out=ind_ptr[1:])
+        return ind_ptr
             
+    def build_operator(self):
+        """
+        Return the scipy matrix used by operator() (the standard array itself by default).
+        """
+        return self.get_std_array()
+
+    def operator(self):
+        """
+        Return a scipy CSR or CSC matrix whose data is self.data (no copy), used for the matrix products.
+        The operator is built once; since update_bottom_up() updates self.data in place, it stays up to date without being rebuilt.
+        """
+        if self._operator is None:
+            self._operator = self.build_operator()
+        if self._operator.data is not self.data:
+            self._operator.data = self.data
+
+        return self._operator
+
     def update_bottom_up(self):
         """
-        Request the native to update its data and then update self.data.
+        Request the native to update its data and then update self.data (in place if the dtype is unchanged).
         """
         self.native.update_bottom_up()
+        vals = self.native.vals.data
         if self.duplicate_indices:
-            self.data = np.bincount(self.inverse_duplicate_indices, weights=self.native.vals.data)
+            summed_vals = sum_duplicates(self.inverse_duplicate_indices, vals)
+            if summed_vals.dtype == self.data.dtype:
+                self.data[...] = summed_vals
+            else:
+                self.data = summed_vals
 
+        elif vals.dtype == self.data.dtype:
+            np.take(vals, self.bottom_up_sorting_indices, out=self.data, mode='clip')
         else:
-            self.data = self.native.vals.data[self.bottom_up_sorting_indices]
+            self.data = vals[self.bottom_up_sorting_indices]
 
     def update_top_down(self):
         """
@@ -5,7 +5,7 @@ Geometry input file
 import pyiges
 import numpy as np
 
-from array_manager.api import VectorComponentsDict, Vector
+from array_manager.api import Vector
 
 
 # geometry_dict import/read
@@ -51,79 +51,20 @@ fuse_surfaces = iges.bspline_surfaces()
 # torus_surfaces = iges.bspline_surfaces()
 
 
-geometry_dict = VectorComponentsDict()
-
-geo_cps = np.zeros((1,3))
-wing_cps = wing_surfaces[0]._cp[0]
-for i in range(len(wing_surfaces)):
-    wing_surf_cps = wing_surfaces[i]._cp[0]
-    for j in range(len(wing_surfaces[i]._cp)):
-        if j == 0:
-                pass
-        else:  
-            wing_surf_cps =  np.vstack((wing_surf_cps, wing_surfaces[i]._cp[j]))
-    string_name = 'wing_{}'.format(i)
-    geometry_dict[string_name] = dict(shape=(len(wing_surf_cps),3))
-    wing_cps = np.vstack((wing_cps, wing_surf_cps))
-
-geo_cps = np.vstack((geo_cps, wing_cps))
-
-geo_cps = geo_cps[1:,:]
-
-tail_cps = tail_surfaces[0]._cp[0]
-for i in range(len(tail_surfaces)):
-    tail_surf_cps = tail_surfaces[i]._cp[0]
-    for j in range(len(tail_surfaces[i]._cp)):
-        if j == 0:
-                pass
-        else:  
-            tail_surf_cps =  np.vstack((tail_surf_cps, tail_surfaces[i]._cp[j]))
-    string_name = 'tail_{}'.format(i)
-    geometry_dict[string_name] = dict(shape=(len(tail_surf_cps),3))
-    tail_cps = np.vstack((tail_cps, tail_surf_cps))
-geo_cps = np.vstack((geo_cps, tail_cps))
-
-fuse_cps = fuse_surfaces[0]._cp[0]
-for i in range(len(fuse_surfaces)):
-    fuse_surf_cps = fuse_surfaces[i]._cp[0]
-    for j in range(len(fuse_surfaces[i]._cp)):
-        if j == 0:
-                pass
-        else:  
-            fuse_surf_cps =  np.vstack((fuse_surf_cps, fuse_surfaces[i]._cp[j]))
-    string_name = 'fuse_{}'.format(i)
-    geometry_dict[string_name] = dict(shape=(len(fuse_surf_cps),3))
-    fuse_cps = np.vstack((fuse_cps, fuse_surf_cps))
-geo_cps = np.vstack((geo_cps, fuse_cps))
-
-geometry = Vector(geometry_dict)  #creates Vector
-
-# allocating memory
-
-geometry.allocate(setup_views=True, data=geo_cps.flatten())
+# Control points of every patch, stacked once per surface, and their names
+names = []
+patch_cps = []
+for prefix, surfaces in (('wing', wing_surfaces), ('tail', tail_surfaces), ('fuse', fuse_surfaces)):
+    for i, surface in enumerate(surfaces):
+        names.append('{}_{}'.format(prefix, i))
+        patch_cps.append(np.vstack(surface._cp))
+
+# Offsets of all the patches are computed in one pass and each patch is copied once
+geometry = Vector.from_arrays(patch_cps, names, setup_views=True)
+geometry_dict = geometry.vector_components_dict
+geo_cps = geometry.data.reshape(-1, 3)
 print(geometry.data.shape)
 print(geo_cps.shape)
-# geometry.allocate(setup_views=True, data=geo_cps)    
-# geometry.allocate(setup_views=True)    
-
-# geometry['wing_1']
-
-cutoff = 0
-for i in range(len(wing_surfaces)):
-    string_name = 'wing_{}'.format(i)
-    geometry[string_name] = geo_cps[cutoff:cutoff+geometry[string_name].shape[0], :]
-    cutoff += len(geometry[string_name])
-
-for i in range(len(tail_surfaces)):
-    string_name = 'tail_{}'.format(i)
-    geometry[string_name] = geo_cps[cutoff:cutoff+len(geometry[string_name]), :]
-    cutoff += len(geometry[string_name])
-
-for i in range(len(fuse_surfaces)):
-    string_name = 'fuse_{}'.format(i)
-    geometry[string_name] = geo_cps[cutoff:cutoff+len(geometry[string_name]), :]
-    cutoff += len(geometry[string_name])
-
 
 print('initialized_cps: ', geometry.data)
 
@@ -152,6 +93,10 @@ print('shifted wing_0', geometry['wing_0'])
 print('geo', geometry.data)
 print(np.min(geometry.data))
 
+# All the wing patches as one flat array (a view into geometry.data, since the wing patches are contiguous)
+wing_vals = geometry.subvector('wing_*')
+print('wing cps', wing_vals[:])
+
 # surfaces = np.array([wing_surfaces, tail_surfaces, fuse_surfaces, prop_surfaces, torus_surfaces])
 
 # geometry_dict parameterization settings
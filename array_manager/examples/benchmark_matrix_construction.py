@@ -0,0 +1,99 @@
+'''
+Benchmark for assembling the global rows/cols of a Matrix with many sub-blocks
+'loop' is the per-component loop that Matrix.__init__() used before, 'batched' is the current assembly and 'Matrix' is the full constructor
+'''
+
+from array_manager.api import VectorComponentsDict, MatrixComponentsDict, Matrix
+from array_manager.core.native_formats.sparsity_pattern import _assemble_global_indices
+
+import numpy as np
+import time
+
+
+def copy_components(matrix_components_dict):
+    # The baseline loop writes the local rows/cols back into the component dictionaries, so it runs on copies
+    return [(key, dict(component_dict)) for key, component_dict in matrix_components_dict.items()]
+
+
+def loop_global_indices(num_nonzeros, components):
+    # Loop of Matrix.__init__() before the batched assembly (copied from the baseline commit ffa66dd), including the layout of the values
+    rows = np.zeros(num_nonzeros, dtype=int)
+    cols = np.zeros(num_nonzeros, dtype=int)
+
+    vector_components_dict = VectorComponentsDict()
+
+    for key, component_dict in components:
+        shape = component_dict['shape']
+        # COO arrays from given CSR or CSC arrays
+        if isinstance(component_dict['ind_ptr'], np.ndarray):
+            ind_ptr = component_dict['ind_ptr']
+            # Compute differences between consecutive elements in the ind_ptr array
+            num_repeats = np.ediff1d(ind_ptr)
+            if isinstance(component_dict['rows'], np.ndarray):
+                component_dict['cols'] = np.repeat(np.arange(shape[1]), num_repeats)
+
+            elif isinstance(component_dict['cols'], np.ndarray):
+                component_dict['rows'] =  np.repeat(np.arange(shape[0]), num_repeats)
+
+        # Dense matrix component
+        elif (component_dict['rows'] is None) and (component_dict['cols'] is None):
+            component_dict['rows'] = np.repeat(np.arange(shape[0]), shape[1])
+            component_dict['cols'] = np.tile(np.arange(shape[1]), shape[0])
+
+        global_rows = component_dict['rows'] + component_dict['row_start_index']
+        global_cols = component_dict['cols'] + component_dict['col_start_index']
+
+        start = component_dict['start_index']
+        end = component_dict['end_index']
+
+        rows[start:end] = global_rows
+        cols[start:end] = global_cols
+
+        vals_shape = component_dict['vals_shape']
+        vector_components_dict[key] = dict(shape=vals_shape)
+
+    return rows, cols
+
+
+def declare_jacobian(num_blocks, block_size=4):
+    # Block-diagonal Jacobian cycling through dense, COO, CSR and CSC sub-blocks
+    outputs = VectorComponentsDict.from_components(('f_{}'.format(i), dict(shape=(block_size,))) for i in range(num_blocks))
+    inputs = VectorComponentsDict.from_components(('x_{}'.format(i), dict(shape=(block_size,))) for i in range(num_blocks))
+
+    arange = np.arange(block_size)
+    ind_ptr = np.arange(block_size + 1)
+
+    jacobian_dict = MatrixComponentsDict(outputs, inputs)
+    for i in range(num_blocks):
+        key = ('f_{}'.format(i), 'x_{}'.format(i))
+        kind = i % 4
+        if kind == 0:
+            jacobian_dict[key] = dict()
+        elif kind == 1:
+            jacobian_dict[key] = dict(rows=arange, cols=arange[::-1])
+        elif kind == 2:
+            jacobian_dict[key] = dict(cols=arange, ind_ptr=ind_ptr)
+        else:
+            jacobian_dict[key] = dict(rows=arange, ind_ptr=ind_ptr)
+
+    return jacobian_dict
+
+
+def time_function(function, *args):
+    t0 = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - t0, result
+
+
+print('{:>10} {:>12} {:>14} {:>12} {:>12}'.format('blocks', 'loop [s]', 'batched [s]', 'Matrix [s]', 'reuse [s]'))
+for num_blocks in [1000, 10000, 50000]:
+    jacobian_dict = declare_jacobian(num_blocks)
+
+    t_loop, (rows_loop, cols_loop) = time_function(loop_global_indices, jacobian_dict.num_nonzeros, copy_components(jacobian_dict))
+    t_batched, (rows, cols) = time_function(_assemble_global_indices, jacobian_dict)
+    t_matrix, matrix = time_function(Matrix, jacobian_dict)
+    # Further matrices built from the same dictionary share its sparsity pattern
+    t_reuse, _ = time_function(Matrix, jacobian_dict)
+
+    assert np.array_equal(rows, rows_loop) and np.array_equal(cols, cols_loop)
+    print('{:>10} {:>12.4f} {:>14.4f} {:>12.4f} {:>12.4f}'.format(num_blocks, t_loop, t_batched, t_matrix, t_reuse))
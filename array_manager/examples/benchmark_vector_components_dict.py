@@ -0,0 +1,60 @@
+'''
+Benchmark for declaring VectorComponentsDict layouts with many components
+'''
+
+from array_manager.api import VectorComponentsDict, Vector
+
+import numpy as np
+import time
+
+
+def declare_with_np_append(num_components, shape):
+    # Previous way: vals/upper/lower were grown with np.append inside __setitem__
+    vector_size = 0
+    vals = np.array([])
+    upper = np.array([])
+    lower = np.array([])
+    for i in range(num_components):
+        size = np.prod(shape)
+        vector_size += size
+        vals = np.append(vals, np.ones(shape).flatten())
+        upper = np.append(upper, np.full((size,), np.inf))
+        lower = np.append(lower, np.zeros(shape).flatten())
+
+    return vals
+
+
+def declare_with_setitem(num_components, shape):
+    vec_dict = VectorComponentsDict()
+    for i in range(num_components):
+        vec_dict['patch_{}'.format(i)] = dict(shape=shape, vals=np.ones(shape), upper=None, lower=np.zeros(shape), equals=None)
+
+    vec = Vector(vec_dict)
+    vec.allocate(setup_views=True)
+    return vec
+
+
+def declare_with_from_components(num_components, shape):
+    vec_dict = VectorComponentsDict.from_components(
+        ('patch_{}'.format(i), dict(shape=shape, vals=np.ones(shape), upper=None, lower=np.zeros(shape), equals=None))
+        for i in range(num_components))
+
+    vec = Vector(vec_dict)
+    vec.allocate(setup_views=True)
+    return vec
+
+
+def time_function(function, *args):
+    t0 = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - t0
+
+
+shape = (16, 3)
+
+print('{:>12} {:>14} {:>14} {:>18}'.format('components', 'np.append [s]', 'setitem [s]', 'from_components [s]'))
+for num_components in [100, 1000, 2000, 5000]:
+    t_append = time_function(declare_with_np_append, num_components, shape)
+    t_setitem = time_function(declare_with_setitem, num_components, shape)
+    t_bulk = time_function(declare_with_from_components, num_components, shape)
+    print('{:>12} {:>14.4f} {:>14.4f} {:>18.4f}'.format(num_components, t_append, t_setitem, t_bulk))
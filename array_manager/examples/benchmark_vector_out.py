@@ -0,0 +1,67 @@
+'''
+Benchmark for the out= arithmetic methods of the Vector class in a typical optimizer update loop
+'''
+
+from array_manager.api import VectorComponentsDict, Vector
+
+import numpy as np
+import time
+import tracemalloc
+
+
+def update_with_operators(x, d, alpha, num_iterations):
+    for i in range(num_iterations):
+        x = x + d * alpha
+
+    return x
+
+
+def update_with_out(x, d, alpha, num_iterations):
+    for i in range(num_iterations):
+        x.axpy(alpha, d, out=x)
+
+    return x
+
+
+def update_into_buffer(x, d, alpha, num_iterations):
+    # x_new = x + alpha * d written into a preallocated Vector, then swapped
+    x_new = Vector(x.vector_components_dict)
+    x_new.allocate(data=np.empty_like(x.data), setup_views=True)
+    for i in range(num_iterations):
+        x.axpy(alpha, d, out=x_new)
+        x, x_new = x_new, x
+
+    return x
+
+
+def measure(update, vector_size, num_iterations):
+    x_dict = VectorComponentsDict()
+    x_dict['x0'] = dict(shape=(vector_size // 2,))
+    x_dict['x1'] = dict(shape=(vector_size - vector_size // 2,))
+
+    x = Vector(x_dict)
+    x.allocate(data=np.ones(vector_size), setup_views=True)
+    d = Vector(x_dict)
+    d.allocate(data=np.full(vector_size, 0.5), setup_views=True)
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    t0 = time.perf_counter()
+    update(x, d, 1e-3, num_iterations)
+    runtime = time.perf_counter() - t0
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    # Peak of the extra memory in units of full-length arrays
+    temporaries = peak / (vector_size * x.data.itemsize)
+
+    return runtime, temporaries
+
+
+num_iterations = 200
+
+print('{:>12} {:>20} {:>12} {:>22}'.format('vector size', 'update', 'time [s]', 'peak extra arrays'))
+for vector_size in [10**4, 10**5, 10**6]:
+    for name, update in [('x = x + d * alpha', update_with_operators), ('axpy(out=x)', update_with_out), ('axpy(out=buffer)', update_into_buffer)]:
+        runtime, temporaries = measure(update, vector_size, num_iterations)
+        print('{:>12} {:>20} {:>12.4f} {:>22.2f}'.format(vector_size, name, runtime, temporaries))
@@ -0,0 +1,18 @@
+import numpy as np
+import pytest
+
+from array_manager.api import VectorComponentsDict
+
+
+@pytest.fixture
+def vector_components_dict():
+    """
+    Return a function that builds a new VectorComponentsDict with the subvectors 'a' (shape (2,), initial values [1., 2.]) and 'b' (shape (3,)).
+    """
+    def build(dtype=float):
+        vector_components_dict = VectorComponentsDict(dtype=dtype)
+        vector_components_dict['a'] = dict(shape=(2,), vals=np.array([1., 2.]))
+        vector_components_dict['b'] = dict(shape=(3,))
+        return vector_components_dict
+
+    return build
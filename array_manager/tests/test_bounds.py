@@ -0,0 +1,65 @@
+import numpy as np
+
+from array_manager.api import VectorComponentsDict, Vector
+
+
+def constrained_vector(data):
+    vector_components_dict = VectorComponentsDict()
+    vector_components_dict['x'] = dict(shape=(2,), lower=0., upper=1.)
+    vector_components_dict['free'] = dict(shape=(2,))
+    vector_components_dict['y'] = dict(shape=(1,), lower=-1.)
+    vector_components_dict['z'] = dict(shape=(1,), equals=2.)
+
+    vector = Vector(vector_components_dict)
+    vector.allocate(data=np.array(data, dtype=float))
+    return vector
+
+
+def test_bounds():
+    bounds = constrained_vector(np.zeros(6)).vector_components_dict.bounds
+
+    assert np.array_equal(bounds.lower, [0., 0., -np.inf, -np.inf, -1., 2.])
+    assert np.array_equal(bounds.upper, [1., 1., np.inf, np.inf, np.inf, 2.])
+    assert np.array_equal(bounds.equality_indices, [5])
+    assert np.array_equal(bounds.inequality_indices, [0, 1, 4])
+    assert np.array_equal(bounds.free_indices, [2, 3])
+    assert np.array_equal(bounds.bounded_indices, [0, 1, 4, 5])
+
+
+def test_project():
+    vector = constrained_vector([-1., 0.5, -10., 10., -3., 0.])
+
+    assert vector.project() is vector
+    assert np.array_equal(vector.data, [0., 0.5, -10., 10., -1., 2.])
+
+
+def test_active_sets():
+    vector = constrained_vector([0., 0.95, 5., 5., -1., 2.])
+
+    lower_active, upper_active, inactive = vector.active_sets(tol=0.1)
+    assert np.array_equal(lower_active, [0, 4, 5])
+    assert np.array_equal(upper_active, [1, 5])
+    assert np.array_equal(inactive, [2, 3])
+
+
+def test_max_step():
+    vector = constrained_vector([0.5, 0.5, 0., 0., 0., 2.])
+
+    assert vector.max_step(np.array([1., -2., 100., 0., 0., 0.])) == 0.25
+    assert vector.max_step(np.array([0., 0., 1., 1., 1., 0.])) == np.inf
+
+    # An entry on the bound it moves towards blocks the step
+    vector.data[0] = 1.
+    assert vector.max_step(np.array([1., 0., 0., 0., 0., 0.])) == 0.
+
+
+def test_bounded_subvectors():
+    vector_components_dict = VectorComponentsDict()
+    vector_components_dict['x'] = dict(shape=(2,), upper=np.array([1., 2.]), lower=None, equals=None)
+    vector_components_dict['free'] = dict(shape=(2,))
+    # A subvector with only lower or only equals is bounded too
+    vector_components_dict['y'] = dict(shape=(1,), lower=-1.)
+    vector_components_dict['z'] = dict(shape=(1,), equals=2.)
+
+    assert np.array_equal(vector_components_dict.lower, [-np.inf, -np.inf, -1., 2.])
+    assert np.array_equal(vector_components_dict.upper, [1., 2., np.inf, 2.])
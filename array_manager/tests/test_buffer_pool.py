@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from array_manager.api import VectorComponentsDict, Vector, BufferPool
+
+
+def test_buffers_are_reused(vector_components_dict):
+    pool = BufferPool()
+    layout = vector_components_dict()
+
+    buffer = pool.acquire(layout)
+    assert buffer.shape == (5,) and buffer.dtype == np.float64
+    pool.release_data(layout, buffer)
+
+    assert pool.acquire(layout) is buffer
+    assert pool.acquire(layout, dtype=np.float32).dtype == np.float32
+
+    stats = pool.stats()
+    assert (stats['hits'], stats['misses']) == (1, 2)
+
+
+def test_max_buffers(vector_components_dict):
+    pool = BufferPool(max_buffers=1)
+    layout = vector_components_dict()
+
+    pool.release_data(layout, np.empty(5))
+    pool.release_data(layout, np.empty(5))
+    assert pool.stats()['idle_buffers'] == 1
+    assert pool.stats()['discards'] == 1
+
+    pool.clear()
+    assert pool.stats()['idle_buffers'] == 0
+
+
+def test_temporaries_of_operations_come_from_the_pool(vector_components_dict):
+    pool = BufferPool()
+    layout = vector_components_dict()
+    x = Vector(layout, pool=pool)
+    x.allocate(setup_views=True)
+    assert np.array_equal(x.data, [1., 2., 0., 0., 0.])
+
+    y = x + 1.
+    assert np.array_equal(y.data, [2., 3., 1., 1., 1.])
+    data = y.data
+    y.release()
+
+    z = x * 2.
+    assert z.data is data
+    assert np.array_equal(z['a'], [2., 4.])
+
+
+@pytest.mark.parametrize('scalar', [np.float64(2.), np.float32(0.5), np.complex128(1 - 2j), True])
+def test_pooled_operations_with_scalars(vector_components_dict, scalar):
+    x = Vector(vector_components_dict(), pool=BufferPool())
+    x.allocate(setup_views=True)
+
+    for result, expected in ((x * scalar, x.data * scalar), (scalar - x, scalar - x.data), (x / scalar, x.data / scalar)):
+        assert result.data.dtype == expected.dtype
+        assert np.array_equal(result.data, expected)
+
+
+def test_pooled_operations_with_integer_vectors():
+    vector_components_dict = VectorComponentsDict(dtype=int)
+    vector_components_dict['i'] = dict(shape=(3,))
+    x = Vector(vector_components_dict, pool=BufferPool())
+    x.allocate(data=np.arange(3), setup_views=True)
+
+    assert np.array_equal((x / 2).data, [0., 0.5, 1.])
+    assert (x * 2).data.dtype == np.int64
+    assert ((x @ x) * x).data.dtype == np.int64
+
+
+def test_user_data_is_not_pooled(vector_components_dict):
+    pool = BufferPool()
+    x = Vector(vector_components_dict(), pool=pool)
+    x.allocate(data=np.arange(5.))
+    x.release()
+
+    assert pool.stats()['idle_buffers'] == 0
+
+
+def test_vector_context_manager(vector_components_dict):
+    pool = BufferPool()
+    layout = vector_components_dict()
+
+    with pool.vector(layout, setup_views=True) as temporary:
+        assert np.array_equal(temporary['a'], [1., 2.])
+        data = temporary.data
+
+    assert pool.acquire(layout) is data
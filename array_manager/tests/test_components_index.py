@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from array_manager.api import MatrixComponentsDict
+from array_manager.core.native_formats.components_index import ComponentsIndex, MatrixComponentsIndex
+
+
+def test_vector_index(vector_components_dict):
+    index = vector_components_dict().index
+
+    assert isinstance(index, ComponentsIndex)
+    assert index.keys == ('a', 'b') and list(index) == ['a', 'b'] and len(index) == 2
+    assert 'b' in index and 'c' not in index
+    assert index.positions == dict(a=0, b=1)
+    assert np.array_equal(index.start_indices, [0, 2])
+    assert np.array_equal(index.end_indices, [2, 5])
+    assert np.array_equal(index.sizes, [2, 3])
+    assert index.shapes == ((2,), (3,))
+    assert index['b'] == dict(shape=(3,), size=3, start_index=2, end_index=5)
+    assert np.array_equal(index.get_positions(['b', 'a']), [1, 0])
+
+    with pytest.raises(KeyError):
+        index['c']
+    with pytest.raises(ValueError):
+        index.sizes[0] = 1
+
+
+def test_slices_of_components(vector_components_dict):
+    vector_components_dict = vector_components_dict()
+    index = vector_components_dict.index
+    data = np.arange(5.)
+
+    for key in index:
+        assert index.get_slice(key) == slice(index[key]['start_index'], index[key]['end_index'])
+        assert np.array_equal(data[index.get_slice(key)], data[vector_components_dict[key]['start_index']:vector_components_dict[key]['end_index']])
+    assert index.get_slice('b') == slice(2, 5)
+
+
+def test_index_is_rebuilt_after_setitem(vector_components_dict):
+    vector_components_dict = vector_components_dict()
+    index = vector_components_dict.index
+    assert vector_components_dict.index is index
+
+    vector_components_dict['c'] = dict(shape=(2, 2))
+    new_index = vector_components_dict.index
+    assert new_index is not index and len(index) == 2
+    assert new_index.keys == ('a', 'b', 'c')
+    assert new_index.get_slice('c') == slice(5, 9)
+
+
+def test_matrix_index(vector_components_dict):
+    vector_components_dict1 = vector_components_dict()
+    matrix_components_dict = MatrixComponentsDict(vector_components_dict1, vector_components_dict1)
+    matrix_components_dict['b', 'a'] = dict()
+    matrix_components_dict['a', 'b'] = dict(rows=np.array([0, 1]), cols=np.array([2, 0]))
+    index = matrix_components_dict.index
+
+    assert isinstance(index, MatrixComponentsIndex)
+    assert index.keys == (('b', 'a'), ('a', 'b'))
+    assert index.shapes == ((3, 2), (2,))
+    assert np.array_equal(index.row_start_indices, [2, 0]) and np.array_equal(index.row_end_indices, [5, 2])
+    assert np.array_equal(index.col_start_indices, [0, 2]) and np.array_equal(index.col_end_indices, [2, 5])
+    assert index['a', 'b'] == dict(
+        shape=(2,), size=2, start_index=6, end_index=8, row_start_index=0, row_end_index=2, col_start_index=2, col_end_index=5,
+    )
+    assert index.get_slice(('b', 'a')) == slice(0, 6)
+
+    matrix_components_dict['b', 'b'] = dict()
+    assert matrix_components_dict.index.keys == (('b', 'a'), ('a', 'b'), ('b', 'b'))
+    assert matrix_components_dict.index.get_slice(('b', 'b')) == slice(8, 17)
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from array_manager.api import VectorComponentsDict, Vector, BufferPool
+from array_manager.core.native_formats.expression import Expression, lazy_mode, lazy_enabled
+from array_manager.utils import parallel
+
+
+def vectors(pool=None):
+    vector_components_dict = VectorComponentsDict()
+    vector_components_dict['a'] = dict(shape=(2,))
+    vector_components_dict['b'] = dict(shape=(4,))
+
+    result = []
+    for data in (np.arange(6.), np.ones(6), np.full(6, 2.)):
+        vector = Vector(vector_components_dict, pool=pool)
+        vector.allocate(data=data, setup_views=True)
+        result.append(vector)
+    return result
+
+
+def test_lazy_mode():
+    x, y, z = vectors()
+
+    with lazy_mode():
+        assert lazy_enabled()
+        expression = 2. * x + y / z - x ** 2
+        assert isinstance(expression, Expression)
+        assert isinstance(-x, Expression)
+    assert not lazy_enabled()
+
+    result = expression.evaluate()
+    assert isinstance(result, Vector)
+    assert np.array_equal(result.data, 2. * x.data + y.data / z.data - x.data ** 2)
+    assert np.array_equal(result['a'], result.data[:2])
+
+
+def test_evaluate_into_an_operand():
+    x, y, z = vectors()
+    expected = x.data * y.data + z.data
+
+    with lazy_mode():
+        x.set_data(x * y + z)
+    assert np.array_equal(x.data, expected)
+
+    # Expressions can also be built from Vector.lazy() outside of lazy_mode()
+    (x.lazy() - expected).evaluate(out=y)
+    assert np.array_equal(y.data, np.zeros(6))
+
+
+def test_expressions_check_the_operands():
+    x, y, z = vectors()
+
+    other_vector_components_dict = VectorComponentsDict()
+    other_vector_components_dict['a'] = dict(shape=(3,))
+    other = Vector(other_vector_components_dict)
+    other.allocate(data=np.zeros(3))
+
+    with pytest.raises(TypeError):
+        x.lazy() + other
+    with pytest.raises(TypeError):
+        x.lazy() + np.zeros(3)
+
+
+def test_chunked_evaluation():
+    x, y, z = vectors()
+    expected = (x.data + 1j) * y.data
+
+    with parallel.parallel(num_threads=2, threshold=0, chunk_size=4):
+        result = ((x.lazy() + 1j) * y).evaluate()
+
+    assert result.data.dtype == np.complex128
+    assert np.array_equal(result.data, expected)
+
+
+def test_pooled_results():
+    pool = BufferPool()
+    x, y, z = vectors(pool)
+
+    result = x * 1j + y
+    assert np.array_equal(result.data, x.data * 1j + y.data)
+    result.release()
+
+    with lazy_mode():
+        pooled = (x * np.complex64(2.) + y).evaluate()
+    assert np.array_equal(pooled.data, x.data * 2. + y.data)
+    assert pool.stats()['hits'] == 1
@@ -0,0 +1,48 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from array_manager.api import VectorComponentsDict, MatrixComponentsDict
+
+
+def test_vector_layouts_are_interned(vector_components_dict):
+    layout = vector_components_dict().freeze()
+
+    assert vector_components_dict().freeze() is layout
+    assert vector_components_dict(complex).freeze() is layout
+    assert layout.kind == 'vector' and layout.shape == (5,)
+
+    other = VectorComponentsDict()
+    other['b'] = dict(shape=(3,))
+    other['a'] = dict(shape=(2,))
+    assert other.freeze() is not layout
+
+    assert pickle.loads(pickle.dumps(layout)) is layout
+
+
+def test_frozen_dictionaries(vector_components_dict):
+    frozen = vector_components_dict()
+    frozen.freeze()
+    assert frozen.frozen
+
+    with pytest.raises(TypeError):
+        frozen['c'] = dict(shape=(1,))
+
+
+def test_matrix_layouts(vector_components_dict):
+    def matrix_components_dict(cols):
+        vector_components_dict1 = vector_components_dict()
+        matrix_components_dict = MatrixComponentsDict(vector_components_dict1, vector_components_dict1)
+        matrix_components_dict['a', 'a'] = dict()
+        matrix_components_dict['b', 'a'] = dict(rows=np.array([0, 2]), cols=cols)
+        return matrix_components_dict
+
+    layout = matrix_components_dict(np.array([0, 1])).freeze()
+    assert layout.kind == 'matrix' and layout.shape == (5, 5)
+    assert matrix_components_dict(np.array([0, 1])).freeze() is layout
+    assert matrix_components_dict(np.array([1, 0])).freeze() is not layout
+
+    assert layout.transpose().shape == (5, 5)
+    assert layout.transpose() is not layout
+    assert layout.transpose().transpose() is layout
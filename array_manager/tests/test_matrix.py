@@ -0,0 +1,285 @@
+import numpy as np
+import pytest
+
+from array_manager.api import VectorComponentsDict, Vector, MatrixComponentsDict, Matrix, COOMatrix, CSRMatrix, CSCMatrix
+from array_manager.core.native_formats.combined_pattern import CombinedPattern
+
+
+def square_matrix():
+    vector_components_dict = VectorComponentsDict()
+    vector_components_dict['x'] = dict(shape=(3,))
+    vector_components_dict['y'] = dict(shape=(2,))
+
+    matrix_components_dict = MatrixComponentsDict(vector_components_dict, vector_components_dict)
+    matrix_components_dict['x', 'x'] = dict(rows=np.array([0, 1, 2]), cols=np.array([1, 2, 0]))
+    matrix_components_dict['x', 'y'] = dict(shape=(3, 2))
+    matrix_components_dict['y', 'y'] = dict()
+
+    matrix = Matrix(matrix_components_dict)
+    matrix.allocate(data=np.arange(1., 1. + matrix.num_nonzeros))
+    return matrix
+
+
+def rectangular_matrix():
+    vector_components_dict1 = VectorComponentsDict()
+    vector_components_dict1['a'] = dict(shape=(2,))
+    vector_components_dict1['b'] = dict(shape=(3,))
+    vector_components_dict2 = VectorComponentsDict()
+    vector_components_dict2['x'] = dict(shape=(4,))
+
+    matrix_components_dict = MatrixComponentsDict(vector_components_dict1, vector_components_dict2)
+    matrix_components_dict['a', 'x'] = dict(shape=(2, 4))
+    matrix_components_dict['b', 'x'] = dict(rows=np.array([0, 2]), cols=np.array([3, 1]))
+
+    matrix = Matrix(matrix_components_dict)
+    matrix.allocate(data=np.arange(1., 1. + matrix.num_nonzeros))
+    return matrix
+
+
+def dense(matrix):
+    array = np.zeros(matrix.dense_shape, dtype=matrix.vals.data.dtype)
+    np.add.at(array, (matrix.rows, matrix.cols), matrix.vals.data)
+    return array
+
+
+def test_dtypes():
+    vector_components_dict1 = VectorComponentsDict(dtype=np.float32)
+    vector_components_dict1['x'] = dict(shape=(2,), vals=np.array([1., 2.]))
+    vector_components_dict2 = VectorComponentsDict(dtype=complex)
+    vector_components_dict2['y'] = dict(shape=(2,))
+
+    x = Vector(vector_components_dict1)
+    x.allocate()
+    assert x.data.dtype == np.float32
+    assert np.array_equal(x.data, [1., 2.])
+
+    matrix_components_dict = MatrixComponentsDict(vector_components_dict1, vector_components_dict2)
+    assert matrix_components_dict.dtype == np.complex128
+    matrix_components_dict['x', 'y'] = dict(rows=np.array([0, 0, 1]), cols=np.array([1, 1, 0]), vals=np.array([1j, 2., 3.]))
+    A = Matrix(matrix_components_dict)
+    A.allocate()
+    assert A.vals.data.dtype == np.complex128
+
+    # Duplicate entries are summed without dropping the imaginary part
+    assert np.array_equal(CSRMatrix(A).get_std_array().toarray(), [[0., 2. + 1j], [3., 0.]])
+
+    # Complex values cannot be stored in a float32 matrix
+    matrix_components_dict = MatrixComponentsDict(vector_components_dict1, vector_components_dict1)
+    assert matrix_components_dict.dtype == np.float32
+    with pytest.raises(TypeError):
+        matrix_components_dict['x', 'x'] = dict(vals=np.full((2, 2), 1j))
+
+
+def test_transpose():
+    A = rectangular_matrix()
+    T = A.transpose()
+
+    assert T.dense_shape == A.dense_shape[::-1]
+    assert T.num_nonzeros == A.num_nonzeros
+    assert T.vals is A.vals
+    assert np.array_equal(dense(T), dense(A).T)
+    assert np.allclose(T @ np.ones(5), dense(A).T @ np.ones(5))
+
+    # The transpose of the transpose has the layout of the original matrix
+    assert T.sparsity_pattern is A.sparsity_pattern.transpose()
+    assert T.transpose().layout is A.layout
+
+
+@pytest.mark.parametrize('operation', [
+    lambda A, B: A + B,
+    lambda A, B: A - B,
+    lambda A, B: A * B,
+])
+def test_transpose_arithmetic(operation):
+    A = square_matrix()
+    T = A.transpose()
+
+    for left, right in ((A, T), (T, A), (T, T)):
+        result = operation(left, right)
+        assert isinstance(result, Matrix)
+        assert np.array_equal(dense(result), operation(dense(left), dense(right)))
+
+
+def test_transpose_scalar_operations():
+    A = rectangular_matrix()
+    T = A.transpose()
+
+    assert np.array_equal(dense(T * 2), dense(A).T * 2)
+    assert np.array_equal(dense(T / 2), dense(A).T / 2)
+    assert np.array_equal((T - 1.5).vals.data, A.vals.data - 1.5)
+
+
+@pytest.mark.parametrize('scalar', [1j, np.complex128(2 - 1j), np.int64(3), np.float32(0.5)])
+def test_scalar_operations(scalar):
+    vector_components_dict = VectorComponentsDict(dtype=complex)
+    vector_components_dict['x'] = dict(shape=(3,))
+    matrix_components_dict = MatrixComponentsDict(vector_components_dict, vector_components_dict)
+    matrix_components_dict['x', 'x'] = dict(rows=np.array([0, 1]), cols=np.array([1, 2]))
+    A = Matrix(matrix_components_dict)
+    A.allocate(data=np.array([1. + 1j, 2.]))
+
+    assert np.array_equal((A * scalar).vals.data, A.vals.data * scalar)
+    assert np.array_equal((A / scalar).vals.data, A.vals.data / scalar)
+
+    expected = A.vals.data * scalar
+    A *= scalar
+    assert np.array_equal(A.vals.data, expected)
+
+
+def matrices_with_different_patterns():
+    vector_components_dict = VectorComponentsDict()
+    vector_components_dict['x'] = dict(shape=(3,))
+    vector_components_dict['y'] = dict(shape=(2,))
+
+    matrix_components_dict1 = MatrixComponentsDict(vector_components_dict, vector_components_dict)
+    matrix_components_dict1['x', 'x'] = dict(rows=np.array([0, 1, 2]), cols=np.array([0, 1, 2]))
+    matrix_components_dict1['x', 'y'] = dict(shape=(3, 2))
+
+    matrix_components_dict2 = MatrixComponentsDict(vector_components_dict, vector_components_dict)
+    matrix_components_dict2['y', 'x'] = dict(rows=np.array([1]), cols=np.array([0]))
+    # The entry (0, 0) is given twice, so it is summed
+    matrix_components_dict2['x', 'x'] = dict(rows=np.array([0, 2, 0]), cols=np.array([0, 1, 0]))
+
+    A = Matrix(matrix_components_dict1)
+    A.allocate(data=np.arange(1., 10.))
+    B = Matrix(matrix_components_dict2)
+    B.allocate(data=np.array([10., 20., 30., 40.]))
+    return A, B
+
+
+@pytest.mark.parametrize('operation', [
+    lambda A, B: A + B,
+    lambda A, B: A - B,
+    lambda A, B: A * B,
+])
+def test_arithmetic_with_different_patterns(operation):
+    A, B = matrices_with_different_patterns()
+
+    for left, right in ((A, B), (B, A)):
+        result = operation(left, right)
+        assert isinstance(result, Matrix)
+        assert np.array_equal(dense(result), operation(dense(left), dense(right)))
+
+
+def test_combined_patterns():
+    A, B = matrices_with_different_patterns()
+
+    union = CombinedPattern.get(A, B, 'union')
+    assert CombinedPattern.get(A, B, 'union') is union
+    assert union.num_nonzeros == 11
+    assert list(union.matrix_components_dict.keys()) == [('x', 'x'), ('x', 'y'), ('y', 'x')]
+
+    intersection = CombinedPattern.get(A, B, 'intersection')
+    assert intersection.num_nonzeros == 1
+    assert list(intersection.matrix_components_dict.keys()) == [('x', 'x')]
+    assert np.array_equal((A * B).vals.data, [1. * (20. + 40.)])
+
+    with pytest.raises(ValueError):
+        CombinedPattern(A, B, 'difference')
+
+
+def test_matrices_with_different_vectors_use_scipy():
+    A, B = matrices_with_different_patterns()
+
+    vector_components_dict = VectorComponentsDict()
+    vector_components_dict['z'] = dict(shape=(5,))
+    matrix_components_dict = MatrixComponentsDict(vector_components_dict, vector_components_dict)
+    matrix_components_dict['z', 'z'] = dict(rows=np.array([4]), cols=np.array([0]))
+    C = Matrix(matrix_components_dict)
+    C.allocate(data=np.array([1.]))
+
+    result = A + C
+    assert not isinstance(result, Matrix)
+    assert np.array_equal(result.toarray(), dense(A) + dense(C))
+
+
+def block_matrix(keys):
+    vector_components_dict = VectorComponentsDict()
+    vector_components_dict['f'] = dict(shape=(10,))
+    vector_components_dict['g'] = dict(shape=(10,))
+
+    matrix_components_dict = MatrixComponentsDict(vector_components_dict, vector_components_dict)
+    for key in keys:
+        matrix_components_dict[key] = dict(shape=(10, 10))
+
+    matrix = Matrix(matrix_components_dict)
+    matrix.allocate(data=np.random.default_rng(0).random(matrix.num_nonzeros))
+    return matrix
+
+
+def test_operator_in_csr_order():
+    A = block_matrix([('f', 'f'), ('g', 'f')])
+    operator = A.operator()
+
+    assert operator.format == 'csr'
+    assert operator.data is A.vals.data
+    assert A.operator() is operator
+
+    x = np.arange(20.)
+    A.vals.data *= 2.
+    assert np.allclose(A @ x, dense(A) @ x)
+
+    # A new data array is picked up
+    A.vals.data = np.ones(A.num_nonzeros)
+    assert A.operator().data is A.vals.data
+
+
+def test_operator_refresh():
+    # Each submatrix is a long run of nonzeros in CSR order, but the submatrices are not in row order
+    A = block_matrix([('g', 'f'), ('f', 'f')])
+    operator = A.operator()
+    assert operator.format == 'csr'
+    assert operator.data is not A.vals.data
+
+    x = np.arange(20.)
+    expected = dense(A) @ x
+    A.vals.data *= 2.
+    assert np.allclose(A.operator(refresh=False) @ x, expected)
+    assert np.allclose(A @ x, 2. * expected)
+    assert A.operator() is operator
+
+    # A complex dtype rebuilds the operator
+    A.vals.data = A.vals.data * 1j
+    assert A.operator().dtype == np.complex128
+    assert np.allclose(A @ x, 2j * expected)
+
+
+def test_operator_of_scattered_nonzeros():
+    vector_components_dict = VectorComponentsDict()
+    vector_components_dict['x'] = dict(shape=(50,))
+    matrix_components_dict = MatrixComponentsDict(vector_components_dict, vector_components_dict)
+    rng = np.random.default_rng(0)
+    matrix_components_dict['x', 'x'] = dict(rows=rng.integers(0, 50, 200), cols=rng.integers(0, 50, 200))
+
+    A = Matrix(matrix_components_dict)
+    A.allocate(data=rng.random(200))
+    assert A.operator().data is A.vals.data
+
+    x = rng.random(50)
+    reference = np.zeros(50)
+    np.add.at(reference, A.rows, A.vals.data * x[A.cols])
+    assert np.allclose(A @ x, reference)
+
+
+def test_matrix_products():
+    A = block_matrix([('g', 'f'), ('f', 'f'), ('g', 'g')])
+    B = block_matrix([('f', 'g'), ('g', 'g')])
+
+    assert np.allclose((A @ B).toarray(), dense(A) @ dense(B))
+    for standard_format in (COOMatrix, CSRMatrix, CSCMatrix):
+        assert np.allclose((A @ standard_format(B)).toarray(), dense(A) @ dense(B))
+
+
+@pytest.mark.parametrize('standard_format', [COOMatrix, CSRMatrix, CSCMatrix])
+def test_standard_format_operators(standard_format):
+    A = block_matrix([('g', 'f'), ('f', 'f')])
+    standard_matrix = standard_format(A)
+    operator = standard_matrix.operator()
+
+    assert np.allclose(operator.toarray(), dense(A))
+
+    # The values are updated in place, so the operator stays up to date
+    A.vals.data *= 3.
+    standard_matrix.update_bottom_up()
+    assert standard_matrix.operator() is operator
+    assert np.allclose(operator.toarray(), dense(A))
@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from array_manager.api import VectorComponentsDict, Vector, MatrixComponentsDict, Matrix, BlockMatrix
+
+
+def matrix_components_dict():
+    vector_components_dict1 = VectorComponentsDict()
+    vector_components_dict1['f'] = dict(shape=(3,))
+    vector_components_dict2 = VectorComponentsDict()
+    vector_components_dict2['x'] = dict(shape=(2,))
+
+    matrix_components_dict = MatrixComponentsDict(vector_components_dict1, vector_components_dict2)
+    matrix_components_dict['f', 'x'] = dict(vals=np.arange(6.).reshape(3, 2))
+    return matrix_components_dict
+
+
+@pytest.mark.parametrize('mode', ['r+', 'r', 'c', None])
+def test_vector_is_reopened_without_copy(vector_components_dict, tmp_path, mode):
+    filename = str(tmp_path / 'x.vec')
+    x = Vector(vector_components_dict())
+    x.allocate(filename=filename, setup_views=True)
+    assert np.array_equal(x.data, [1., 2., 0., 0., 0.])
+    x['a'] = [3., 4.]
+    x.data.flush()
+
+    y = Vector(vector_components_dict())
+    y.allocate(filename=filename, mode=mode, setup_views=True)
+    assert isinstance(y.data, np.memmap)
+    assert np.array_equal(y.data, [3., 4., 0., 0., 0.])
+
+
+@pytest.mark.parametrize('mode', ['r+', 'r', 'c', None])
+def test_matrix_is_reopened_without_copy(tmp_path, mode):
+    filename = str(tmp_path / 'A.vec')
+    A = Matrix(matrix_components_dict())
+    A.allocate(filename=filename)
+
+    # A new file starts from the vals of the submatrices
+    assert isinstance(A.vals.data, np.memmap)
+    assert np.array_equal(A.vals.data, np.arange(6.))
+
+    A.vals.data[:] = -1.
+    A.vals.data.flush()
+
+    # The saved values are not overwritten by the vals of the submatrices
+    B = Matrix(matrix_components_dict())
+    B.allocate(filename=filename, mode=mode)
+    assert isinstance(B.vals.data, np.memmap)
+    assert np.array_equal(B.vals.data, np.full(6, -1.))
+
+
+def test_block_matrix_is_reopened_without_copy(tmp_path):
+    filename = str(tmp_path / 'block.vec')
+
+    def block_matrix():
+        matrix1 = Matrix(matrix_components_dict())
+        matrix2 = Matrix(matrix_components_dict())
+        return BlockMatrix([[matrix1], [matrix2]]), matrix1, matrix2
+
+    block, matrix1, matrix2 = block_matrix()
+    block.allocate(filename=filename)
+    assert isinstance(block.vals.data, np.memmap)
+    assert np.array_equal(matrix2.vals.data, np.arange(6.))
+
+    matrix2.vals.data[:] = 7.
+    block.vals.data.flush()
+
+    block, matrix1, matrix2 = block_matrix()
+    block.allocate(filename=filename, mode='r+')
+    assert np.array_equal(matrix1.vals.data, np.arange(6.))
+    assert np.array_equal(matrix2.vals.data, np.full(6, 7.))
+    assert np.shares_memory(matrix2.vals.data, block.vals.data)
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from array_manager.api import Vector, MultiVector, MatrixComponentsDict, Matrix
+
+
+@pytest.mark.parametrize('order', ['C', 'F'])
+def test_allocate_and_views(vector_components_dict, order):
+    multi_vector = MultiVector(vector_components_dict(), 4, order=order)
+    multi_vector.allocate(setup_views=True)
+
+    assert multi_vector.data.shape == (4, 5)
+    assert np.array_equal(multi_vector.data[:, :2], np.tile([1., 2.], (4, 1)))
+    assert multi_vector['b'].shape == (4, 3)
+
+    multi_vector['b'] = 3.
+    assert np.all(multi_vector.data[:, 2:] == 3.)
+
+
+def test_vectors_are_views(vector_components_dict):
+    layout = vector_components_dict()
+    multi_vector = MultiVector(layout, 3)
+    multi_vector.allocate(data=np.zeros((3, 5)))
+
+    vector = multi_vector.get_vector(1, setup_views=True)
+    vector['a'] = [5., 6.]
+    assert np.array_equal(multi_vector.data[1, :2], [5., 6.])
+
+    other = Vector(layout)
+    other.allocate(data=np.arange(5.))
+    multi_vector.set_vector(2, other)
+    assert np.array_equal(multi_vector.data[2], np.arange(5.))
+
+    with pytest.raises(ValueError):
+        multi_vector.allocate(data=np.zeros((2, 5)))
+
+
+def test_component_reductions(vector_components_dict):
+    multi_vector = MultiVector(vector_components_dict(), 2)
+    multi_vector.allocate(data=np.arange(10.).reshape(2, 5))
+
+    sums = multi_vector.component_sums()
+    assert np.array_equal(sums['a'], [1., 11.])
+    assert np.array_equal(sums['b'], [9., 24.])
+    assert np.array_equal(multi_vector.component_max_abs(as_dict=False), [[1., 4.], [6., 9.]])
+
+
+def test_matrix_product(vector_components_dict):
+    layout = vector_components_dict()
+    matrix_components_dict = MatrixComponentsDict(layout, layout)
+    matrix_components_dict['a', 'b'] = dict(shape=(2, 3))
+    matrix_components_dict['b', 'b'] = dict(rows=np.array([0, 2]), cols=np.array([1, 0]))
+    matrix = Matrix(matrix_components_dict)
+    matrix.allocate(data=np.arange(1., 9.))
+
+    multi_vector = MultiVector(layout, 3, order='F')
+    multi_vector.allocate(data=np.asfortranarray(np.arange(15.).reshape(3, 5)))
+
+    product = matrix @ multi_vector
+    assert isinstance(product, MultiVector)
+    dense = np.zeros(matrix.dense_shape)
+    np.add.at(dense, (matrix.rows, matrix.cols), matrix.vals.data)
+    assert np.allclose(product.data, multi_vector.data @ dense.T)
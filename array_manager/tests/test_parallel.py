@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from array_manager.api import VectorComponentsDict, Vector
+from array_manager.utils import parallel
+
+
+def vector(data):
+    vector_components_dict = VectorComponentsDict(dtype=np.asarray(data).dtype)
+    vector_components_dict['a'] = dict(shape=(len(data),))
+    vector = Vector(vector_components_dict)
+    vector.allocate(data=np.array(data))
+    return vector
+
+
+def test_configuration():
+    previous = parallel.get_config()
+
+    with parallel.parallel(num_threads=3, threshold=10):
+        assert parallel.get_config()['enabled']
+        assert parallel.use_threads(10) and not parallel.use_threads(9)
+    assert parallel.get_config() == previous
+
+    with pytest.raises(ValueError):
+        parallel.configure(chunk_size=0)
+    parallel.configure(**previous)
+
+
+def test_chunked_kernels():
+    rng = np.random.default_rng(0)
+    x = vector(rng.random(1000))
+    y = vector(rng.random(1000))
+    expected_norm = np.linalg.norm(x.data)
+    expected_axpy = x.data + 2. * y.data
+    expected_product = x.data * y.data
+
+    with parallel.parallel(num_threads=4, threshold=0, chunk_size=64):
+        assert np.isclose(x.norm(), expected_norm)
+        assert np.allclose(x.axpy(2., y).data, expected_axpy)
+        x *= y
+
+    assert np.allclose(x.data, expected_product)
+
+
+def test_complex_norm():
+    z = vector(np.array([3j, 4.]))
+    with parallel.parallel(num_threads=2, threshold=0, chunk_size=1):
+        assert z.norm() == 5.
@@ -0,0 +1,50 @@
+import pickle
+
+import numpy as np
+
+from array_manager.api import Vector, MatrixComponentsDict, Matrix
+from array_manager.utils.shared_memory import SharedArray
+
+
+def test_shared_array():
+    shared_array = SharedArray(4, dtype=np.float32)
+    shared_array.array[:] = 1.
+
+    attached = pickle.loads(pickle.dumps(shared_array))
+    assert not attached.owner
+    assert attached.name == shared_array.name
+    attached.array[0] = 5.
+    assert np.array_equal(shared_array.array, [5., 1., 1., 1.])
+
+    attached.close()
+    shared_array.close()
+
+
+def test_unpickled_vector_shares_the_data(vector_components_dict):
+    x = Vector(vector_components_dict())
+    x.allocate(setup_views=True, shared_memory=True)
+    assert np.array_equal(x.data, [1., 2., 0., 0., 0.])
+
+    y = pickle.loads(pickle.dumps(x))
+    y['b'] = 7.
+    assert np.array_equal(x['b'], [7., 7., 7.])
+
+    y.release()
+    x.release()
+    assert x.shared_array is None
+
+
+def test_shared_matrix_values(vector_components_dict):
+    layout = vector_components_dict()
+    matrix_components_dict = MatrixComponentsDict(layout, layout)
+    matrix_components_dict['a', 'b'] = dict(shape=(2, 3))
+    matrix = Matrix(matrix_components_dict)
+    matrix.allocate(shared_memory=True)
+
+    assert matrix.vals.shared_array is not None
+    vals = pickle.loads(pickle.dumps(matrix.vals))
+    vals.data[:] = 2.
+    assert np.all(matrix.vals.data == 2.)
+
+    vals.release()
+    matrix.vals.release()
@@ -0,0 +1,115 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from array_manager.api import VectorComponentsDict, MatrixComponentsDict, Matrix, COOMatrix, CSRMatrix, CSCMatrix
+from array_manager.core.native_formats.sparsity_pattern import SparsityPattern
+from array_manager.utils.index_dtype import get_index_dtype
+
+
+def matrix_components_dict():
+    outputs = VectorComponentsDict()
+    outputs['f'] = dict(shape=(2,))
+    outputs['g'] = dict(shape=(3,))
+    inputs = VectorComponentsDict()
+    inputs['x'] = dict(shape=(2,))
+    inputs['y'] = dict(shape=(2,))
+
+    matrix_components_dict = MatrixComponentsDict(outputs, inputs)
+    # Dense, COO, CSR and CSC submatrices
+    matrix_components_dict['f', 'x'] = dict()
+    matrix_components_dict['g', 'x'] = dict(rows=np.array([2, 0]), cols=np.array([1, 1]))
+    matrix_components_dict['f', 'y'] = dict(cols=np.array([1, 0, 1]), ind_ptr=np.array([0, 1, 3]))
+    matrix_components_dict['g', 'y'] = dict(rows=np.array([1, 2]), ind_ptr=np.array([0, 0, 2]))
+    return matrix_components_dict
+
+
+def test_global_indices():
+    matrix = Matrix(matrix_components_dict())
+
+    assert np.array_equal(matrix.rows, [0, 0, 1, 1, 4, 2, 0, 1, 1, 3, 4])
+    assert np.array_equal(matrix.cols, [0, 1, 0, 1, 1, 1, 3, 2, 3, 3, 3])
+    assert matrix.dense_shape == (5, 4)
+    assert matrix.num_nonzeros == 11
+
+
+def test_index_dtype():
+    assert get_index_dtype((5, 4), 11) == np.int32
+    assert get_index_dtype((2 ** 31, 4)) == np.int64
+    assert get_index_dtype((5, 4), 2 ** 31) == np.int64
+
+    matrix = Matrix(matrix_components_dict())
+    assert matrix.index_dtype == np.int32
+    assert matrix.rows.dtype == np.int32 and matrix.cols.dtype == np.int32
+
+    matrix.allocate(data=np.arange(1., 12.))
+    dense = np.zeros(matrix.dense_shape)
+    np.add.at(dense, (matrix.rows, matrix.cols), matrix.vals.data)
+    for standard_format in (COOMatrix, CSRMatrix, CSCMatrix):
+        standard_matrix = standard_format(matrix)
+        assert standard_matrix.index_dtype == np.int32
+        indices = standard_matrix.cols if standard_format is CSRMatrix else standard_matrix.rows
+        assert indices.dtype == np.int32
+        assert np.array_equal(standard_matrix.get_std_array().toarray(), dense)
+
+
+def test_pattern_is_shared():
+    dictionary = matrix_components_dict()
+    matrix1 = Matrix(dictionary)
+    matrix2 = Matrix(dictionary)
+
+    assert dictionary.frozen
+    assert matrix1.sparsity_pattern is matrix2.sparsity_pattern
+    assert matrix1.vals.vector_components_dict is matrix2.vals.vector_components_dict
+    assert matrix1.layout is dictionary.freeze()
+
+    # The shared index arrays are read-only
+    with pytest.raises(ValueError):
+        matrix1.rows[0] = 1
+
+
+def test_vector_dictionaries_are_not_frozen():
+    dictionary = matrix_components_dict()
+    outputs = dictionary.vector_components_dict1
+    matrix1 = Matrix(dictionary)
+    assert not outputs.frozen and not dictionary.vector_components_dict2.frozen
+
+    # The matrix keeps the layout of the vectors it was built with
+    outputs['h'] = dict(shape=(1,))
+    assert matrix1.dense_shape == (5, 4)
+    assert matrix1.layout is dictionary.freeze()
+
+    with pytest.raises(TypeError):
+        dictionary['h', 'x'] = dict()
+
+    # Matrices built after the vector changed do not have the same vectors as matrix1
+    other = MatrixComponentsDict(outputs, dictionary.vector_components_dict2)
+    other['h', 'x'] = dict()
+    matrix2 = Matrix(other)
+    assert not matrix1.has_same_vectors(matrix2)
+    assert matrix2.dense_shape == (6, 4)
+
+
+def test_pattern_equality_and_pickling():
+    pattern = matrix_components_dict().sparsity_pattern
+    other = matrix_components_dict().sparsity_pattern
+
+    assert pattern is not other
+    assert pattern == other and hash(pattern) == hash(other)
+    assert pattern != pattern.transpose()
+
+    unpickled = pickle.loads(pickle.dumps(pattern))
+    assert unpickled == pattern
+    assert np.array_equal(unpickled.rows, pattern.rows)
+    assert not unpickled.rows.flags.writeable
+
+
+def test_transpose():
+    pattern = matrix_components_dict().sparsity_pattern
+    transpose = pattern.transpose()
+
+    assert isinstance(transpose, SparsityPattern)
+    assert np.shares_memory(transpose.rows, pattern.cols) and np.shares_memory(transpose.cols, pattern.rows)
+    assert transpose.dense_shape == (4, 5)
+    assert transpose.transpose() is pattern
@@ -0,0 +1,53 @@
+import numpy as np
+
+from array_manager.api import VectorComponentsDict, Vector
+from array_manager.core.native_formats.sub_vector import SubVector
+
+
+def geometry_vector():
+    vector_components_dict = VectorComponentsDict()
+    vector_components_dict['wing_span'] = dict(shape=(2,))
+    vector_components_dict['tail_span'] = dict(shape=(1,))
+    vector_components_dict['wing_chord'] = dict(shape=(3,))
+
+    vector = Vector(vector_components_dict)
+    vector.allocate(data=np.arange(6.), setup_views=True)
+    return vector
+
+
+def test_contiguous_selection_is_a_view():
+    vector = geometry_vector()
+    sub = vector.subvector(['wing_span', 'tail_span'])
+
+    assert isinstance(sub, np.ndarray)
+    assert np.array_equal(sub, [0., 1., 2.])
+    sub[:] = -1.
+    assert np.array_equal(vector.data, [-1., -1., -1., 3., 4., 5.])
+
+
+def test_non_contiguous_selection():
+    vector = geometry_vector()
+    sub = vector.subvector('wing_*')
+
+    assert isinstance(sub, SubVector)
+    assert np.array_equal(sub[:], [0., 1., 3., 4., 5.])
+    sub[:] = 10.
+    assert np.array_equal(vector.data, [10., 10., 2., 10., 10., 10.])
+
+
+def test_generator_selection():
+    vector = geometry_vector()
+    sub = vector.subvector(name for name in ['wing_span', 'wing_chord'])
+    assert np.array_equal(sub[:], [0., 1., 3., 4., 5.])
+
+    # The selection cached for the generator is not empty either
+    assert np.array_equal(vector.subvector(['wing_span', 'wing_chord'])[:], [0., 1., 3., 4., 5.])
+    assert np.array_equal(vector.subvector(iter(['tail_span'])), [2.])
+
+
+def test_selections_are_cached():
+    vector_components_dict = geometry_vector().vector_components_dict
+    selection = vector_components_dict.get_selection(['wing_span', 'wing_chord'])
+
+    assert vector_components_dict.get_selection(('wing_span', 'wing_chord')) is selection
+    assert not selection.flags.writeable
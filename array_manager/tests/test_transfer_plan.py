@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from array_manager.api import VectorComponentsDict, Vector, MultiVector, TransferPlan
+
+
+def layouts():
+    design_variables = VectorComponentsDict()
+    design_variables['span'] = dict(shape=(1,))
+    design_variables['chord'] = dict(shape=(3,))
+    design_variables['twist'] = dict(shape=(3,))
+
+    inputs = VectorComponentsDict()
+    inputs['mach'] = dict(shape=(1,))
+    inputs['chord'] = dict(shape=(3,))
+    inputs['twist'] = dict(shape=(3,))
+    inputs['span'] = dict(shape=(1,))
+    return design_variables, inputs
+
+
+def test_transfer():
+    design_variables, inputs = layouts()
+    plan = TransferPlan(design_variables, inputs)
+
+    assert plan.names == ('chord', 'twist', 'span')
+    # chord and twist are consecutive in both layouts, so they are merged into one run
+    assert len(plan.runs) == 2
+
+    src = Vector(design_variables)
+    src.allocate(data=np.arange(1., 8.))
+    dst = Vector(inputs)
+    dst.allocate(data=np.zeros(8))
+
+    assert plan.transfer(src, dst) is dst
+    assert np.array_equal(dst.data, [0., 2., 3., 4., 5., 6., 7., 1.])
+
+    plan.transfer(src, dst, accumulate=True)
+    assert np.array_equal(dst.data, [0., 4., 6., 8., 10., 12., 14., 2.])
+
+
+def test_transfer_with_indices():
+    design_variables, inputs = layouts()
+    plan = TransferPlan(design_variables, inputs, names=['span', 'twist'])
+
+    # Short runs are transferred with one fancy-index operation
+    assert plan.names == ('twist', 'span')
+    assert plan.src_indices is not None
+
+    dst = plan.transfer(np.arange(1., 8.), np.zeros(8))
+    assert np.array_equal(dst, [0., 0., 0., 0., 5., 6., 7., 1.])
+
+
+def test_reverse_and_multi_vectors():
+    design_variables, inputs = layouts()
+    plan = TransferPlan(design_variables, inputs).reverse()
+
+    src = MultiVector(inputs, 2)
+    src.allocate(data=np.arange(16.).reshape(2, 8))
+    dst = MultiVector(design_variables, 2)
+    dst.allocate(data=np.zeros((2, 7)))
+
+    plan.transfer(src, dst)
+    assert np.array_equal(dst.data, [[7., 1., 2., 3., 4., 5., 6.], [15., 9., 10., 11., 12., 13., 14.]])
+
+
+def test_invalid_transfers():
+    design_variables, inputs = layouts()
+
+    with pytest.raises(KeyError):
+        TransferPlan(design_variables, inputs, names=['mach'])
+
+    other = VectorComponentsDict()
+    other['chord'] = dict(shape=(2,))
+    with pytest.raises(ValueError):
+        TransferPlan(design_variables, other)
+
+    with pytest.raises(ValueError):
+        TransferPlan(design_variables, inputs).transfer(np.zeros(6), np.zeros(8))
@@ -0,0 +1,202 @@
+import numpy as np
+import pytest
+
+from array_manager.api import VectorComponentsDict, Vector, BufferPool
+
+
+def allocated_vector(vector_components_dict, data):
+    vector = Vector(vector_components_dict)
+    vector.allocate(data=np.asarray(data), setup_views=True)
+    return vector
+
+
+def test_operations_do_not_freeze_the_dictionaries(vector_components_dict):
+    vector_components_dict1 = vector_components_dict()
+    vector_components_dict2 = vector_components_dict()
+    x = allocated_vector(vector_components_dict1, np.arange(5.))
+    y = allocated_vector(vector_components_dict2, np.ones(5))
+
+    z = x + y
+    assert np.array_equal(z.data, np.arange(5.) + 1.)
+    assert not vector_components_dict1.frozen
+    assert not vector_components_dict2.frozen
+
+    # Subvectors can still be added to both dictionaries
+    vector_components_dict1['c'] = dict(shape=(1,))
+    vector_components_dict2['c'] = dict(shape=(1,))
+
+
+def test_frozen_layouts_are_compared(vector_components_dict):
+    vector_components_dict1 = vector_components_dict()
+    vector_components_dict2 = VectorComponentsDict()
+    vector_components_dict2['b'] = dict(shape=(3,))
+    vector_components_dict2['a'] = dict(shape=(2,))
+    x = allocated_vector(vector_components_dict1, np.arange(5.))
+    y = allocated_vector(vector_components_dict2, np.ones(5))
+
+    # Same size, but different layouts once both dictionaries are frozen
+    x + y
+    vector_components_dict1.freeze()
+    vector_components_dict2.freeze()
+    with pytest.raises(TypeError):
+        x + y
+
+    assert np.array_equal((x + allocated_vector(vector_components_dict(), np.ones(5))).data, np.arange(5.) + 1.)
+
+
+def test_operations_check_sizes(vector_components_dict):
+    x = allocated_vector(vector_components_dict(), np.arange(5.))
+
+    other_vector_components_dict = VectorComponentsDict()
+    other_vector_components_dict['a'] = dict(shape=(3,))
+    with pytest.raises(TypeError):
+        x + allocated_vector(other_vector_components_dict, np.ones(3))
+    with pytest.raises(TypeError):
+        x + np.ones(3)
+
+
+@pytest.mark.parametrize('scalar', [1j, np.complex64(2 + 1j), np.int32(3), np.float32(0.5), 2, 2.5])
+def test_scalar_operations(scalar):
+    complex_vector_components_dict = VectorComponentsDict(dtype=complex)
+    complex_vector_components_dict['a'] = dict(shape=(3,))
+    x = allocated_vector(complex_vector_components_dict, np.arange(3.) + 1j)
+
+    assert np.array_equal((x * scalar).data, x.data * scalar)
+    assert np.array_equal((x + scalar).data, x.data + scalar)
+    assert np.array_equal((scalar * x).data, scalar * x.data)
+
+    expected = x.data * scalar
+    x *= scalar
+    assert np.array_equal(x.data, expected)
+
+
+def test_invalid_operand(vector_components_dict):
+    x = allocated_vector(vector_components_dict(), np.arange(5.))
+    with pytest.raises(TypeError):
+        x + 'a'
+
+
+def test_out_methods(vector_components_dict):
+    x = allocated_vector(vector_components_dict(), np.arange(5.))
+    y = allocated_vector(vector_components_dict(), np.full(5, 2.))
+    out = allocated_vector(vector_components_dict(), np.zeros(5))
+
+    assert x.add(y, out=out) is out
+    assert np.array_equal(out.data, np.arange(5.) + 2.)
+    assert np.array_equal(x.sub(1.).data, np.arange(5.) - 1.)
+    assert np.array_equal(x.mul(y).data, np.arange(5.) * 2.)
+    assert np.array_equal(x.div(np.full(5, 4.)).data, np.arange(5.) / 4.)
+
+    with pytest.raises(TypeError):
+        x.add(y, out=np.zeros(5))
+
+
+@pytest.mark.parametrize('out', ['new', 'self', 'x'])
+def test_axpy_and_axpby(vector_components_dict, out):
+    def operands():
+        y = allocated_vector(vector_components_dict(), np.arange(5.))
+        x = allocated_vector(vector_components_dict(), np.full(5, 2.))
+        return y, x, dict(new=None, self=y, x=x)[out]
+
+    y, x, out_vector = operands()
+    assert np.array_equal(y.axpy(3., x, out=out_vector).data, np.arange(5.) + 6.)
+
+    y, x, out_vector = operands()
+    assert np.array_equal(y.axpby(3., x, 0.5, out=out_vector).data, 0.5 * np.arange(5.) + 6.)
+
+
+@pytest.mark.parametrize('pool', [None, BufferPool()])
+@pytest.mark.parametrize('alpha', [1j, np.complex128(2 - 1j), np.float32(0.5), np.float64(3.), 2])
+def test_out_methods_with_scalars(vector_components_dict, alpha, pool):
+    y = Vector(vector_components_dict(), pool=pool)
+    y.allocate(data=np.arange(5.))
+    x = Vector(vector_components_dict(), pool=pool)
+    x.allocate(data=np.full(5, 2.))
+
+    for result, expected in (
+            (y.axpy(alpha, x), alpha * x.data + y.data),
+            (y.axpby(alpha, x, np.float64(0.5)), alpha * x.data + 0.5 * y.data),
+            (y.axpby(2., x, alpha), 2. * x.data + alpha * y.data),
+            (y.add(alpha), y.data + alpha),
+            (y.mul(alpha), y.data * alpha),
+            (y.div(alpha), y.data / alpha)):
+        assert result.data.dtype == expected.dtype
+        assert np.allclose(result.data, expected)
+
+    # A float out cannot hold a complex result
+    if np.iscomplexobj(alpha):
+        with pytest.raises(TypeError):
+            y.axpy(alpha, x, out=y)
+
+
+def test_concatenate_split_and_append():
+    states = VectorComponentsDict()
+    states['u'] = dict(shape=(2,))
+    controls = VectorComponentsDict()
+    controls['c'] = dict(shape=(3,))
+    parameters = VectorComponentsDict()
+    parameters['p'] = dict(shape=(1,))
+
+    union = VectorComponentsDict.concatenate(states, controls, parameters)
+    assert list(union.keys()) == ['u', 'c', 'p']
+    assert states['u']['start_index'] == 0 and controls['c']['start_index'] == 0
+
+    parent = allocated_vector(union, np.arange(6.))
+    u, c, p = parent.split()
+    assert np.shares_memory(c.data, parent.data)
+    assert np.array_equal(c.data, [2., 3., 4.])
+
+    # Adjacent sub-vectors are appended without copying
+    uc = u.append(c)
+    assert np.shares_memory(uc.data, parent.data)
+    assert u.append(c) is uc
+    assert uc.append(p) is parent
+
+    # Other vectors are copied
+    copied = p.append(u)
+    assert not np.shares_memory(copied.data, parent.data)
+    assert np.array_equal(copied.data, [5., 0., 1.])
+    assert list(copied.vector_components_dict.keys()) == ['p', 'u']
+
+
+def test_component_reductions(vector_components_dict):
+    x = allocated_vector(vector_components_dict(), [3., -4., 1., -2., 2.])
+    y = allocated_vector(vector_components_dict(), np.ones(5))
+
+    assert x.component_sums() == dict(a=-1., b=1.)
+    assert np.array_equal(x.component_norms(as_dict=False), [5., 3.])
+    assert np.array_equal(x.component_norms(ord=1, as_dict=False), [7., 5.])
+    assert x.component_max_abs() == dict(a=4., b=2.)
+    assert x.component_dots(y) == dict(a=-1., b=1.)
+
+    with pytest.raises(TypeError):
+        x.component_dots(np.ones(3))
+
+
+def test_from_arrays():
+    x = Vector.from_arrays([np.arange(2), np.ones((2, 2)), 7.], ['a', 'b', 'c'])
+
+    assert x.data.dtype == np.float64
+    assert np.array_equal(x.data, [0., 1., 1., 1., 1., 1., 7.])
+    assert x['b'].shape == (2, 2)
+    assert x.vector_components_dict['c']['shape'] == ()
+
+    assert Vector.from_arrays([np.arange(3)], ['i']).data.dtype == np.int64
+    assert Vector.from_arrays([np.arange(3)], ['a'], dtype=complex).data.dtype == np.complex128
+
+    with pytest.raises(ValueError):
+        Vector.from_arrays([np.arange(3)], ['a', 'b'])
+
+
+def test_lazy_views(vector_components_dict):
+    x = Vector(vector_components_dict(), lazy_views=True)
+    x.allocate(data=np.arange(5.))
+
+    assert x.dict_ == {}
+    assert x['b'].shape == (3,)
+    assert x['b'] is x['b']
+    assert list(x.dict_) == ['b']
+
+    # Views of the previous data are dropped when the data is replaced
+    x.data = np.zeros(5)
+    assert np.array_equal(x['b'], np.zeros(3))
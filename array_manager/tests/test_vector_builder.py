@@ -0,0 +1,64 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from array_manager.api import Vector, VectorBuilder
+
+
+def pairs():
+    yield 'a', np.arange(3.)
+    yield 'b', np.ones((2, 2))
+    yield 'c', 5.
+
+
+def test_build_in_memory():
+    # The first chunk only holds 2 values, so the builder has to grow several times
+    builder = VectorBuilder(initial_capacity=2).extend(pairs())
+    assert builder.size == 8
+
+    vector = builder.build(setup_views=True)
+    assert np.array_equal(vector.data, [0., 1., 2., 1., 1., 1., 1., 5.])
+    assert list(vector.vector_components_dict.keys()) == ['a', 'b', 'c']
+    assert np.array_equal(vector['b'], np.ones((2, 2)))
+    assert vector['c'].shape == ()
+
+
+def test_single_chunk_is_not_copied():
+    builder = VectorBuilder(initial_capacity=16)
+    builder.add('a', np.arange(3.))
+    chunk = builder._chunks[0]
+
+    assert np.shares_memory(builder.build().data, chunk)
+
+
+def test_duplicate_names():
+    builder = VectorBuilder()
+    builder.add('a', np.zeros(2))
+    with pytest.raises(KeyError):
+        builder.add('a', np.zeros(2))
+
+
+@pytest.mark.parametrize('header_capacity', [1 << 20, 8])
+def test_build_into_a_file(tmp_path, header_capacity):
+    filename = str(tmp_path / 'x.vec')
+    builder = VectorBuilder(dtype=np.float32, filename=filename, header_capacity=header_capacity)
+    vector = builder.extend(pairs()).build(setup_views=True)
+
+    assert isinstance(vector.data, np.memmap)
+    assert vector.data.dtype == np.float32
+    assert np.array_equal(vector['a'], np.arange(3.))
+    assert np.array_equal(Vector.load(filename, mmap=False).data, vector.data)
+
+
+def test_from_iterables():
+    vector = VectorBuilder.from_iterable(pairs(), dtype=complex, setup_views=True)
+    assert vector.data.dtype == np.complex128
+    assert np.array_equal(vector['b'], np.ones((2, 2)))
+
+    async def async_pairs():
+        for pair in pairs():
+            yield pair
+
+    vector = asyncio.run(VectorBuilder.from_async_iterable(async_pairs()))
+    assert np.array_equal(vector.data, [0., 1., 2., 1., 1., 1., 1., 5.])
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from array_manager.api import VectorComponentsDict, Vector
+
+
+def components():
+    return [
+        ('x', dict(shape=(2,), vals=np.array([1., 2.]), upper=np.array([3., 4.]), lower=None, equals=None)),
+        ('free', dict(shape=(2, 2), vals=np.arange(4.).reshape(2, 2))),
+        ('y', dict(shape=(3,), upper=None, lower=np.zeros(3), equals=None)),
+        ('z', dict(shape=(1,), vals=np.array([5.]), upper=None, lower=None, equals=np.array([6.]))),
+        ('empty', dict(shape=(0,))),
+    ]
+
+
+def test_from_components_matches_setitem():
+    expected = VectorComponentsDict()
+    for key, component_dict in components():
+        expected[key] = component_dict
+
+    for given in (components(), dict(components()), iter(components())):
+        vector_components_dict = VectorComponentsDict.from_components(given)
+
+        assert list(vector_components_dict.keys()) == list(expected.keys())
+        assert vector_components_dict.vector_size == expected.vector_size == 10
+        for key, component_dict in expected.items():
+            for name in ('size', 'start_index', 'end_index'):
+                assert vector_components_dict[key][name] == component_dict[name]
+
+        # vals, upper and lower are only assembled in finalize(), on first access
+        assert not vector_components_dict._finalized
+        for name in ('vals', 'upper', 'lower'):
+            assert np.array_equal(getattr(vector_components_dict, name), getattr(expected, name))
+        assert vector_components_dict._finalized
+
+        vector = Vector(vector_components_dict)
+        vector.allocate(setup_views=True)
+        assert np.array_equal(vector.data, [1., 2., 0., 1., 2., 3., 0., 0., 0., 5.])
+        assert np.array_equal(vector['free'], np.arange(4.).reshape(2, 2))
+
+
+def test_vals_are_assembled_again_after_setitem():
+    vector_components_dict = VectorComponentsDict.from_components(components())
+    assert np.array_equal(vector_components_dict.upper, [3., 4., np.inf, np.inf, np.inf, 6.])
+
+    vector_components_dict['w'] = dict(shape=(2,), vals=np.array([7., 8.]), upper=np.ones(2), lower=None, equals=None)
+    assert np.array_equal(vector_components_dict.vals[-2:], [7., 8.])
+    assert np.array_equal(vector_components_dict.upper[-2:], [1., 1.])
+
+
+def test_from_components_checks_the_names():
+    with pytest.raises(KeyError):
+        VectorComponentsDict.from_components([('a', dict(shape=(1,))), ('a', dict(shape=(2,)))])
+
+    assert VectorComponentsDict.from_components([]).vector_size == 0
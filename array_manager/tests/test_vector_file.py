@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from array_manager.api import VectorComponentsDict, Vector
+
+
+def test_save_and_load(vector_components_dict, tmp_path):
+    filename = str(tmp_path / 'x.vec')
+    x = Vector(vector_components_dict())
+    x.allocate(data=np.arange(5.), setup_views=True)
+    x.save(filename)
+
+    for mmap in (True, False):
+        y = Vector.load(filename, mmap=mmap)
+        assert isinstance(y.data, np.memmap) == mmap
+        assert np.array_equal(y.data, x.data)
+        assert np.array_equal(y['b'], [2., 3., 4.])
+        assert list(y.vector_components_dict.keys()) == ['a', 'b']
+
+
+def test_load_checks_the_layout(vector_components_dict, tmp_path):
+    filename = str(tmp_path / 'x.vec')
+    x = Vector(vector_components_dict())
+    x.allocate(data=np.arange(5.))
+    x.save(filename)
+
+    assert np.array_equal(Vector.load(filename, vector_components_dict()).data, x.data)
+
+    other = VectorComponentsDict()
+    other['a'] = dict(shape=(5,))
+    with pytest.raises(ValueError):
+        Vector.load(filename, other)
+
+
+def test_load_modes(vector_components_dict, tmp_path):
+    filename = str(tmp_path / 'x.vec')
+    x = Vector(vector_components_dict(complex))
+    x.allocate(data=np.arange(5.) * 1j)
+    x.save(filename)
+
+    # Copy-on-write: the file is not modified
+    y = Vector.load(filename, mode='c')
+    y['a'] = 0.
+    assert np.array_equal(Vector.load(filename, mmap=False).data, x.data)
+
+    # Read/write: changes are written to the file
+    z = Vector.load(filename, mode='r+')
+    assert z.dtype == np.complex128
+    z['a'] = 5.
+    z.data.flush()
+    assert np.array_equal(Vector.load(filename, mmap=False)['a'], [5., 5.])
+
+
+def test_allocate_with_a_file(vector_components_dict, tmp_path):
+    filename = str(tmp_path / 'x.vec')
+    x = Vector(vector_components_dict())
+    x.allocate(filename=filename, setup_views=True)
+
+    # A new file starts from the initial values of the layout
+    assert isinstance(x.data, np.memmap)
+    assert np.array_equal(x.data, [1., 2., 0., 0., 0.])
+
+    x['b'] = 3.
+    x.save(filename)
+    assert np.array_equal(Vector.load(filename, mmap=False)['b'], np.full(3, 3.))
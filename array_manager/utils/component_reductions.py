@@ -0,0 +1,81 @@
+"""Define vectorized reductions over the components of a vector"""
+import numpy as np
+
+
+def reduce_components(ufunc, data, index, empty_value=0):
+    """
+    Reduce each component of the data with the given ufunc in one np.ufunc.reduceat() call over the starting indices of the components.
+
+    Parameters
+    ----------
+    ufunc : np.ufunc
+        Binary ufunc used for the reduction, e.g., np.add or np.maximum
+    data : np.ndarray
+        Concatenated vector, or stacked vectors of shape (num_vectors, vector_size)
+    index : ComponentsIndex
+        Index of the components of the vector
+    empty_value : scalar
+        Result for components of size 0 (reduceat() would return the next entry instead)
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape data.shape[:-1] + (number of components,)
+    """
+    nonempty = index.sizes > 0
+    if np.all(nonempty):
+        return ufunc.reduceat(data, index.start_indices, axis=-1)
+
+    result = np.full(data.shape[:-1] + (len(index.sizes),), empty_value, dtype=ufunc(data[..., :0], data[..., :0]).dtype)
+    if np.any(nonempty):
+        result[..., nonempty] = ufunc.reduceat(data, index.start_indices[nonempty], axis=-1)
+
+    return result
+
+
+def component_sums(data, index):
+    """
+    Return the sum of each component.
+    """
+    return reduce_components(np.add, data, index)
+
+
+def component_norms(data, index, ord=2):
+    """
+    Return the norm of each component; ord can be 1, 2 or np.inf.
+    """
+    if ord == 2:
+        squares = data.real * data.real + data.imag * data.imag if np.iscomplexobj(data) else data * data
+        return np.sqrt(reduce_components(np.add, squares, index))
+
+    elif ord == 1:
+        return reduce_components(np.add, np.abs(data), index)
+
+    elif ord == np.inf:
+        return reduce_components(np.maximum, np.abs(data), index)
+
+    raise ValueError('ord should be 1, 2 or np.inf, {} was given'.format(ord))
+
+
+def component_max_abs(data, index):
+    """
+    Return the maximum absolute value of each component (0 for components of size 0).
+    """
+    return reduce_components(np.maximum, np.abs(data), index)
+
+
+def component_dots(data1, data2, index):
+    """
+    Return the dot product of each component of data1 with the same component of data2 (without complex conjugation).
+    """
+    return reduce_components(np.add, data1 * data2, index)
+
+
+def to_dict(values, index):
+    """
+    Return a dictionary mapping the name of each component to its reduced value(s).
+    """
+    if values.ndim == 1:
+        return {key: values[i] for i, key in enumerate(index.keys)}
+
+    return {key: values[..., i] for i, key in enumerate(index.keys)}
@@ -0,0 +1,22 @@
+"""Define the get_index_dtype function"""
+import numpy as np
+
+
+_INT32_MAX = np.iinfo(np.int32).max
+
+
+def get_index_dtype(dense_shape, num_nonzeros=0):
+    """
+    Return the dtype of the index arrays (rows, cols, ind_ptr and sorting permutations) of a matrix.
+    int32 is used when all the row/col indices and nonzero positions fit, which halves the memory of the indices compared to int64.
+    This is the same rule as scipy.sparse, so index arrays of this dtype are passed to scipy without being cast or copied.
+
+    Parameters
+    ----------
+    dense_shape : tuple
+        Shape of the matrix
+    num_nonzeros : int
+        Number of nonzeros of the matrix (largest value of ind_ptr)
+    """
+    max_value = max(tuple(int(n) for n in dense_shape) + (int(num_nonzeros),))
+    return np.dtype(np.int32) if max_value <= _INT32_MAX else np.dtype(np.int64)
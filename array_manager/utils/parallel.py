@@ -0,0 +1,152 @@
+"""Multithreaded, chunked execution of elementwise operations and reductions on large 1-D arrays"""
+import os
+import numpy as np
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+
+# NumPy releases the GIL inside ufunc loops and BLAS calls, so threads run them on separate cores.
+# The parallel mode is off by default; arrays smaller than threshold are always processed serially.
+_config = dict(
+    enabled=False,
+    num_threads=os.cpu_count() or 1,
+    threshold=1 << 20,
+    chunk_size=1 << 16,
+)
+
+_executor = None
+_executor_threads = 0
+
+
+def configure(enabled=None, num_threads=None, threshold=None, chunk_size=None):
+    """
+    Change the parallel execution settings for the whole process; arguments that are None are left unchanged.
+
+    Parameters
+    ----------
+    enabled : bool
+        Run large in-place operations, axpy and reductions of Vector objects on a thread pool
+    num_threads : int
+        Number of threads (the number of CPUs by default)
+    threshold : int
+        Arrays with fewer entries than this are processed serially
+    chunk_size : int
+        Number of entries processed at a time by each thread, chosen so that a chunk of each operand stays in cache
+    """
+    for key, value in dict(enabled=enabled, num_threads=num_threads, threshold=threshold, chunk_size=chunk_size).items():
+        if value is not None:
+            _config[key] = value
+
+    if _config['num_threads'] < 1 or _config['chunk_size'] < 1:
+        raise ValueError('num_threads and chunk_size should be positive integers')
+
+
+def get_config():
+    """
+    Return a copy of the current parallel execution settings.
+    """
+    return dict(_config)
+
+
+@contextmanager
+def parallel(num_threads=None, threshold=None, chunk_size=None):
+    """
+    Context manager that turns the parallel mode on (with the given settings) and restores the previous settings on exit.
+    """
+    previous = get_config()
+    configure(enabled=True, num_threads=num_threads, threshold=threshold, chunk_size=chunk_size)
+    try:
+        yield
+    finally:
+        _config.update(previous)
+
+
+def use_threads(size):
+    """
+    Return True if an array of the given size is processed on the thread pool with the current settings.
+    """
+    return _config['enabled'] and _config['num_threads'] > 1 and size >= _config['threshold']
+
+
+def _get_executor():
+    global _executor, _executor_threads
+    if _executor is None or _executor_threads != _config['num_threads']:
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+        _executor = ThreadPoolExecutor(max_workers=_config['num_threads'], thread_name_prefix='array_manager')
+        _executor_threads = _config['num_threads']
+
+    return _executor
+
+
+def _blocks(size):
+    # One contiguous block per thread, with block boundaries on chunk boundaries
+    chunk_size = _config['chunk_size']
+    num_chunks = -(-size // chunk_size)
+    num_blocks = min(_config['num_threads'], num_chunks)
+    chunk_bounds = np.linspace(0, num_chunks, num_blocks + 1).astype(int) * chunk_size
+    return [(int(ind1), min(int(ind2), size)) for ind1, ind2 in zip(chunk_bounds[:-1], chunk_bounds[1:])]
+
+
+def map_chunks(function, size, chunked=False):
+    """
+    Call function(ind1, ind2) on cache-sized chunks covering range(size) and return the results in order.
+    Chunks are distributed over the thread pool if use_threads(size) is True.
+    Otherwise, function is called once on the whole range, or on one chunk after the other if chunked is True (e.g., to keep the temporaries of a fused expression in cache).
+    """
+    chunk_size = _config['chunk_size']
+
+    if not use_threads(size):
+        if chunked and size > chunk_size:
+            return [function(i, min(i + chunk_size, size)) for i in range(0, size, chunk_size)]
+        return [function(0, size)]
+
+    def run_block(block):
+        ind1, ind2 = block
+        return [function(i, min(i + chunk_size, ind2)) for i in range(ind1, ind2, chunk_size)]
+
+    results = []
+    for block_results in _get_executor().map(run_block, _blocks(size)):
+        results.extend(block_results)
+
+    return results
+
+
+def _chunk(operand, ind1, ind2):
+    return operand[ind1:ind2] if isinstance(operand, np.ndarray) and operand.ndim > 0 else operand
+
+
+def apply_ufunc(ufunc, x, y, out):
+    """
+    Compute out = ufunc(x, y) chunk by chunk; x, y and out are 1-D arrays of the same size (or scalars for x and y).
+    out may be x or y for in-place operations.
+    """
+    def function(ind1, ind2):
+        ufunc(_chunk(x, ind1, ind2), _chunk(y, ind1, ind2), out=out[ind1:ind2])
+
+    map_chunks(function, out.size)
+    return out
+
+
+def axpy(axpy_function, alpha, x, y):
+    """
+    Compute y += alpha * x chunk by chunk with the given serial axpy function.
+    """
+    map_chunks(lambda ind1, ind2: axpy_function(alpha, x[ind1:ind2], y[ind1:ind2]), y.size)
+    return y
+
+
+def dot(x, y):
+    """
+    Return the dot product of two 1-D arrays, summing the partial dot products of the chunks.
+    """
+    partial_dots = map_chunks(lambda ind1, ind2: np.dot(x[ind1:ind2], y[ind1:ind2]), x.size)
+    return partial_dots[0] if len(partial_dots) == 1 else np.sum(partial_dots)
+
+
+def reduce(ufunc, x):
+    """
+    Reduce a 1-D array with a ufunc (e.g., np.add or np.maximum), combining the partial reductions of the chunks.
+    """
+    partial_results = map_chunks(lambda ind1, ind2: ufunc.reduce(x[ind1:ind2]), x.size)
+    return partial_results[0] if len(partial_results) == 1 else ufunc.reduce(np.array(partial_results))
@@ -0,0 +1,80 @@
+"""Define the SharedArray class used to store the data of a Vector in shared memory"""
+import weakref
+import numpy as np
+from multiprocessing.shared_memory import SharedMemory
+
+
+# Segments that could not be closed because views into them were still alive
+_unclosed_segments = []
+
+
+def _release_segment(shared_memory, owner):
+    try:
+        shared_memory.close()
+    except BufferError:
+        # Views into the segment are still alive; keep the mapping until they are gone
+        _unclosed_segments.append(shared_memory)
+
+    # Only the process that created the segment removes it
+    if owner:
+        try:
+            shared_memory.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedArray(object):
+    """
+    1-D NumPy array stored in a multiprocessing.shared_memory segment.
+    Pickling a SharedArray only sends the name, size and dtype of the segment; unpickling it in another process attaches to the same segment without copying the data.
+    The process that created the segment unlinks it when the SharedArray is closed or garbage-collected (or at interpreter exit); other processes only close their mapping.
+
+    Attributes
+    ----------
+    array : np.ndarray
+        Array whose buffer is the shared-memory segment
+    name : str
+        Name of the shared-memory segment
+    owner : bool
+        True in the process that created the segment
+    """
+
+    def __init__(self, size, dtype=float, name=None):
+        """
+        Create a new segment, or attach to an existing one if a name is given.
+
+        Parameters
+        ----------
+        size : int
+            Number of entries of the array
+        dtype : np.dtype
+            dtype of the array
+        name : str
+            Name of an existing segment to attach to
+        """
+        self.size = int(size)
+        self.dtype = np.dtype(dtype)
+        self.owner = name is None
+
+        # A segment cannot be empty
+        nbytes = max(self.size * self.dtype.itemsize, 1)
+        if self.owner:
+            self.shared_memory = SharedMemory(create=True, size=nbytes)
+        else:
+            self.shared_memory = SharedMemory(name=name)
+
+        self.name = self.shared_memory.name
+        self.array = np.ndarray((self.size,), dtype=self.dtype, buffer=self.shared_memory.buf)
+
+        self._finalizer = weakref.finalize(self, _release_segment, self.shared_memory, self.owner)
+
+    def close(self):
+        """
+        Close the mapping of the segment in this process (and unlink the segment in the process that created it).
+        The array must not be used afterwards.
+        """
+        self.array = None
+        self._finalizer()
+
+    def __reduce__(self):
+        return (SharedArray, (self.size, self.dtype.str, self.name))
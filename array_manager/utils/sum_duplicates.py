@@ -0,0 +1,30 @@
+"""Define the sum_duplicates function"""
+import numpy as np
+
+
+def sum_duplicates(inverse_duplicate_indices, vals, num_unique=None):
+    """
+    Sum the values that share the same (row, col) index into one value per unique index.
+    Unlike np.bincount, the dtype of vals (e.g., float32 or complex128) is preserved.
+
+    Parameters
+    ----------
+    inverse_duplicate_indices : np.ndarray
+        Position of each value among the unique indices, as returned by np.unique(..., return_inverse=True)
+    vals : np.ndarray
+        Values of the nonzeros, possibly with duplicate indices
+    num_unique : int
+        Number of unique indices
+    """
+    inverse_duplicate_indices = np.ravel(inverse_duplicate_indices)
+    if num_unique is None:
+        num_unique = inverse_duplicate_indices.max() + 1 if inverse_duplicate_indices.size > 0 else 0
+
+    if np.iscomplexobj(vals):
+        summed_vals = np.bincount(inverse_duplicate_indices, weights=vals.real, minlength=num_unique) \
+            + 1j * np.bincount(inverse_duplicate_indices, weights=vals.imag, minlength=num_unique)
+    else:
+        summed_vals = np.bincount(inverse_duplicate_indices, weights=vals, minlength=num_unique)
+
+    dtype = vals.dtype if vals.dtype.kind in 'fc' else np.dtype(float)
+    return summed_vals.astype(dtype, copy=False)
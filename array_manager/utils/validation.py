@@ -0,0 +1,40 @@
+"""Switch for the compatibility checks done by the arithmetic operators of Vector and Matrix"""
+from contextlib import contextmanager
+import numbers
+import numpy as np
+
+
+# Scalar operands accepted by the arithmetic operators (Python and NumPy ints, floats and complex numbers)
+SCALAR_TYPES = (numbers.Number, np.number)
+
+
+# Checked at the start of Vector.check_type_and_size() and Matrix.check_type_and_size[_inplace]()
+_enabled = True
+
+
+def validation_enabled():
+    """
+    Return True if the operands of arithmetic operators are validated.
+    """
+    return _enabled
+
+
+def set_validation(enabled):
+    """
+    Turn the validation of the operands of arithmetic operators on or off for the whole process.
+    """
+    global _enabled
+    _enabled = bool(enabled)
+
+
+@contextmanager
+def skip_validation():
+    """
+    Context manager that turns the validation of operands off, e.g., in a trusted inner loop whose operands are known to be compatible.
+    """
+    previous = _enabled
+    set_validation(False)
+    try:
+        yield
+    finally:
+        set_validation(previous)
@@ -0,0 +1,214 @@
+"""Read and write the binary file format used to store the data of a Vector on disk"""
+import json
+import os
+import numpy as np
+
+
+# File layout:
+#   magic (8 bytes) | header length (uint64, little endian) | JSON header (padded with spaces) | raw data
+# The raw data starts at an offset that is a multiple of ALIGNMENT so that it can be memory-mapped efficiently.
+MAGIC = b'AMVECTOR'
+ALIGNMENT = 64
+VERSION = 1
+
+
+def _encode_key(key):
+    # JSON has no tuples; keys of Matrix/BlockMatrix values are tuples
+    if isinstance(key, tuple):
+        return [_encode_key(k) for k in key]
+    if isinstance(key, np.integer):
+        return int(key)
+    return key
+
+
+def _decode_key(key):
+    if isinstance(key, list):
+        return tuple(_decode_key(k) for k in key)
+    return key
+
+
+def build_header(vector_components_dict, dtype=None):
+    """
+    Return the header describing the layout of a vector: dtype, size, and the names, shapes and offsets of all the components.
+
+    Parameters
+    ----------
+    vector_components_dict : VectorComponentsDict
+        Layout of the vector
+    dtype : np.dtype
+        dtype of the data (the dtype of the layout by default)
+    """
+    if dtype is None:
+        dtype = getattr(vector_components_dict, 'dtype', float)
+
+    index = vector_components_dict.index
+    components = [
+        dict(name=_encode_key(key), shape=[int(n) for n in shape], start_index=ind1, end_index=ind2)
+        for key, shape, ind1, ind2 in zip(index.keys, index.shapes, index.start_indices.tolist(), index.end_indices.tolist())
+    ]
+
+    return dict(
+        version=VERSION,
+        dtype=np.dtype(dtype).str,
+        vector_size=int(vector_components_dict.vector_size),
+        components=components,
+    )
+
+
+def write_header(filename, header, data_offset=None):
+    """
+    Create (or truncate) the file, write the header, and resize the file to hold the data.
+    Returns the offset of the data in the file.
+
+    If data_offset is given, the data has already been written at this offset (e.g., by VectorBuilder), so the header is padded to end exactly there and the data is left untouched.
+    A ValueError is raised if the header does not fit before data_offset.
+    """
+    header_bytes = json.dumps(header).encode('utf-8')
+    nbytes = header['vector_size'] * np.dtype(header['dtype']).itemsize
+
+    if data_offset is not None:
+        padding = data_offset - len(MAGIC) - 8 - len(header_bytes)
+        if padding < 0:
+            raise ValueError('Header of {} bytes does not fit before the data offset {}'.format(len(header_bytes), data_offset))
+        header_bytes += b' ' * padding
+
+        with open(filename, 'r+b') as f:
+            f.write(MAGIC)
+            f.write(np.uint64(len(header_bytes)).tobytes())
+            f.write(header_bytes)
+            f.truncate(data_offset + nbytes)
+
+        return data_offset
+
+    data_offset = len(MAGIC) + 8 + len(header_bytes)
+    padding = -data_offset % ALIGNMENT
+    header_bytes += b' ' * padding
+    data_offset += padding
+
+    with open(filename, 'wb') as f:
+        f.write(MAGIC)
+        f.write(np.uint64(len(header_bytes)).tobytes())
+        f.write(header_bytes)
+        f.truncate(data_offset + nbytes)
+
+    return data_offset
+
+
+def read_header(filename):
+    """
+    Read the header of a file; returns the header and the offset of the data in the file.
+    """
+    with open(filename, 'rb') as f:
+        magic = f.read(len(MAGIC))
+        if magic != MAGIC:
+            raise ValueError('{} is not an array_manager vector file'.format(filename))
+
+        header_length = int(np.frombuffer(f.read(8), dtype='<u8')[0])
+        header = json.loads(f.read(header_length).decode('utf-8'))
+
+    for component in header['components']:
+        component['name'] = _decode_key(component['name'])
+        component['shape'] = tuple(component['shape'])
+
+    data_offset = len(MAGIC) + 8 + header_length
+    return header, data_offset
+
+
+def check_header(header, vector_components_dict, filename=''):
+    """
+    Raise a ValueError if the layout stored in a header does not match the given layout.
+    """
+    if np.dtype(header['dtype']) != np.dtype(getattr(vector_components_dict, 'dtype', header['dtype'])):
+        raise ValueError('dtype {} stored in {} does not match the dtype {} of the vector'.format(header['dtype'], filename, vector_components_dict.dtype))
+
+    expected_header = build_header(vector_components_dict, header['dtype'])
+    for component in expected_header['components']:
+        component['name'] = _decode_key(component['name'])
+        component['shape'] = tuple(component['shape'])
+
+    if header['vector_size'] != expected_header['vector_size'] or header['components'] != expected_header['components']:
+        raise ValueError('Layout stored in {} does not match the layout of the vector'.format(filename))
+
+
+def write_vector(filename, vector_components_dict, data):
+    """
+    Write the header describing the layout, followed by the raw data, to a vector file.
+    """
+    data = np.ascontiguousarray(data)
+    header = build_header(vector_components_dict, data.dtype)
+    data_offset = write_header(filename, header)
+
+    with open(filename, 'r+b') as f:
+        f.seek(data_offset)
+        data.tofile(f)
+
+
+def read_vector(filename, header=None, data_offset=None):
+    """
+    Read the data stored in a vector file into memory.
+    """
+    if header is None:
+        header, data_offset = read_header(filename)
+
+    return np.fromfile(filename, dtype=np.dtype(header['dtype']), count=header['vector_size'], offset=data_offset)
+
+
+def resolve_mode(filename, mode=None):
+    """
+    Return the mode used to open a vector file: 'r+' if it exists and 'w+' otherwise, unless a mode is given.
+    """
+    if mode is None:
+        mode = 'r+' if os.path.exists(filename) else 'w+'
+
+    return mode
+
+
+def open_memmap(filename, vector_components_dict=None, mode=None, dtype=None):
+    """
+    Return a np.memmap of the data stored in a vector file.
+
+    Parameters
+    ----------
+    filename : str
+        Path of the file
+    vector_components_dict : VectorComponentsDict
+        Layout of the vector; it is written to the header of a new file, and checked against the header of an existing file
+    mode : str
+        'w+' creates (or overwrites) the file, 'r+' opens an existing file for reading and writing, 'r' opens it read-only and 'c' copy-on-write.
+        By default, the file is opened with 'r+' if it exists and created with 'w+' otherwise.
+    dtype : np.dtype
+        dtype of the data of a new file (the dtype of the layout by default)
+
+    Returns
+    -------
+    np.memmap
+        1-D array of the data, paged in from the file by the OS on demand
+    header : dict
+        Header of the file
+    """
+    mode = resolve_mode(filename, mode)
+
+    if mode == 'w+':
+        if vector_components_dict is None:
+            raise ValueError('A layout is needed to create the vector file {}'.format(filename))
+
+        header = build_header(vector_components_dict, dtype)
+        data_offset = write_header(filename, header)
+
+    elif mode in ('r', 'r+', 'c'):
+        header, data_offset = read_header(filename)
+        if vector_components_dict is not None:
+            check_header(header, vector_components_dict, filename)
+
+    else:
+        raise ValueError('mode should be one of "w+", "r+", "r" or "c", {} was given'.format(mode))
+
+    # np.memmap cannot map an empty region
+    if header['vector_size'] == 0:
+        return np.zeros(0, dtype=header['dtype']), header
+
+    # The header has already been written, so the data region is opened with 'r+' instead of 'w+'
+    memmap_mode = 'r+' if mode == 'w+' else mode
+    data = np.memmap(filename, dtype=np.dtype(header['dtype']), mode=memmap_mode, offset=data_offset, shape=(header['vector_size'],))
+
+    return data, header